@@ -0,0 +1,53 @@
+"""
+Benchmarks for the VerdeSpace hot paths.
+
+Run them from the repository root, e.g. `python -m benchmarks.presign`.
+They never talk to AWS: pre-signing is computed locally, so dummy
+credentials stand in for a real bucket.
+"""
+
+import os
+import statistics
+
+BENCHMARK_ENV = {
+    "DJANGO_SETTINGS_MODULE": "py_verdespace_backend.settings",
+    "SECRET_KEY": "benchmark",
+    "AWS_ACCESS_KEY_ID": "benchmark",
+    "AWS_SECRET_ACCESS_KEY": "benchmark",
+    "AWS_STORAGE_BUCKET_NAME": "verdespace-benchmark",
+    "AWS_S3_REGION_NAME": "eu-central-1",
+    # Every request over a large catalog would otherwise be logged as slow.
+    "SLOW_REQUEST_MS": "0",
+}
+
+
+def setup_django():
+    for key, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
+
+    import django
+
+    django.setup()
+
+
+def percentile(samples, percent):
+    """
+    Nearest-rank percentile of a list of samples.
+    """
+    ordered = sorted(samples)
+    rank = round(percent / 100 * len(ordered))
+    index = max(0, min(len(ordered) - 1, rank - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """
+    Latency summary in milliseconds for a list of durations in seconds.
+    """
+    return {
+        "runs": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "p50_ms": round(percentile(samples, 50) * 1000, 4),
+        "p95_ms": round(percentile(samples, 95) * 1000, 4),
+        "p99_ms": round(percentile(samples, 99) * 1000, 4),
+    }
@@ -0,0 +1,273 @@
+"""
+Measure the API hot paths (plant list, plant detail, plant images and
+comment threads) against a synthetic catalog on a local SQLite database:
+latency percentiles, SQL queries and peak Python memory per request.
+
+    python -m benchmarks.api [--plants 1000 --images 20] [--runs 50]
+        [--database catalog.sqlite3] [--output api.json]
+        [--compare baseline.json]
+
+The defaults keep a run short; the catalog scale the API is sized for is
+--plants 10000 --images 100, best generated once into a --database file.
+
+Pre-signing runs locally with dummy credentials, so S3 is never contacted.
+The plant response cache is bypassed unless --cache is given, so every
+request reaches the database and the serializers. A --database file that
+already holds plants is reused as is, which keeps runs on different
+commits comparable without regenerating the catalog.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+from benchmarks import data, setup_django, summarize
+
+API = "/api/verdespace"
+SCENARIOS = (
+    "plants_list",
+    "plants_list_deep_page",
+    "plant_retrieve",
+    "plant_images",
+    "plant_comments",
+    "comments_list",
+)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_database(options):
+    """
+    Migrate the benchmark database and fill it unless it already holds a
+    catalog. Returns the generation options used, or None when reused.
+    """
+    from django.core.management import call_command
+
+    from verdespace.models import Plant
+
+    call_command("migrate", verbosity=0)
+    if Plant.objects.exists():
+        return None
+    generated = {name: options[name] for name in data.DEFAULTS}
+    started = time.perf_counter()
+    data.generate(**generated)
+    generated["seconds"] = round(time.perf_counter() - started, 2)
+    return generated
+
+
+def dataset_counts():
+    from django.contrib.auth import get_user_model
+
+    from verdespace.models import Comment, Plant, PlantImage, Rating
+
+    # Follow the reply chains level by level; top-level comments are depth 0.
+    max_depth = -1
+    level = Comment.objects.filter(parent__isnull=True)
+    while level.exists():
+        max_depth += 1
+        level = Comment.objects.filter(parent__in=level)
+    return {
+        "users": get_user_model().objects.count(),
+        "plants": Plant.objects.count(),
+        "images": PlantImage.objects.count(),
+        "ratings": Rating.objects.count(),
+        "comments": Comment.objects.count(),
+        "max_comment_depth": max(max_depth, 0),
+    }
+
+
+def scenario_paths(client, deep_page):
+    """
+    Request path of every scenario. The plant with the most images and
+    comment threads is the first one; the deep page is reached by
+    following `next` links like a client would.
+    """
+    from verdespace.models import Plant
+
+    plant_id = Plant.objects.order_by("pk").first().pk
+    deep = f"{API}/plants/"
+    for _ in range(deep_page - 1):
+        next_link = client.get(deep).data.get("next")
+        if not next_link:
+            break
+        parts = urlsplit(next_link)
+        deep = f"{parts.path}?{parts.query}"
+    return {
+        "plants_list": f"{API}/plants/",
+        "plants_list_deep_page": deep,
+        "plant_retrieve": f"{API}/plants/{plant_id}/",
+        "plant_images": f"{API}/plants/{plant_id}/images/",
+        "plant_comments": f"{API}/plants/{plant_id}/comments/",
+        "comments_list": f"{API}/comments/",
+    }
+
+
+def measure(client, path, runs, warmup):
+    from django.db import connection
+
+    for _ in range(warmup):
+        client.get(path)
+
+    # Queries and memory are measured on separate requests: counting SQL
+    # and tracing allocations both slow the request down.
+    queries = []
+
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        response = client.get(path)
+    tracemalloc.start()
+    client.get(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        client.get(path)
+        samples.append(time.perf_counter() - started)
+    return {
+        "path": path,
+        "status": response.status_code,
+        "response_bytes": len(response.content),
+        "queries": len(queries),
+        "peak_memory_kib": round(peak / 1024, 1),
+        **summarize(samples),
+    }
+
+
+def compare(results, baseline):
+    """
+    Latency ratios (current / baseline) and query count changes for the
+    scenarios present in both reports.
+    """
+    previous = {result["scenario"]: result for result in baseline["results"]}
+    comparison = []
+    for result in results:
+        before = previous.get(result["scenario"])
+        if before is None:
+            continue
+        comparison.append(
+            {
+                "scenario": result["scenario"],
+                "p50_ratio": round(result["p50_ms"] / before["p50_ms"], 3),
+                "p95_ratio": round(result["p95_ms"] / before["p95_ms"], 3),
+                "queries_delta": result["queries"] - before["queries"],
+                "peak_memory_ratio": round(
+                    result["peak_memory_kib"] / before["peak_memory_kib"], 3
+                ),
+            }
+        )
+    return {"baseline_commit": baseline.get("commit"), "results": comparison}
+
+
+def run(options):
+    import django
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+
+    generated = prepare_database(options)
+    overrides = {"ALLOWED_HOSTS": [*settings.ALLOWED_HOSTS, "testserver"]}
+    if not options["cache"]:
+        overrides["CACHES"] = {
+            **settings.CACHES,
+            "benchmark-bypass": {
+                "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+            },
+        }
+        overrides["VERDESPACE_PLANT_CACHE"] = "benchmark-bypass"
+
+    with override_settings(**overrides):
+        client = APIClient()
+        user = get_user_model().objects.order_by("pk").first()
+        client.force_authenticate(user=user)
+        paths = scenario_paths(client, options["deep_page"])
+        results = []
+        for scenario in options["scenarios"]:
+            result = measure(
+                client, paths[scenario], options["runs"], options["warmup"]
+            )
+            results.append({"scenario": scenario, **result})
+
+    return {
+        "benchmark": "api",
+        "commit": git_commit(),
+        "environment": {
+            "python": sys.version.split()[0],
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "response_cache": options["cache"],
+        },
+        "dataset": {**dataset_counts(), "generated": generated},
+        "runs": options["runs"],
+        "results": results,
+    }
+
+
+def main(argv=None):
+    description = __doc__.strip().splitlines()[0]
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument(
+        "--scenario",
+        dest="scenarios",
+        action="append",
+        choices=SCENARIOS,
+        help="Scenario to run; repeat for several (default: all)",
+    )
+    parser.add_argument("--deep-page", type=int, default=25)
+    parser.add_argument("--cache", action="store_true")
+    parser.add_argument(
+        "--database",
+        help="SQLite file to build or reuse (default: a temporary one)",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Earlier report to compare with")
+    for name, default in data.DEFAULTS.items():
+        flag = f"--{name.replace('_', '-')}"
+        parser.add_argument(flag, type=int, default=default)
+    args = parser.parse_args(argv)
+    options = vars(args)
+    options["scenarios"] = args.scenarios or list(SCENARIOS)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = args.database or os.path.join(directory, "api.sqlite3")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(database)}"
+        setup_django()
+        report = run(options)
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            previous = json.load(baseline)
+        report["comparison"] = compare(report["results"], previous)
+    report = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    sys.stdout.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Deterministic synthetic catalog for the API benchmarks, scaled up from
+the plants in plantsdata_cleaned.json.
+
+Every plant gets `images` images and ratings from up to `raters` users.
+The first `threaded_plants` plants also get `threads` top-level comments,
+each with a chain of `depth` replies that fans out into `replies`
+siblings at every level, to stress the comment tree endpoints.
+"""
+
+import json
+import random
+from pathlib import Path
+
+SEED_FILE = Path(__file__).resolve().parent.parent / "plantsdata_cleaned.json"
+BATCH_SIZE = 2000
+
+DEFAULTS = {
+    "plants": 1000,
+    "images": 20,
+    "users": 50,
+    "raters": 10,
+    "threaded_plants": 5,
+    "threads": 20,
+    "depth": 4,
+    "replies": 2,
+    "seed": 42,
+}
+
+
+def load_seed_plants():
+    """
+    Plant field values from the seed fixture.
+    """
+    from verdespace.management.commands.import_plants import IMPORT_FIELDS
+
+    with open(SEED_FILE) as seed:
+        records = json.load(seed)
+    fields = [record["fields"] for record in records]
+    return [{name: row[name] for name in IMPORT_FIELDS} for row in fields]
+
+
+def generate(**options):
+    """
+    Fill the (empty) database with a synthetic catalog and return the
+    number of rows created per model.
+    """
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+
+    from verdespace import search
+    from verdespace.models import Comment, Plant, PlantImage, Rating
+
+    options = {**DEFAULTS, **options}
+    rng = random.Random(options["seed"])
+    User = get_user_model()
+
+    with transaction.atomic():
+        users = []
+        for index in range(options["users"]):
+            user = User(
+                username=f"benchmark{index}@example.com",
+                email=f"benchmark{index}@example.com",
+            )
+            user.set_unusable_password()
+            users.append(user)
+        users = User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+
+        seed_plants = load_seed_plants()
+        plants = []
+        for index in range(options["plants"]):
+            fields = dict(seed_plants[index % len(seed_plants)])
+            fields["name"] += f" {index // len(seed_plants) + 1}"
+            plants.append(Plant(**fields))
+        plants = Plant.objects.bulk_create(plants, batch_size=BATCH_SIZE)
+
+        images = _count(
+            PlantImage,
+            (
+                PlantImage(
+                    plant=plant,
+                    image=f"plants/benchmark/{plant.pk}/{index:03d}.jpg",
+                    width=1600,
+                    height=1200,
+                )
+                for plant in plants
+                for index in range(options["images"])
+            ),
+        )
+
+        raters = min(options["raters"], len(users))
+        ratings = _count(
+            Rating,
+            (
+                Rating(plant=plant, user=user, rating=rng.randint(1, 5))
+                for plant in plants
+                for user in rng.sample(users, raters)
+            ),
+        )
+        Plant.objects.all().refresh_rating_stats()
+
+        comments = 0
+        for plant in plants[: options["threaded_plants"]]:
+            level = Comment.objects.bulk_create(
+                [
+                    Comment(
+                        plant=plant,
+                        author=rng.choice(users),
+                        text=f"Thread {index} about {plant.name}",
+                    )
+                    for index in range(options["threads"])
+                ]
+            )
+            comments += len(level)
+            for depth in range(1, options["depth"] + 1):
+                level = [
+                    comment
+                    for batch in _bulk_create(
+                        Comment,
+                        (
+                            Comment(
+                                plant=plant,
+                                parent=parent,
+                                author=rng.choice(users),
+                                text=f"Reply {index} at depth {depth}",
+                            )
+                            for parent in level
+                            for index in range(options["replies"])
+                        ),
+                    )
+                    for comment in batch
+                ]
+                comments += len(level)
+
+        search.rebuild_index()
+
+    return {
+        "users": len(users),
+        "plants": len(plants),
+        "images": images,
+        "ratings": ratings,
+        "comments": comments,
+    }
+
+
+def _count(model, objects):
+    return sum(len(batch) for batch in _bulk_create(model, objects))
+
+
+def _bulk_create(model, objects):
+    """
+    bulk_create `objects` in batches, yielding each created batch so large
+    tables are never held in memory at once.
+    """
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= BATCH_SIZE:
+            yield model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        yield model.objects.bulk_create(batch)
@@ -0,0 +1,97 @@
+"""
+Compare the per-request cost of RemoveAuthorizationHeaderMiddleware for
+API and S3 hosts: building the absolute URI on every request (the
+previous behaviour) against the host-routed lookup.
+
+    python -m benchmarks.middleware [--runs 200000] [--output middleware.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from benchmarks import setup_django
+
+HOSTS = {"api": "testserver", "s3": "verdespace.s3.amazonaws.com"}
+PATH = "/api/verdespace/plants/?page_size=20"
+
+
+class BuildAbsoluteUriMiddleware:
+    """
+    The previous RemoveAuthorizationHeaderMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if "s3.amazonaws.com" in request.build_absolute_uri():
+            if "HTTP_AUTHORIZATION" in request.META:
+                del request.META["HTTP_AUTHORIZATION"]
+        return self.get_response(request)
+
+
+def measure(middleware, request, runs):
+    """
+    Mean nanoseconds per call, the best of five rounds.
+    """
+    rounds = []
+    for _ in range(5):
+        started = time.perf_counter_ns()
+        for _ in range(runs):
+            middleware(request)
+        rounds.append((time.perf_counter_ns() - started) / runs)
+    return round(min(rounds), 1)
+
+
+def run(runs):
+    from django.test import RequestFactory
+
+    from verdespace.middleware import RemoveAuthorizationHeaderMiddleware
+
+    def get_response(request):
+        return None
+
+    factory = RequestFactory()
+    before = BuildAbsoluteUriMiddleware(get_response)
+    after = RemoveAuthorizationHeaderMiddleware(get_response)
+    results = []
+    for name, host in HOSTS.items():
+        # The header stays in place so every call does the same work.
+        request = factory.get(PATH, HTTP_HOST=host)
+        uri_ns = measure(before, request, runs)
+        routed_ns = measure(after, request, runs)
+        results.append(
+            {
+                "host": name,
+                "build_absolute_uri_ns": uri_ns,
+                "host_routed_ns": routed_ns,
+                "speedup": round(uri_ns / routed_ns, 1),
+            }
+        )
+    return {"benchmark": "middleware", "runs": runs, "results": results}
+
+
+def main(argv=None):
+    description = __doc__.strip().splitlines()[0]
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--runs", type=int, default=200000)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from django.conf import settings
+    from django.test import override_settings
+
+    allowed_hosts = [*settings.ALLOWED_HOSTS, *HOSTS.values()]
+    with override_settings(ALLOWED_HOSTS=allowed_hosts):
+        report = json.dumps(run(args.runs), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    sys.stdout.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare the per-request cost of pre-signing image URLs for plants with
+1, 10 and 100 images: one fresh boto3 client per URL (the previous
+behaviour) against the shared client with batch signing.
+
+    python -m benchmarks.presign [--runs 50] [--output presign.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from benchmarks import setup_django, summarize
+
+IMAGE_COUNTS = (1, 10, 100)
+
+
+def sign_with_fresh_clients(keys):
+    import boto3
+    from django.conf import settings
+
+    urls = {}
+    for key in keys:
+        client = boto3.client(
+            "s3",
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_S3_REGION_NAME,
+        )
+        urls[key] = client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": key},
+            ExpiresIn=3600,
+        )
+    return urls
+
+
+def sign_with_shared_client(keys):
+    from verdespace.utils import generate_presigned_urls
+
+    return generate_presigned_urls(keys)
+
+
+def measure(function, keys, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function(keys)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def run(runs):
+    from verdespace.utils import get_s3_client
+
+    get_s3_client()  # first-use construction is not part of a request
+    results = []
+    for count in IMAGE_COUNTS:
+        keys = [f"plants/{index:04d}.jpg" for index in range(count)]
+        fresh = measure(sign_with_fresh_clients, keys, max(1, runs // count))
+        shared = measure(sign_with_shared_client, keys, runs)
+        results.append(
+            {
+                "images": count,
+                "fresh_client_per_url": fresh,
+                "shared_client_batch": shared,
+                "speedup_p50": round(fresh["p50_ms"] / shared["p50_ms"], 1),
+            }
+        )
+    return {"benchmark": "presign", "results": results}
+
+
+def main(argv=None):
+    description = __doc__.strip().splitlines()[0]
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    report = json.dumps(run(args.runs), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    sys.stdout.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from . import db
+
+LIST_VERSION_KEY = "plants:list:version"
+CATALOG_VERSION_KEY = "plants:catalog:version"
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[settings.VERDESPACE_PLANT_CACHE]
+
+
+def plant_version_key(plant_id):
+    return f"plants:detail:{plant_id}:version"
+
+
+def get_version(key, cache=None):
+    """
+    Current value of a version counter (in the plant cache by default).
+    A missing counter (never set, or evicted) starts from the current time,
+    so it can never fall back to a value that old entries were stored under.
+    """
+    cache = cache or get_cache()
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key, cache=None):
+    db.note_write()
+    cache = cache or get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def invalidate_plant(plant_id, listing=True):
+    """
+    Make cached responses for a plant (and the plant list) stale.
+    Runs now, so the current transaction sees fresh data, and again after
+    commit, so no response cached from pre-commit data survives.
+    """
+
+    def bump():
+        bump_version(plant_version_key(plant_id))
+        if listing:
+            bump_version(LIST_VERSION_KEY)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def invalidate_list():
+    bump_version(LIST_VERSION_KEY)
+    transaction.on_commit(lambda: bump_version(LIST_VERSION_KEY))
+
+
+def invalidate_catalog():
+    """
+    Make every cached plant response stale, e.g. after a bulk import that
+    bypassed model signals.
+    """
+
+    def bump():
+        bump_version(CATALOG_VERSION_KEY)
+        bump_version(LIST_VERSION_KEY)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def request_fingerprint(request):
+    return hashlib.sha256(
+        f"{request.get_host()}{request.get_full_path()}".encode()
+    ).hexdigest()
+
+
+def list_cache_key(request):
+    version = get_version(LIST_VERSION_KEY)
+    return f"plants:list:{version}:{request_fingerprint(request)}"
+
+
+def detail_cache_key(request, plant_id):
+    catalog = get_version(CATALOG_VERSION_KEY)
+    version = get_version(plant_version_key(plant_id))
+    return (
+        f"plants:detail:{plant_id}:{catalog}.{version}:{request_fingerprint(request)}"
+    )
+
+
+def cached_response(key, build):
+    """
+    Serve the response data stored under `key`, or build the response and
+    store its data when it is a 200. A response read from a replica that
+    may have missed a write is served but not stored, so it cannot outlive
+    the version bump that was meant to evict it.
+    """
+    cache = get_cache()
+    data = cache.get(key)
+    if data is not None:
+        _record("hits")
+        response = Response(data)
+        response["X-Cache"] = "HIT"
+        return response
+    _record("misses")
+    response = build()
+    if response.status_code == 200 and not db.replica_may_be_stale():
+        cache.set(key, response.data, timeout=settings.VERDESPACE_PLANT_CACHE_TIMEOUT)
+    response["X-Cache"] = "MISS"
+    return response
+
+
+def _record(counter):
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+def cache_stats():
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+    }
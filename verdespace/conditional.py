@@ -0,0 +1,89 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from . import caching
+from .models import Plant
+
+
+def make_etag(*parts):
+    """
+    Strong entity tag derived from the given values.
+    """
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def plant_validators(plant_id):
+    """
+    ETag and Last-Modified of a single plant, read with one primary key
+    lookup. Returns (None, None) when the plant does not exist.
+    """
+    try:
+        row = (
+            Plant.objects.filter(pk=plant_id)
+            .values_list("version", "updated_at")
+            .first()
+        )
+    except (TypeError, ValueError):
+        row = None
+    if row is None:
+        return None, None
+    version, updated_at = row
+    return make_etag("plant", plant_id, version, updated_at.isoformat()), updated_at
+
+
+def plant_list_validator(request):
+    """
+    ETag of a plant list page, built without touching the database. The
+    list version counter moves whenever a plant, its images or its ratings
+    change; the normalized query string tells pages and filters apart.
+
+    Lists get no Last-Modified: nothing cheap dates a deletion, so
+    If-Modified-Since alone could answer 304 for a list that lost a plant.
+    """
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    return make_etag(
+        "plants",
+        caching.get_version(caching.LIST_VERSION_KEY),
+        request.get_host(),
+        request.path,
+        query,
+    )
+
+
+def images_validator(images, urls):
+    """
+    ETag of a plant's image list. The body embeds pre-signed URLs that are
+    re-signed over time, so the tag covers each image with its current URL.
+    """
+    return make_etag(
+        "images",
+        *((image.pk, image.image.name, urls.get(image.image.name)) for image in images),
+    )
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    A 304 response when the request's If-None-Match / If-Modified-Since
+    headers match the validators, otherwise None.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(
+        request._request if hasattr(request, "_request") else request,
+        etag=etag,
+        last_modified=timestamp,
+    )
+    if response is not None:
+        response["ETag"] = etag
+    return response
+
+
+def add_validators(response, etag, last_modified=None):
+    if response.status_code == 200:
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
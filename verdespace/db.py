@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+RECENT_WRITE_KEY = "db:recent-write"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def has_replica():
+    return settings.VERDESPACE_DB_REPLICA in connections.databases
+
+
+def note_write():
+    """
+    Keep reads on the primary for VERDESPACE_DB_REPLICA_LAG seconds after a
+    write, while the replica may not have caught up. The mark is kept in
+    the shared plant cache, so every process sees it.
+    """
+    if has_replica():
+        caches[settings.VERDESPACE_PLANT_CACHE].set(
+            RECENT_WRITE_KEY, True, timeout=settings.VERDESPACE_DB_REPLICA_LAG
+        )
+
+
+def written_recently():
+    return (
+        has_replica()
+        and caches[settings.VERDESPACE_PLANT_CACHE].get(RECENT_WRITE_KEY) is not None
+    )
+
+
+def replica_may_be_stale():
+    """
+    Whether reads in this context go to the replica although a write has
+    landed since they started, so their results may predate it.
+    """
+    return _replica_reads.get() and written_recently()
+
+
+@contextmanager
+def replica_reads():
+    """
+    Route ORM reads made inside the block to the read replica, when one is
+    configured and nothing was written within VERDESPACE_DB_REPLICA_LAG
+    seconds. Writes always go to the primary.
+    """
+    token = _replica_reads.set(has_replica() and not written_recently())
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads to VERDESPACE_DB_REPLICA inside `replica_reads()` and
+    leaves everything else on the primary, so requests that write never
+    read their own changes back from a lagging replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            return settings.VERDESPACE_DB_REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica mirrors the primary, so objects from either may be related.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.VERDESPACE_DB_REPLICA:
+            return False
+        return None
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Apply VERDESPACE_SQLITE_PRAGMAS to every new SQLite connection.
+    WAL lets readers run alongside the single writer instead of waiting on it.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.VERDESPACE_SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
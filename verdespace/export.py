@@ -0,0 +1,73 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Columns written for every plant, in order.
+EXPORT_FIELDS = [
+    "id",
+    "name",
+    "description",
+    "tips",
+    "light_needs",
+    "water_needs",
+    "care",
+    "air_purifying",
+    "allergenic",
+    "size",
+    "blooms",
+    "category",
+    "rating_avg",
+    "rating_count",
+    "created_at",
+    "updated_at",
+]
+
+# Rows joined into one chunk of the response body.
+ROWS_PER_CHUNK = 500
+
+
+class _Echo:
+    """
+    File-like object whose write() returns the text instead of storing it,
+    so csv.writer can format one row at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_ndjson(rows):
+    """
+    One JSON object per line.
+    """
+    encoder = DjangoJSONEncoder()
+    return _chunked(encoder.encode(row) + "\n" for row in rows)
+
+
+def iter_csv(rows):
+    """
+    A header line followed by one line per plant.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    yield from _chunked(
+        writer.writerow([row[field] for field in EXPORT_FIELDS]) for row in rows
+    )
+
+
+def _chunked(lines):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+# ?output= value: (content type, file extension, body generator)
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson", iter_ndjson),
+    "csv": ("text/csv", "csv", iter_csv),
+}
@@ -0,0 +1,183 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import ExifTags, Image, ImageOps
+
+from .models import PlantImage
+
+logger = logging.getLogger(__name__)
+
+# Pillow format name -> file extension
+FORMAT_EXTENSIONS = {"AVIF": "avif", "WEBP": "webp"}
+
+UPLOAD_TOKEN_SALT = "verdespace.images.upload"
+# Time allowed between requesting an upload policy and confirming the upload
+UPLOAD_TOKEN_MAX_AGE = 3600
+
+# EXIF and XMP can carry GPS coordinates and camera details.
+METADATA_KEYS = ("exif", "xmp", "XML:com.adobe.xmp")
+
+
+def available_formats():
+    """
+    VERDESPACE_IMAGE_FORMATS that this Pillow build can encode, e.g. AVIF
+    needs Pillow 11.2+ built with libavif.
+    """
+    Image.init()
+    return [
+        name.upper()
+        for name in settings.VERDESPACE_IMAGE_FORMATS
+        if name.upper() in Image.SAVE and name.upper() in FORMAT_EXTENSIONS
+    ]
+
+
+def encode(image, format, **params):
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **params)
+    return buffer.getvalue()
+
+
+def render_variant(image, size):
+    """
+    Scale `image` down to fit within `size`, keeping its aspect ratio.
+    Images that already fit are left as they are.
+    """
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+    if image.width <= size[0] and image.height <= size[1]:
+        return image
+    return ImageOps.contain(image, size, Image.Resampling.LANCZOS)
+
+
+def process_image(image_id):
+    """
+    Strip metadata from an uploaded image, record its dimensions and store
+    downscaled variants next to it in every available format.
+    """
+    plant_image = PlantImage.objects.filter(pk=image_id).first()
+    if plant_image is None or not plant_image.image:
+        return
+    storage = plant_image.image.storage
+    name = plant_image.image.name
+
+    with storage.open(name, "rb") as file, Image.open(file) as original:
+        orientation = original.getexif().get(ExifTags.Base.Orientation, 1)
+        # Apply the EXIF orientation before the EXIF block is dropped.
+        image = ImageOps.exif_transpose(original)
+        image.load()
+        stripped = None
+        if any(key in original.info for key in METADATA_KEYS):
+            for key in METADATA_KEYS:
+                image.info.pop(key, None)
+            if original.format == "JPEG" and orientation == 1:
+                # Re-use the original quantization tables: no visible loss.
+                stripped = encode(original, "JPEG", quality="keep")
+            else:
+                stripped = encode(image, original.format, quality=90)
+
+    if stripped is not None:
+        new_name = storage.save(name, ContentFile(stripped))
+        if new_name != name:
+            storage.delete(name)
+            plant_image.image.name = new_name
+
+    base = os.path.splitext(plant_image.image.name)[0]
+    variants = {}
+    for variant, size in settings.VERDESPACE_IMAGE_VARIANTS.items():
+        resized = render_variant(image, tuple(size))
+        for format in available_formats():
+            data = encode(resized, format, quality=settings.VERDESPACE_IMAGE_QUALITY)
+            variant_name = f"{base}_{variant}.{FORMAT_EXTENSIONS[format]}"
+            if storage.exists(variant_name):
+                storage.delete(variant_name)
+            variants.setdefault(variant, {})[format.lower()] = storage.save(
+                variant_name, ContentFile(data)
+            )
+
+    plant_image.width, plant_image.height = image.size
+    plant_image.variants = variants
+    plant_image.processed_at = timezone.now()
+    plant_image.save(
+        update_fields=["image", "width", "height", "variants", "processed_at"]
+    )
+
+
+def _process(image_id):
+    try:
+        process_image(image_id)
+    except Exception:
+        logger.exception("Failed to process plant image %s", image_id)
+
+
+def _process_in_worker(image_id):
+    # Worker threads hold their own database connections.
+    close_old_connections()
+    try:
+        _process(image_id)
+    finally:
+        close_old_connections()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Return the process-wide worker pool, created on first use with
+    VERDESPACE_IMAGE_WORKERS threads. Pillow releases the GIL while it
+    decodes, resizes and encodes, so the threads run in parallel.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.VERDESPACE_IMAGE_WORKERS,
+                    thread_name_prefix="image-pipeline",
+                )
+    return _executor
+
+
+def schedule_processing(image_id):
+    """
+    Process an uploaded image in the worker pool once the current
+    transaction commits. With VERDESPACE_IMAGE_WORKERS = 0 the image is
+    processed right away, in the calling thread.
+    """
+    if settings.VERDESPACE_IMAGE_WORKERS <= 0:
+        _process(image_id)
+        return
+    transaction.on_commit(lambda: get_executor().submit(_process_in_worker, image_id))
+
+
+def make_upload_token(plant_id, key):
+    """
+    Signed token tying a direct upload's object key to the plant it was
+    issued for, so a confirm request cannot claim any other object.
+    """
+    return signing.dumps({"plant": plant_id, "key": key}, salt=UPLOAD_TOKEN_SALT)
+
+
+def read_upload_token(token, plant_id):
+    """
+    The object key of a token issued for `plant_id`, or None when the token
+    is forged, expired or belongs to another plant.
+    """
+    try:
+        data = signing.loads(
+            token, salt=UPLOAD_TOKEN_SALT, max_age=UPLOAD_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
+    if data.get("plant") != plant_id:
+        return None
+    return data.get("key")
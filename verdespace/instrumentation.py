@@ -0,0 +1,234 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds of the histogram buckets; +Inf is implied.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# SQL statements kept per request for the slow request log
+MAX_RECORDED_QUERIES = 200
+
+
+class Histogram:
+    """
+    Cumulative histogram in the Prometheus text format, one series per
+    combination of label values.
+    """
+
+    def __init__(self, name, help, labels, buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = {
+                    "buckets": [0] * (len(self.buckets) + 1),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            series["buckets"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: dict(value) for key, value in self._series.items()}
+        for label_values, data in sorted(series.items()):
+            labels = ",".join(
+                f'{name}="{_escape(value)}"'
+                for name, value in zip(self.labels, label_values)
+            )
+            separator = "," if labels else ""
+            cumulative = 0
+            bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, data["buckets"]):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}'
+                )
+            lines.append(f"{self.name}_sum{{{labels}}} {data['sum']}")
+            lines.append(f"{self.name}_count{{{labels}}} {data['count']}")
+        return "\n".join(lines)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_DURATION = Histogram(
+    "verdespace_request_duration_seconds",
+    "Time spent handling a request.",
+    ("view", "method", "status"),
+    DURATION_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "verdespace_request_queries",
+    "SQL queries run while handling a request.",
+    ("view",),
+    COUNT_BUCKETS,
+)
+REQUEST_DB_DURATION = Histogram(
+    "verdespace_request_db_seconds",
+    "Time spent in SQL queries while handling a request.",
+    ("view",),
+    DURATION_BUCKETS,
+)
+REQUEST_SERIALIZER_DURATION = Histogram(
+    "verdespace_request_serializer_seconds",
+    "Time spent producing serializer data while handling a request.",
+    ("view",),
+    DURATION_BUCKETS,
+)
+OUTBOUND_DURATION = Histogram(
+    "verdespace_outbound_seconds",
+    "Time spent in calls to external services (S3, Telegram).",
+    ("service",),
+    DURATION_BUCKETS,
+)
+HISTOGRAMS = [
+    REQUEST_DURATION,
+    REQUEST_QUERIES,
+    REQUEST_DB_DURATION,
+    REQUEST_SERIALIZER_DURATION,
+    OUTBOUND_DURATION,
+]
+
+
+class RequestStats:
+    """
+    What one request spent its time on.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.queries = []
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        # service -> [calls, seconds]
+        self.outbound = {}
+
+    def record_query(self, sql, duration):
+        self.query_count += 1
+        self.db_time += duration
+        if len(self.queries) < MAX_RECORDED_QUERIES:
+            self.queries.append((duration, sql))
+
+    def slowest_queries(self, limit):
+        return sorted(self.queries, key=lambda query: query[0], reverse=True)[:limit]
+
+
+_current = ContextVar("request_stats", default=None)
+
+
+@contextmanager
+def collect():
+    """
+    Collect RequestStats for the code run inside the block.
+    """
+    stats = RequestStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def query_wrapper(execute, sql, params, many, context):
+    """
+    Database execute wrapper timing every query of the current request.
+    """
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record_query(sql, time.perf_counter() - started)
+
+
+@contextmanager
+def outbound(service, calls=1):
+    """
+    Time a call to an external service, for the current request (if any)
+    and the process-wide histogram.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        OUTBOUND_DURATION.observe(duration, service)
+        stats = _current.get()
+        if stats is not None:
+            totals = stats.outbound.setdefault(service, [0, 0.0])
+            totals[0] += calls
+            totals[1] += duration
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin counting the time spent in `to_representation` towards
+    the current request's serializer time. Only the outermost call counts,
+    so nested serializers are not timed twice; list items add up.
+    """
+
+    def to_representation(self, instance):
+        stats = _current.get()
+        if stats is None:
+            return super().to_representation(instance)
+        stats.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            stats.serializer_depth -= 1
+            if not stats.serializer_depth:
+                stats.serializer_time += time.perf_counter() - started
+
+
+def server_timing(stats, duration):
+    """
+    Server-Timing header value for a finished request.
+    """
+    entries = [
+        f"app;dur={duration * 1000:.1f}",
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.query_count} queries"',
+    ]
+    if stats.serializer_time:
+        entries.append(f"serializer;dur={stats.serializer_time * 1000:.1f}")
+    for service, (calls, seconds) in sorted(stats.outbound.items()):
+        entries.append(f'{service};dur={seconds * 1000:.1f};desc="{calls} calls"')
+    return ", ".join(entries)
+
+
+def observe_request(view, method, status_code, stats, duration):
+    REQUEST_DURATION.observe(duration, view, method, f"{status_code // 100}xx")
+    REQUEST_QUERIES.observe(stats.query_count, view)
+    REQUEST_DB_DURATION.observe(stats.db_time, view)
+    REQUEST_SERIALIZER_DURATION.observe(stats.serializer_time, view)
+
+
+def render_metrics():
+    return "\n".join(histogram.render() for histogram in HISTOGRAMS) + "\n"
+
+
+def reset_metrics():
+    for histogram in HISTOGRAMS:
+        histogram.reset()
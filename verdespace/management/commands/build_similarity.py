@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from verdespace.similarity import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the similar plants index from scratch, e.g. after loading "
+        "fixtures or changing the similarity settings."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        plants = rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {plants} plant(s) in {time.perf_counter() - started:.2f}s."
+            )
+        )
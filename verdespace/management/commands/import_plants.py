@@ -0,0 +1,272 @@
+import json
+import re
+import sys
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+
+from verdespace import caching, search, similarity
+from verdespace.models import Plant
+
+# Fields a record may set; created_at is accepted but left to the database
+# (the creation time of new rows, unchanged for existing ones).
+IMPORT_FIELDS = [
+    "name",
+    "description",
+    "tips",
+    "light_needs",
+    "water_needs",
+    "care",
+    "air_purifying",
+    "allergenic",
+    "size",
+    "blooms",
+    "category",
+]
+IGNORED_FIELDS = {"created_at"}
+
+WHITESPACE = " \t\r\n"
+DELIMITER_RE = re.compile(r"[\s,\]]")
+# Characters the decoder reads past the point of an error at most, for a
+# surrogate pair of \uXXXX escapes
+LOOKAHEAD = 12
+
+
+def iter_json_array(stream, chunk_size=64 * 1024):
+    """
+    Yield the items of a top-level JSON array one at a time, reading
+    `stream` in chunks so the whole document is never held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def skip():
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            if position < len(buffer) or eof:
+                return
+            fill()
+
+    def decode():
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as error:
+                # Only an error at the very end of the buffer, or inside a
+                # string still being read, can be fixed by reading more.
+                if eof or not (
+                    error.msg.startswith("Unterminated string")
+                    or len(buffer) - error.pos <= LOOKAHEAD
+                ):
+                    raise
+                fill()
+                continue
+            # A number or literal is only whole once something follows it.
+            if eof or DELIMITER_RE.search(buffer, end):
+                return item, end
+            fill()
+
+    fill()
+    skip()
+    if buffer[position : position + 1] != "[":
+        raise ValueError("Expected a JSON array")
+    position += 1
+    skip()
+    if buffer[position : position + 1] == "]":
+        return
+    while True:
+        item, position = decode()
+        yield item
+        skip()
+        if position >= len(buffer):
+            raise ValueError("Unterminated JSON array")
+        if buffer[position] == "]":
+            return
+        if buffer[position] != ",":
+            raise ValueError(f"Expected ',' or ']', found {buffer[position]!r}")
+        position += 1
+        skip()
+
+
+class Command(BaseCommand):
+    help = (
+        "Import plants from a JSON array (loaddata fixtures or plain objects), "
+        "creating new plants and updating existing ones by primary key."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSON file to import, or - for stdin.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Plants written per INSERT statement (default: 1000).",
+        )
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Abort on the first invalid record instead of skipping it.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive.")
+        self.strict = options["strict"]
+        self.created = self.updated = self.skipped = 0
+        self.plant_ids = []
+
+        started = time.perf_counter()
+        stream = sys.stdin if options["path"] == "-" else open(options["path"])
+        try:
+            with transaction.atomic():
+                batch = []
+                for number, record in enumerate(iter_json_array(stream), start=1):
+                    plant = self.build_plant(number, record)
+                    if plant is None:
+                        continue
+                    batch.append(plant)
+                    if len(batch) >= batch_size:
+                        self.write_batch(batch)
+                        batch = []
+                if batch:
+                    self.write_batch(batch)
+                self.reset_sequences()
+                # Bulk writes bypass the model signals that keep these in sync.
+                search.rebuild_index(self.plant_ids)
+                caching.invalidate_catalog()
+        except ValueError as e:
+            raise CommandError(f"Invalid JSON: {e}")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = time.perf_counter() - started
+        total = self.created + self.updated
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {total} plant(s) ({self.created} created, "
+                f"{self.updated} updated, {self.skipped} skipped) in "
+                f"{elapsed:.2f}s, {total / elapsed if elapsed else 0:.0f} plants/s."
+            )
+        )
+
+        # Ranking the neighbours of every plant takes longer than the import
+        # itself, so it runs after the import committed, without holding its
+        # write lock.
+        started = time.perf_counter()
+        indexed = similarity.rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt the similarity index of {indexed} plant(s) in "
+                f"{time.perf_counter() - started:.2f}s."
+            )
+        )
+
+    def build_plant(self, number, record):
+        """
+        Turn a record into an unsaved Plant, or return None after reporting
+        why it is invalid.
+        """
+        try:
+            if not isinstance(record, dict):
+                raise ValidationError("expected an object")
+            if "fields" in record:
+                if record.get("model", "verdespace.plant") != "verdespace.plant":
+                    raise ValidationError(f"unexpected model {record['model']!r}")
+                pk, fields = record.get("pk"), record["fields"]
+            else:
+                fields = dict(record)
+                pk = fields.pop("pk", fields.pop("id", None))
+            if pk is not None:
+                pk = Plant._meta.pk.to_python(pk)
+            unknown = set(fields) - set(IMPORT_FIELDS) - IGNORED_FIELDS
+            if unknown:
+                raise ValidationError(f"unknown fields {', '.join(sorted(unknown))}")
+            plant = Plant(
+                pk=pk,
+                **{name: fields[name] for name in IMPORT_FIELDS if name in fields},
+            )
+            plant.clean_fields(
+                exclude=[
+                    field.name
+                    for field in Plant._meta.concrete_fields
+                    if field.name not in IMPORT_FIELDS
+                ]
+            )
+        except ValidationError as e:
+            message = f"Record {number}: {'; '.join(_messages(e))}"
+            if self.strict:
+                raise CommandError(message)
+            self.stderr.write(message)
+            self.skipped += 1
+            return None
+        return plant
+
+    def reset_sequences(self):
+        """
+        Move the primary key sequence past explicitly imported keys, as
+        loaddata does, so later inserts do not collide with them.
+        """
+        statements = connection.ops.sequence_reset_sql(no_style(), [Plant])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def write_batch(self, batch):
+        now = timezone.now()
+        for plant in batch:
+            plant.updated_at = now
+        # A row can only be upserted once per statement; the last record wins.
+        with_pk = list(
+            {plant.pk: plant for plant in batch if plant.pk is not None}.values()
+        )
+        without_pk = [plant for plant in batch if plant.pk is None]
+
+        if with_pk:
+            existing = set(
+                Plant.objects.filter(
+                    pk__in=[plant.pk for plant in with_pk]
+                ).values_list("pk", flat=True)
+            )
+            Plant.objects.bulk_create(
+                with_pk,
+                update_conflicts=True,
+                unique_fields=["id"],
+                update_fields=IMPORT_FIELDS + ["updated_at"],
+            )
+            self.updated += len(existing)
+            self.created += len(with_pk) - len(existing)
+            self.plant_ids.extend(plant.pk for plant in with_pk)
+        if without_pk:
+            # Without a key there is nothing to conflict on; a plain insert
+            # also returns the new primary keys.
+            Plant.objects.bulk_create(without_pk)
+            self.created += len(without_pk)
+            self.plant_ids.extend(plant.pk for plant in without_pk)
+
+
+def _messages(error):
+    if hasattr(error, "message_dict"):
+        return [
+            f"{field}: {' '.join(messages)}"
+            for field, messages in error.message_dict.items()
+        ]
+    return error.messages
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from verdespace.images import process_image
+from verdespace.models import PlantImage
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the image pipeline (metadata stripping, dimensions, variants) "
+        "over plant images that have not been processed yet."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "image_ids",
+            nargs="*",
+            type=int,
+            help="Only process these images (default: all unprocessed images).",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Also re-process images that were processed before.",
+        )
+
+    def handle(self, *args, **options):
+        images = PlantImage.objects.order_by("id")
+        if options["image_ids"]:
+            images = images.filter(pk__in=options["image_ids"])
+        elif not options["all"]:
+            images = images.filter(processed_at__isnull=True)
+        processed = failed = 0
+        for image_id in images.values_list("id", flat=True).iterator():
+            try:
+                process_image(image_id)
+            except Exception as e:
+                self.stderr.write(f"Image {image_id}: {e}")
+                failed += 1
+            else:
+                processed += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {processed} image(s), {failed} failed.")
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from verdespace.models import Plant
+
+
+class Command(BaseCommand):
+    help = "Recompute the rating_count, rating_sum and rating_avg columns on Plant."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "plant_ids",
+            nargs="*",
+            type=int,
+            help="Only rebuild these plants (default: all plants).",
+        )
+
+    def handle(self, *args, **options):
+        plants = Plant.objects.all()
+        if options["plant_ids"]:
+            plants = plants.filter(pk__in=options["plant_ids"])
+        updated = plants.refresh_rating_stats()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt rating stats for {updated} plant(s).")
+        )
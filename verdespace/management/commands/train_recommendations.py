@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from verdespace.recommendations import train
+
+
+class Command(BaseCommand):
+    help = (
+        "Retrain the plant recommendations from ratings and wishlists and "
+        "store every user's top plants."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        stats = train()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Trained on {stats['interactions']} interaction(s) of "
+                f"{stats['users']} user(s) with {stats['plants']} plant(s): "
+                f"{stats['recommendations']} recommendation(s) stored in "
+                f"{time.perf_counter() - started:.2f}s."
+            )
+        )
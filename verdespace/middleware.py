@@ -1,13 +1,161 @@
-class RemoveAuthorizationHeaderMiddleware:
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http.request import split_domain_port
+
+from . import instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class HostRoutedMiddleware:
     """
-    Middleware для видалення заголовка Authorization із запитів до S3.
+    Базовий клас для middleware, що діє лише на запити до певних хостів.
+
+    get_host_rules() повертає пари (шаблон хоста, назва методу). Шаблон із
+    крапкою на початку (".example.com") відповідає домену та всім його
+    піддоменам, як в ALLOWED_HOSTS. Метод викликається з request і може
+    повернути відповідь, щоб перервати обробку.
+
+    Правила компілюються один раз під час створення middleware, а результат
+    для кожного заголовка Host кешується, тож запит до хоста без правил
+    коштує один пошук у словнику.
     """
 
+    # Запити з довільними заголовками Host не повинні роздувати кеш.
+    max_cached_hosts = 1024
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.exact_hosts = {}
+        self.host_suffixes = []
+        for pattern, method_name in self.get_host_rules():
+            pattern = pattern.lower()
+            handler = getattr(self, method_name)
+            if pattern.startswith("."):
+                self.exact_hosts.setdefault(pattern[1:], handler)
+                self.host_suffixes.append((pattern, handler))
+            else:
+                self.exact_hosts.setdefault(pattern, handler)
+        if not self.exact_hosts:
+            raise MiddlewareNotUsed
+        self.host_header = (
+            "HTTP_X_FORWARDED_HOST" if settings.USE_X_FORWARDED_HOST else "HTTP_HOST"
+        )
+        self.routes = {}
+
+    def get_host_rules(self):
+        return []
 
     def __call__(self, request):
-        if "s3.amazonaws.com" in request.build_absolute_uri():
-            if "HTTP_AUTHORIZATION" in request.META:
-                del request.META["HTTP_AUTHORIZATION"]
+        host = request.META.get(self.host_header) or request.META.get("HTTP_HOST", "")
+        try:
+            handler = self.routes[host]
+        except KeyError:
+            handler = self.resolve_host(host)
+        if handler is not None:
+            response = handler(request)
+            if response is not None:
+                return response
         return self.get_response(request)
+
+    def resolve_host(self, host):
+        """
+        Знаходить обробник для значення заголовка Host і запам'ятовує його.
+        """
+        domain, _ = split_domain_port(host)
+        handler = self.exact_hosts.get(domain)
+        if handler is None:
+            for suffix, suffix_handler in self.host_suffixes:
+                if domain.endswith(suffix):
+                    handler = suffix_handler
+                    break
+        if len(self.routes) < self.max_cached_hosts:
+            self.routes[host] = handler
+        return handler
+
+
+class RemoveAuthorizationHeaderMiddleware(HostRoutedMiddleware):
+    """
+    Middleware для видалення заголовка Authorization із запитів до S3
+    (хости з VERDESPACE_STRIP_AUTHORIZATION_HOSTS).
+    """
+
+    def get_host_rules(self):
+        return [
+            (host, "remove_authorization")
+            for host in settings.VERDESPACE_STRIP_AUTHORIZATION_HOSTS
+        ]
+
+    def remove_authorization(self, request):
+        request.META.pop("HTTP_AUTHORIZATION", None)
+
+
+class InstrumentationMiddleware:
+    """
+    Middleware для вимірювання кожного запиту: тривалість, кількість і час
+    SQL-запитів, час серіалізаторів і зовнішніх викликів (S3, Telegram).
+    Оновлює гістограми для /metrics/ і пише в лог запити, довші за
+    VERDESPACE_SLOW_REQUEST_MS, з найповільнішими SQL. Заголовок
+    Server-Timing розкриває внутрішню будову, тож його отримують лише
+    в режимі DEBUG, staff-користувачі та адреси з
+    VERDESPACE_SERVER_TIMING_ALLOWED_IPS.
+    """
+
+    def __init__(self, get_response):
+        if not settings.VERDESPACE_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with instrumentation.collect() as stats, ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(instrumentation.query_wrapper)
+                )
+            response = self.get_response(request)
+        duration = time.perf_counter() - stats.started
+
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        instrumentation.observe_request(
+            view, request.method, response.status_code, stats, duration
+        )
+        if self.shows_server_timing(request):
+            response["Server-Timing"] = instrumentation.server_timing(stats, duration)
+
+        threshold = settings.VERDESPACE_SLOW_REQUEST_MS
+        if threshold and duration * 1000 >= threshold:
+            self.log_slow_request(request, view, stats, duration)
+        return response
+
+    def shows_server_timing(self, request):
+        if settings.DEBUG:
+            return True
+        user = getattr(request, "user", None)
+        if user is not None and user.is_staff:
+            return True
+        allowed = settings.VERDESPACE_SERVER_TIMING_ALLOWED_IPS
+        return request.META.get("REMOTE_ADDR") in allowed
+
+    def log_slow_request(self, request, view, stats, duration):
+        queries = "\n".join(
+            f"  {seconds * 1000:.1f}ms {sql}"
+            for seconds, sql in stats.slowest_queries(
+                settings.VERDESPACE_SLOW_REQUEST_SQL_LIMIT
+            )
+        )
+        logger.warning(
+            "Slow request: %s %s (%s) took %.1fms, %d queries in %.1fms\n%s",
+            request.method,
+            request.get_full_path(),
+            view,
+            duration * 1000,
+            stats.query_count,
+            stats.db_time * 1000,
+            queries,
+        )
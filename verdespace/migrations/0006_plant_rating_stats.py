@@ -0,0 +1,48 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:03
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Round
+
+
+def backfill_rating_stats(apps, schema_editor):
+    Plant = apps.get_model("verdespace", "Plant")
+    Rating = apps.get_model("verdespace", "Rating")
+    ratings = Rating.objects.filter(plant=OuterRef("pk")).order_by().values("plant")
+    Plant.objects.update(
+        rating_count=Coalesce(
+            Subquery(ratings.annotate(value=Count("pk")).values("value")), 0
+        ),
+        rating_sum=Coalesce(
+            Subquery(ratings.annotate(value=Sum("rating")).values("value")), 0
+        ),
+        rating_avg=Subquery(
+            ratings.annotate(value=Round(Avg("rating"), 2)).values("value")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("verdespace", "0005_alter_plant_light_needs_alter_plant_size_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plant",
+            name="rating_avg",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="plant",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="plant",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rating_stats, migrations.RunPython.noop),
+    ]
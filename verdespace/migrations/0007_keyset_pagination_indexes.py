@@ -0,0 +1,46 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:05
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("verdespace", "0006_plant_rating_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rating",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["created_at", "id"], name="verdespace__created_1f5059_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="plant",
+            index=models.Index(
+                fields=["created_at", "id"], name="verdespace__created_b3c00c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="plantimage",
+            index=models.Index(
+                fields=["uploaded_at", "id"], name="verdespace__uploade_1b6d07_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["created_at", "id"], name="verdespace__created_10d14c_idx"
+            ),
+        ),
+    ]
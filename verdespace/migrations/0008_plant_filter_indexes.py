@@ -0,0 +1,45 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:07
+
+from django.db import migrations, models
+
+
+def create_name_trigram_index(apps, schema_editor):
+    # `name__icontains` compiles to UPPER(name) LIKE '%...%' on PostgreSQL;
+    # a trigram index on that expression answers it without a table scan.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS verdespace_plant_name_trgm "
+        "ON verdespace_plant USING gin ((UPPER(name::text)) gin_trgm_ops)"
+    )
+
+
+def drop_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS verdespace_plant_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("verdespace", "0007_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="plant",
+            index=models.Index(
+                fields=["category", "size"], name="verdespace__categor_339cc0_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="plant",
+            index=models.Index(
+                fields=["light_needs", "water_needs"],
+                name="verdespace__light_n_93f9b2_idx",
+            ),
+        ),
+        migrations.RunPython(create_name_trigram_index, drop_name_trigram_index),
+    ]
@@ -0,0 +1,48 @@
+from django.db import migrations
+
+# verdespace.search.SEARCH_VECTOR, which queries must match
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(tips, '')), 'C')"
+)
+
+
+def create_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS verdespace_plant_search "
+            f"ON verdespace_plant USING gin (({SEARCH_VECTOR}))"
+        )
+        return
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS verdespace_plant_fts USING fts5("
+        "name, description, tips, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    schema_editor.execute(
+        "INSERT INTO verdespace_plant_fts (rowid, name, description, tips) "
+        "SELECT id, name, description, tips FROM verdespace_plant"
+    )
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS verdespace_plant_search")
+        return
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS verdespace_plant_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("verdespace", "0008_plant_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("verdespace", "0009_plant_fts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plant",
+            name="updated_at",
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now
+            ),
+        ),
+        migrations.AddField(
+            model_name="plant",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
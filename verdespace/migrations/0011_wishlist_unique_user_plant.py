@@ -0,0 +1,35 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:34
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_wishlists(apps, schema_editor):
+    WishList = apps.get_model("verdespace", "WishList")
+    duplicates = (
+        WishList.objects.filter(plant__isnull=False)
+        .values("user_id", "plant_id")
+        .annotate(keep=Min("id"), count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        WishList.objects.filter(
+            user_id=row["user_id"], plant_id=row["plant_id"]
+        ).exclude(id=row["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("verdespace", "0010_plant_updated_at_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_wishlists, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="wishlist",
+            constraint=models.UniqueConstraint(
+                fields=("user", "plant"), name="verdespace_wishlist_unique_user_plant"
+            ),
+        ),
+    ]
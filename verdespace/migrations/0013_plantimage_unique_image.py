@@ -0,0 +1,32 @@
+# Generated by Django 4.2.20 on 2026-10-18 15:13
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_images(apps, schema_editor):
+    PlantImage = apps.get_model("verdespace", "PlantImage")
+    duplicates = (
+        PlantImage.objects.values("image")
+        .annotate(keep=Min("id"), count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        PlantImage.objects.filter(image=row["image"]).exclude(id=row["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("verdespace", "0012_plantimage_variants"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_images, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="plantimage",
+            constraint=models.UniqueConstraint(
+                fields=("image",), name="verdespace_plantimage_unique_image"
+            ),
+        ),
+    ]
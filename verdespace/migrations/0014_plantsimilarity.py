@@ -0,0 +1,95 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("verdespace", "0013_plantimage_unique_image"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlantSimilarity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                (
+                    "plant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similarities",
+                        to="verdespace.plant",
+                    ),
+                ),
+                (
+                    "similar",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="verdespace.plant",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="plantsimilarity",
+            constraint=models.UniqueConstraint(
+                fields=("plant", "rank"), name="verdespace_similarity_unique_rank"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="plantsimilarity",
+            index=models.Index(
+                fields=["rank", "plant", "score"], name="verdespace_similarity_floor"
+            ),
+        ),
+        migrations.CreateModel(
+            name="PlantFeatures",
+            fields=[
+                (
+                    "plant",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="features",
+                        serialize=False,
+                        to="verdespace.plant",
+                    ),
+                ),
+                ("columns", models.BinaryField()),
+                ("values", models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SimilaritySpace",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("attributes", models.JSONField()),
+                ("terms", models.JSONField()),
+                ("idf", models.JSONField()),
+                ("plants", models.PositiveIntegerField()),
+                ("changes", models.PositiveIntegerField(default=0)),
+                ("fitted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -1,123 +1,300 @@
-from django.conf import settings
-from django.db import models
-import uuid
-
-
-class Plant(models.Model):
-    SIZE_CHOICES = [
-        ("Small", "Small"),
-        ("Medium", "Medium"),
-        ("Large", "Large"),
-    ]
-
-    WATER_REQUIREMENT_CHOICES = [
-        ("Rarely", "Rarely"),
-        ("Moderately", "Moderately"),
-        ("Often", "Often"),
-    ]
-
-    SUNLIGHT_REQUIREMENT_CHOICES = [
-        ("Bright", "Bright"),
-        ("Scattered", "Scattered"),
-        ("Shadow", "Shadow"),
-    ]
-
-    CARE_REQUIREMENT_CHOICES = [
-        ("Easy", "Easy"),
-        ("Medium", "Medium"),
-        ("Difficult", "Difficult"),
-    ]
-
-    CATEGORY_CHOICES = [
-        ("Air-Purifying", "Air-Purifying"),
-        ("Decorative", "Decorative"),
-        ("Flowering", "Flowering"),
-        ("Succulent", "Succulent"),
-        ("Cactus", "Cactus"),
-        ("Rare", "Rare"),
-        ("Edible", "Edible"),
-        ("Medicinal", "Medicinal"),
-        ("Climbing", "Climbing"),
-        ("Ornamental Grass", "Ornamental Grass"),
-    ]
-
-    name = models.CharField(max_length=100)
-    description = models.TextField()
-    tips = models.TextField()
-    light_needs = models.CharField(max_length=10, choices=SUNLIGHT_REQUIREMENT_CHOICES)
-    water_needs = models.CharField(max_length=15, choices=WATER_REQUIREMENT_CHOICES)
-    care = models.CharField(max_length=10, choices=CARE_REQUIREMENT_CHOICES)
-    air_purifying = models.BooleanField(default=False)
-    allergenic = models.BooleanField(default=False)
-    size = models.CharField(max_length=10, choices=SIZE_CHOICES)
-    blooms = models.BooleanField(default=False)
-    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
-    created_at = models.DateTimeField(auto_now_add=True, blank=True, null=True)
-
-    def average_rating(self):
-        ratings = self.ratings.all()
-        return round(sum(r.rating for r in ratings) / len(ratings), 2) if ratings else None
-
-    def __str__(self):
-        return self.name
-
-
-def unique_image_name(instance, filename):
-    """
-    Генерує унікальну назву для зображення.
-    """
-    extension = filename.split(".")[-1]
-    unique_filename = f"{uuid.uuid4().hex}.{extension}"
-    return f"plants/{unique_filename}"
-
-
-class PlantImage(models.Model):
-    plant = models.ForeignKey("Plant", related_name="images", on_delete=models.CASCADE)
-    image = models.ImageField(
-        upload_to=unique_image_name
-    )
-    uploaded_at = models.DateTimeField(auto_now_add=True)
-
-    def __str__(self):
-        return f"Image for {self.plant.name}"
-
-
-class Comment(models.Model):
-    text = models.TextField()
-    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    plant = models.ForeignKey(
-        "Plant", related_name="comments", on_delete=models.CASCADE
-    )
-    parent = models.ForeignKey(
-        "self", null=True, blank=True, related_name="replies", on_delete=models.CASCADE
-    )
-    image = models.ImageField(upload_to="comments/", blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-
-    def __str__(self):
-        if self.parent:
-            return f"Reply by {self.author} to {self.parent.author}'s comment"
-        return f"Comment by {self.author} on {self.plant}"
-
-
-class WishList(models.Model):
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    plant = models.ForeignKey(
-        Plant, related_name="wishlists", on_delete=models.CASCADE, null=True, blank=True
-    )
-    created_at = models.DateTimeField(auto_now_add=True)
-
-    def __str__(self):
-        return f"{self.user.username}'s wishlist: {self.plant.name if self.plant else 'No plant specified'}"
-
-
-class Rating(models.Model):
-    plant = models.ForeignKey(Plant, related_name="ratings", on_delete=models.CASCADE)
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    rating = models.IntegerField(choices=[(i, str(i)) for i in range(1, 6)])
-
-    class Meta:
-        unique_together = ('plant', 'user')  # Кожен користувач може оцінити рослину лише один раз
-
-    def __str__(self):
-        return f"Rating {self.rating} by {self.user} for {self.plant}"
+from django.conf import settings
+from django.db import models
+from django.db.models import Avg, Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Round
+from django.utils import timezone
+import uuid
+
+
+class PlantQuerySet(models.QuerySet):
+    def refresh_rating_stats(self):
+        """
+        Recompute the stored rating aggregates for every plant in the queryset
+        with a single UPDATE statement.
+        """
+        ratings = (
+            Rating.objects.filter(plant=OuterRef("pk")).order_by().values("plant")
+        )
+        return self.update(
+            rating_count=Coalesce(
+                Subquery(ratings.annotate(value=Count("pk")).values("value")), 0
+            ),
+            rating_sum=Coalesce(
+                Subquery(ratings.annotate(value=Sum("rating")).values("value")), 0
+            ),
+            rating_avg=Subquery(
+                ratings.annotate(value=Round(Avg("rating"), 2)).values("value")
+            ),
+        )
+
+    def touch(self):
+        """
+        Mark the plants as modified, e.g. when one of their images, comments
+        or ratings changes, so HTTP validators computed from them change too.
+        """
+        return self.update(updated_at=timezone.now(), version=F("version") + 1)
+
+
+class Plant(models.Model):
+    SIZE_CHOICES = [
+        ("Small", "Small"),
+        ("Medium", "Medium"),
+        ("Large", "Large"),
+    ]
+
+    WATER_REQUIREMENT_CHOICES = [
+        ("Rarely", "Rarely"),
+        ("Moderately", "Moderately"),
+        ("Often", "Often"),
+    ]
+
+    SUNLIGHT_REQUIREMENT_CHOICES = [
+        ("Bright", "Bright"),
+        ("Scattered", "Scattered"),
+        ("Shadow", "Shadow"),
+    ]
+
+    CARE_REQUIREMENT_CHOICES = [
+        ("Easy", "Easy"),
+        ("Medium", "Medium"),
+        ("Difficult", "Difficult"),
+    ]
+
+    CATEGORY_CHOICES = [
+        ("Air-Purifying", "Air-Purifying"),
+        ("Decorative", "Decorative"),
+        ("Flowering", "Flowering"),
+        ("Succulent", "Succulent"),
+        ("Cactus", "Cactus"),
+        ("Rare", "Rare"),
+        ("Edible", "Edible"),
+        ("Medicinal", "Medicinal"),
+        ("Climbing", "Climbing"),
+        ("Ornamental Grass", "Ornamental Grass"),
+    ]
+
+    name = models.CharField(max_length=100)
+    description = models.TextField()
+    tips = models.TextField()
+    light_needs = models.CharField(max_length=10, choices=SUNLIGHT_REQUIREMENT_CHOICES)
+    water_needs = models.CharField(max_length=15, choices=WATER_REQUIREMENT_CHOICES)
+    care = models.CharField(max_length=10, choices=CARE_REQUIREMENT_CHOICES)
+    air_purifying = models.BooleanField(default=False)
+    allergenic = models.BooleanField(default=False)
+    size = models.CharField(max_length=10, choices=SIZE_CHOICES)
+    blooms = models.BooleanField(default=False)
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, blank=True, null=True)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_avg = models.FloatField(null=True, blank=True, editable=False)
+    # not auto_now: fixtures without the field must still load
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = PlantQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["category", "size"]),
+            models.Index(fields=["light_needs", "water_needs"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.updated_at = timezone.now()
+            self.version += 1
+        super().save(*args, **kwargs)
+
+    def average_rating(self):
+        return self.rating_avg
+
+    def __str__(self):
+        return self.name
+
+
+def unique_image_name(instance, filename):
+    """
+    Генерує унікальну назву для зображення.
+    """
+    extension = filename.split(".")[-1]
+    unique_filename = f"{uuid.uuid4().hex}.{extension}"
+    return f"plants/{unique_filename}"
+
+
+class PlantImage(models.Model):
+    plant = models.ForeignKey("Plant", related_name="images", on_delete=models.CASCADE)
+    image = models.ImageField(
+        upload_to=unique_image_name
+    )
+    uploaded_at = models.DateTimeField(auto_now_add=True)
+    # Filled in by the image pipeline (verdespace.images) after upload
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    variants = models.JSONField(default=dict, blank=True, editable=False)
+    processed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [models.Index(fields=["uploaded_at", "id"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["image"], name="verdespace_plantimage_unique_image"
+            )
+        ]
+
+    def __str__(self):
+        return f"Image for {self.plant.name}"
+
+
+class Comment(models.Model):
+    text = models.TextField()
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    plant = models.ForeignKey(
+        "Plant", related_name="comments", on_delete=models.CASCADE
+    )
+    parent = models.ForeignKey(
+        "self", null=True, blank=True, related_name="replies", on_delete=models.CASCADE
+    )
+    image = models.ImageField(upload_to="comments/", blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["created_at", "id"])]
+
+    def __str__(self):
+        if self.parent:
+            return f"Reply by {self.author} to {self.parent.author}'s comment"
+        return f"Comment by {self.author} on {self.plant}"
+
+
+class WishList(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    plant = models.ForeignKey(
+        Plant, related_name="wishlists", on_delete=models.CASCADE, null=True, blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "plant"], name="verdespace_wishlist_unique_user_plant"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}'s wishlist: {self.plant.name if self.plant else 'No plant specified'}"
+
+
+class Rating(models.Model):
+    plant = models.ForeignKey(Plant, related_name="ratings", on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    rating = models.IntegerField(choices=[(i, str(i)) for i in range(1, 6)])
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('plant', 'user')  # Кожен користувач може оцінити рослину лише один раз
+        indexes = [models.Index(fields=["created_at", "id"])]
+
+    def __str__(self):
+        return f"Rating {self.rating} by {self.user} for {self.plant}"
+
+
+class PlantSimilarity(models.Model):
+    """
+    One precomputed neighbour of a plant in the similarity index, see
+    verdespace.similarity. Rank 0 is the most similar plant.
+    """
+
+    plant = models.ForeignKey(
+        Plant, related_name="similarities", on_delete=models.CASCADE
+    )
+    similar = models.ForeignKey(Plant, related_name="+", on_delete=models.CASCADE)
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["plant", "rank"], name="verdespace_similarity_unique_rank"
+            )
+        ]
+        indexes = [
+            # The last neighbour of every plant, read by incremental updates
+            models.Index(
+                fields=["rank", "plant", "score"], name="verdespace_similarity_floor"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.similar} is similar to {self.plant} ({self.score:.2f})"
+
+
+class SimilaritySpace(models.Model):
+    """
+    The feature space the stored plant vectors are encoded in, see
+    verdespace.similarity.FeatureSpace. A single row, refitted whenever the
+    similarity index is rebuilt from scratch and locked by every index write.
+    """
+
+    attributes = models.JSONField()
+    terms = models.JSONField()
+    idf = models.JSONField()
+    # Catalog size when the space was fitted, and plant updates encoded since
+    plants = models.PositiveIntegerField()
+    changes = models.PositiveIntegerField(default=0)
+    fitted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Similarity space of {self.plants} plant(s) ({len(self.terms)} words)"
+
+
+class PlantFeatures(models.Model):
+    """
+    Feature vector of a plant in the current SimilaritySpace, stored as the
+    int32 columns and float32 values of its non-zero entries.
+    """
+
+    plant = models.OneToOneField(
+        Plant, primary_key=True, related_name="features", on_delete=models.CASCADE
+    )
+    columns = models.BinaryField()
+    values = models.BinaryField()
+
+    def __str__(self):
+        return f"Features of {self.plant_id}"
+
+
+class Recommendation(models.Model):
+    """
+    One precomputed recommendation, see verdespace.recommendations.
+    Rows without a user hold the popular plants shown to users without
+    ratings or wishlists. Rank 0 is the best match.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="recommendations",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+    )
+    plant = models.ForeignKey(Plant, related_name="+", on_delete=models.CASCADE)
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "rank"], name="verdespace_recommendation_unique_rank"
+            ),
+            # NULL users never collide above, so the popular ranks need their own
+            models.UniqueConstraint(
+                fields=["rank"],
+                condition=Q(user__isnull=True),
+                name="verdespace_recommendation_unique_popular_rank",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.plant} for {self.user or 'everyone'} ({self.score:.2f})"
@@ -0,0 +1,273 @@
+import atexit
+import logging
+import queue
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .instrumentation import outbound
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Messages sent through LocMemBackend, for tests.
+outbox = []
+
+
+def is_network_error(error):
+    """
+    Failures worth retrying by default: the connection, not the message,
+    was at fault.
+    """
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+class NotificationDispatcher:
+    """
+    Delivers notifications from a background thread so request handlers never
+    wait on the messaging API.
+
+    Messages go into a bounded in-process queue. The worker collects whatever
+    arrives within `batch_window` seconds (up to `max_batch_size` messages)
+    and sends it as one digest, waits at least `min_interval` seconds between
+    sends and retries failed sends with exponential backoff, as long as
+    `retryable(error)` says the failure is worth retrying.
+    """
+
+    def __init__(
+        self,
+        send,
+        max_queue_size=1000,
+        batch_window=2.0,
+        max_batch_size=20,
+        min_interval=1.0,
+        max_retries=3,
+        backoff=1.0,
+        max_message_length=TELEGRAM_MESSAGE_LIMIT,
+        retryable=None,
+    ):
+        self.send = send
+        self.retryable = retryable or is_network_error
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_message_length = max_message_length
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self._worker = None
+        self._exit_hook = False
+        self._lock = threading.Lock()
+        self._last_sent = 0.0
+
+    def submit(self, message):
+        """
+        Queue a message without blocking.
+        Returns False when the queue is full and the message was dropped.
+        """
+        self.start()
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            logger.warning("Notification queue is full, dropping message")
+            return False
+        return True
+
+    def start(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="notification-dispatcher", daemon=True
+                )
+                self._worker.start()
+                if not self._exit_hook:
+                    atexit.register(self.flush, timeout=5)
+                    self._exit_hook = True
+
+    def flush(self, timeout=None):
+        """
+        Block until every queued message has been handled.
+        Returns False if `timeout` seconds passed first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                for text in self.compose(batch):
+                    self._deliver(text)
+            except Exception:
+                logger.exception("Failed to dispatch %d notification(s)", len(batch))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def compose(self, messages):
+        """
+        Merge a batch into digest texts that fit the message length limit.
+        """
+        if len(messages) == 1:
+            parts = [messages[0]]
+        else:
+            parts = [f"{len(messages)} updates"] + list(messages)
+        texts = []
+        current = ""
+        for part in parts:
+            part = part[: self.max_message_length]
+            candidate = f"{current}\n\n{part}" if current else part
+            if len(candidate) > self.max_message_length:
+                texts.append(current)
+                candidate = part
+            current = candidate
+        texts.append(current)
+        return texts
+
+    def _deliver(self, text):
+        for attempt in range(self.max_retries + 1):
+            wait = self._last_sent + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                self.send(text)
+            except Exception as e:
+                self._last_sent = time.monotonic()
+                if attempt == self.max_retries or not self.retryable(e):
+                    raise
+                delay = self.backoff * 2**attempt
+                delay += random.uniform(0, delay / 2)
+                logger.warning("Notification failed (%s), retrying in %.1fs", e, delay)
+                time.sleep(delay)
+            else:
+                self._last_sent = time.monotonic()
+                return
+
+
+class BaseBackend:
+    """
+    A notification backend delivers one text message.
+    Asynchronous backends are wrapped in a NotificationDispatcher.
+    """
+
+    asynchronous = True
+
+    def send(self, text):
+        raise NotImplementedError
+
+    def is_retryable(self, error):
+        return is_network_error(error)
+
+
+class TelegramBackend(BaseBackend):
+    """
+    Sends notifications to the configured Telegram chat.
+    """
+
+    def __init__(self):
+        from .telegram_sender import TelegramSender
+
+        self.sender = TelegramSender()
+
+    def send(self, text):
+        with outbound("telegram"):
+            self.sender.deliver(text)
+
+    def is_retryable(self, error):
+        return self.sender.is_retryable(error)
+
+
+class LoggingBackend(BaseBackend):
+    """
+    Writes notifications to the log instead of sending them anywhere.
+    """
+
+    asynchronous = False
+
+    def send(self, text):
+        logger.info("Notification: %s", text)
+
+
+class LocMemBackend(BaseBackend):
+    """
+    Collects notifications in `verdespace.notifications.outbox`.
+    """
+
+    asynchronous = False
+
+    def send(self, text):
+        outbox.append(text)
+
+
+_notifier = None
+_notifier_lock = threading.Lock()
+
+
+def get_notifier():
+    """
+    Return the process-wide notifier, building it on first use from
+    VERDESPACE_NOTIFICATION_BACKEND. A backend that cannot be configured
+    is replaced by LoggingBackend so notifications never break a request.
+    """
+    global _notifier
+    if _notifier is None:
+        with _notifier_lock:
+            if _notifier is None:
+                _notifier = _build_notifier()
+    return _notifier
+
+
+def _build_notifier():
+    try:
+        backend = import_string(settings.VERDESPACE_NOTIFICATION_BACKEND)()
+    except Exception:
+        logger.exception("Could not configure the notification backend")
+        backend = LoggingBackend()
+    if not backend.asynchronous:
+        return backend.send
+    dispatcher = NotificationDispatcher(
+        backend.send,
+        max_queue_size=settings.VERDESPACE_NOTIFICATION_QUEUE_SIZE,
+        batch_window=settings.VERDESPACE_NOTIFICATION_BATCH_WINDOW,
+        min_interval=settings.VERDESPACE_NOTIFICATION_MIN_INTERVAL,
+        max_retries=settings.VERDESPACE_NOTIFICATION_MAX_RETRIES,
+        retryable=backend.is_retryable,
+    )
+    return dispatcher.submit
+
+
+def notify(text):
+    """
+    Send a notification through the configured backend.
+    """
+    get_notifier()(text)
+
+
+@receiver(setting_changed)
+def reset_notifier(setting, **kwargs):
+    global _notifier
+    if setting.startswith("VERDESPACE_NOTIFICATION_"):
+        _notifier = None
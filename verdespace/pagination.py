@@ -0,0 +1,178 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over `(created_at, id)`.
+
+    Each page seeks past the last row seen in `(created_at, id)` order instead
+    of using an OFFSET, so deep pages cost the same as the first one and rows
+    inserted while a client is paging never shift or duplicate results.
+    Cursors are opaque base64 tokens; NULL `created_at` values sort first.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    timestamp_field = "created_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self):
+        self.page_size = settings.VERDESPACE_PAGE_SIZE
+        self.max_page_size = settings.VERDESPACE_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor["reverse"])
+
+        queryset = queryset.order_by(*self.get_ordering(reverse))
+        if self.cursor:
+            queryset = queryset.filter(
+                self.get_seek_filter(self.cursor["key"], reverse)
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Number of results per page (max {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, reverse=False):
+        timestamp = F(self.timestamp_field)
+        if reverse:
+            return timestamp.desc(nulls_last=True), "-pk"
+        return timestamp.asc(nulls_first=True), "pk"
+
+    def get_seek_filter(self, key, reverse=False):
+        """
+        Filter the rows after `key` in `(created_at, id)` order (before it when
+        paging backwards), expanded as `created_at > t OR (created_at = t AND
+        id > pk)` since the ORM has no row-value comparison. NULL timestamps
+        sort before any value.
+        """
+        timestamp, pk = key
+        field = self.timestamp_field
+        if timestamp is None:
+            if reverse:
+                return Q(**{f"{field}__isnull": True, "pk__lt": pk})
+            return Q(**{f"{field}__isnull": False}) | Q(
+                **{f"{field}__isnull": True, "pk__gt": pk}
+            )
+        if reverse:
+            return (
+                Q(**{f"{field}__lt": timestamp})
+                | Q(**{field: timestamp, "pk__lt": pk})
+                | Q(**{f"{field}__isnull": True})
+            )
+        return Q(**{f"{field}__gt": timestamp}) | Q(**{field: timestamp, "pk__gt": pk})
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse):
+        timestamp = getattr(instance, self.timestamp_field)
+        payload = {
+            "r": int(reverse),
+            "t": timestamp.isoformat() if timestamp is not None else None,
+            "p": instance.pk,
+        }
+        token = b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, token.decode("ascii")
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(b64decode(encoded.encode("ascii"), validate=True))
+            timestamp = payload["t"]
+            if timestamp is not None:
+                timestamp = parse_datetime(timestamp)
+                if timestamp is None:
+                    raise ValueError
+            pk = int(payload["p"])
+            reverse = bool(payload["r"])
+        except (BinasciiError, KeyError, TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return {"reverse": reverse, "key": (timestamp, pk)}
+
+
+class PlantImagePagination(KeysetPagination):
+    timestamp_field = "uploaded_at"
@@ -0,0 +1,230 @@
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from scipy import sparse
+
+from .caching import bump_version, get_version
+from .models import Plant, Rating, Recommendation, WishList
+
+VERSION_KEY = "recommendations:version"
+
+
+def rating_weight(rating):
+    """
+    Interest shown by a rating: 5 stars is 1.0, 2 stars or less is none.
+    """
+    return max(0.0, (rating - 2) / 3)
+
+
+class InteractionMatrix:
+    """
+    Sparse user x plant matrix of interest from ratings and wishlists, the
+    stronger of the two where a user did both, plus the plants every user
+    has already rated or wishlisted (including poorly rated ones).
+    """
+
+    def __init__(self, user_ids, plant_ids, interest, seen):
+        self.user_ids = user_ids
+        self.plant_ids = plant_ids
+        self.interest = interest
+        self.seen = seen
+
+    @classmethod
+    def build(cls):
+        weights = {}
+        for user_id, plant_id, rating in Rating.objects.values_list(
+            "user_id", "plant_id", "rating"
+        ).iterator():
+            weights[user_id, plant_id] = rating_weight(rating)
+        wishlist_weight = settings.VERDESPACE_RECOMMENDATION_WISHLIST_WEIGHT
+        for user_id, plant_id in (
+            WishList.objects.filter(plant__isnull=False)
+            .values_list("user_id", "plant_id")
+            .iterator()
+        ):
+            weights[user_id, plant_id] = max(
+                weights.get((user_id, plant_id), 0.0), wishlist_weight
+            )
+
+        plant_ids = np.array(
+            Plant.objects.order_by("pk").values_list("pk", flat=True), dtype=np.int64
+        )
+        user_ids = np.array(sorted({user_id for user_id, _ in weights}), dtype=np.int64)
+        # Interactions with plants deleted since they were read are dropped.
+        known = set(plant_ids.tolist())
+        pairs = [
+            (user_id, plant_id, weight)
+            for (user_id, plant_id), weight in weights.items()
+            if plant_id in known
+        ]
+        rows = np.searchsorted(
+            user_ids, np.array([pair[0] for pair in pairs], dtype=np.int64)
+        )
+        columns = np.searchsorted(
+            plant_ids, np.array([pair[1] for pair in pairs], dtype=np.int64)
+        )
+        shape = (len(user_ids), len(plant_ids))
+        seen = sparse.csr_matrix(
+            (np.ones(len(pairs), dtype=np.float32), (rows, columns)), shape=shape
+        )
+        interest = sparse.csr_matrix(
+            (np.array([pair[2] for pair in pairs], dtype=np.float32), (rows, columns)),
+            shape=shape,
+        )
+        interest.eliminate_zeros()
+        return cls(user_ids, plant_ids, interest, seen)
+
+
+def _top(indices, scores, n):
+    """
+    The `n` highest scoring (index, score) pairs, best first, ties broken
+    by the lower index.
+    """
+    if len(scores) > n:
+        keep = np.argpartition(-scores, n - 1)[:n]
+        indices, scores = indices[keep], scores[keep]
+    order = np.lexsort((indices, -scores))
+    return indices[order], scores[order]
+
+
+def item_similarity(interest, neighbours):
+    """
+    Cosine similarity between the plant columns of `interest`, keeping the
+    `neighbours` most similar plants of each plant.
+    """
+    norms = np.sqrt(np.asarray(interest.multiply(interest).sum(axis=0)).ravel())
+    inverse = np.divide(1, norms, out=np.zeros_like(norms), where=norms > 0)
+    normalized = interest @ sparse.diags(inverse)
+    similarity = (normalized.T @ normalized).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    rows, columns, values = [], [], []
+    for row in range(similarity.shape[0]):
+        start, end = similarity.indptr[row], similarity.indptr[row + 1]
+        top, scores = _top(
+            similarity.indices[start:end], similarity.data[start:end], neighbours
+        )
+        rows.extend([row] * len(top))
+        columns.extend(top.tolist())
+        values.extend(scores.tolist())
+    return sparse.csr_matrix(
+        (np.array(values, dtype=np.float32), (rows, columns)), shape=similarity.shape
+    )
+
+
+def train():
+    """
+    Recompute every user's recommendations: the plants most similar to the
+    ones they liked or wishlisted, weighted by how much they liked them,
+    leaving out plants they already rated or wishlisted. Users without any
+    interest get the most popular plants. Returns training statistics.
+    """
+    matrix = InteractionMatrix.build()
+    count = settings.VERDESPACE_RECOMMENDATIONS
+    similarity = item_similarity(
+        matrix.interest, settings.VERDESPACE_RECOMMENDATION_NEIGHBOURS
+    )
+    scores = (matrix.interest @ similarity).tocsr()
+
+    recommendations = []
+    for row, user_id in enumerate(matrix.user_ids.tolist()):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        columns, values = scores.indices[start:end], scores.data[start:end]
+        seen = matrix.seen.indices[
+            matrix.seen.indptr[row] : matrix.seen.indptr[row + 1]
+        ]
+        keep = ~np.isin(columns, seen) & (values > 0)
+        top, top_scores = _top(columns[keep], values[keep], count)
+        recommendations.extend(
+            Recommendation(
+                user_id=user_id,
+                plant_id=int(matrix.plant_ids[column]),
+                rank=rank,
+                score=float(score),
+            )
+            for rank, (column, score) in enumerate(zip(top, top_scores))
+        )
+
+    popularity = np.asarray(matrix.interest.sum(axis=0)).ravel()
+    columns = np.flatnonzero(popularity)
+    top, top_scores = _top(columns, popularity[columns], count)
+    recommendations.extend(
+        Recommendation(
+            plant_id=int(matrix.plant_ids[column]), rank=rank, score=float(score)
+        )
+        for rank, (column, score) in enumerate(zip(top, top_scores))
+    )
+
+    with transaction.atomic():
+        Recommendation.objects.all().delete()
+        Recommendation.objects.bulk_create(recommendations, batch_size=2000)
+        invalidate()
+    return {
+        "users": len(matrix.user_ids),
+        "plants": len(matrix.plant_ids),
+        "interactions": matrix.seen.nnz,
+        "recommendations": len(recommendations),
+    }
+
+
+def get_cache():
+    return caches[settings.VERDESPACE_RECOMMENDATION_CACHE]
+
+
+def invalidate():
+    """
+    Make every cached recommendation list stale, now and again after commit
+    so no list cached from the previous training run survives.
+    """
+
+    def bump():
+        bump_version(VERSION_KEY, get_cache())
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def for_user(user_id):
+    """
+    Precomputed recommendations of a user as (plant id, score) pairs, best
+    first, followed by the popular plants not already listed, so the list
+    can still be filled once the plants the user rated or wishlisted since
+    training are left out. Cached per user until the next training run.
+    """
+    cache = get_cache()
+    version = get_version(VERSION_KEY, cache)
+    key = f"recommendations:{version}:{user_id}"
+    recommended = cache.get(key)
+    if recommended is None:
+        recommended = _stored(user_id)
+        listed = {plant_id for plant_id, _ in recommended}
+        recommended += [
+            (plant_id, score)
+            for plant_id, score in _popular(cache, version)
+            if plant_id not in listed
+        ]
+        cache.set(
+            key, recommended, timeout=settings.VERDESPACE_RECOMMENDATION_CACHE_TIMEOUT
+        )
+    return recommended
+
+
+def _stored(user_id):
+    return list(
+        Recommendation.objects.filter(user_id=user_id)
+        .order_by("rank")
+        .values_list("plant_id", "score")
+    )
+
+
+def _popular(cache, version):
+    key = f"recommendations:{version}:popular"
+    popular = cache.get(key)
+    if popular is None:
+        popular = _stored(None)
+        cache.set(
+            key, popular, timeout=settings.VERDESPACE_RECOMMENDATION_CACHE_TIMEOUT
+        )
+    return popular
@@ -0,0 +1,158 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Plant
+
+FTS_TABLE = "verdespace_plant_fts"
+
+# bm25() weights for the indexed columns: name, description, tips
+COLUMN_WEIGHTS = (10.0, 2.0, 1.0)
+
+# On PostgreSQL the index is a GIN index over this expression, created by
+# migration 0009; queries must spell it the same way for the planner to use it.
+SEARCH_VECTOR = " || ".join(
+    f"setweight(to_tsvector('simple', coalesce({Plant._meta.db_table}.{column}, "
+    f"'')), '{weight}')"
+    for column, weight in (("name", "A"), ("description", "B"), ("tips", "C"))
+)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def is_supported():
+    """
+    The inverted index is an SQLite FTS5 table, or a GIN index over a
+    tsvector on PostgreSQL; other backends fall back to plain ORM lookups.
+    """
+    return connection.vendor in ("sqlite", "postgresql")
+
+
+def has_fts_table():
+    """
+    Only the SQLite index is a separate table kept in step with the plants;
+    PostgreSQL maintains its expression index itself.
+    """
+    return connection.vendor == "sqlite"
+
+
+def build_match_expression(query):
+    """
+    Turn free text into an FTS5 MATCH expression where every word must
+    appear, each as a prefix ("mon lea" matches "Monstera leaves").
+    Words are quoted, so user input can never inject FTS5 operators.
+    """
+    tokens = TOKEN_RE.findall(query.lower())
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def build_tsquery(query):
+    """
+    The PostgreSQL counterpart of build_match_expression: every word, as a
+    prefix, must appear ("mon lea" becomes 'mon':* & 'lea':*).
+    """
+    tokens = TOKEN_RE.findall(query.lower())
+    return " & ".join(f"'{token}':*" for token in tokens)
+
+
+def index_plant(plant):
+    """
+    Insert or replace the index entry of a single plant.
+    """
+    if not has_fts_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [plant.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, name, description, tips) "
+            "VALUES (%s, %s, %s, %s)",
+            [plant.pk, plant.name, plant.description, plant.tips],
+        )
+
+
+def remove_plant(plant_id):
+    """
+    Drop a plant from the index.
+    """
+    if not has_fts_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [plant_id])
+
+
+def rebuild_index(plant_ids=None):
+    """
+    Re-index the given plants (or the whole catalog) straight from the plant
+    table. Used after bulk writes that bypass model signals.
+    """
+    if not has_fts_table():
+        return
+    select = "SELECT id, name, description, tips FROM verdespace_plant"
+    with connection.cursor() as cursor:
+        if plant_ids is None:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, description, tips) {select}"
+            )
+            return
+        plant_ids = list(plant_ids)
+        for start in range(0, len(plant_ids), 500):
+            batch = plant_ids[start : start + 500]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", batch
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, description, tips) "
+                f"{select} WHERE id IN ({placeholders})",
+                batch,
+            )
+
+
+def search_queryset(queryset, query):
+    """
+    Narrow `queryset` to the plants matching `query`, best match first.
+    Whatever filters `queryset` carries are applied in the same query, so
+    matches they exclude never take the place of the ones they keep.
+    """
+    match = build_match_expression(query)
+    if not match:
+        return queryset.none()
+    if connection.vendor == "postgresql":
+        tsquery = build_tsquery(query)
+        matches = RawSQL(
+            f"({SEARCH_VECTOR}) @@ to_tsquery('simple', %s)",
+            [tsquery],
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(f"ts_rank({SEARCH_VECTOR}, to_tsquery('simple', %s))", [tsquery])
+        return (
+            queryset.filter(matches)
+            .annotate(search_rank=rank)
+            .order_by("-search_rank", "pk")
+        )
+    if not is_supported():
+        condition = Q()
+        for token in TOKEN_RE.findall(query):
+            condition &= (
+                Q(name__icontains=token)
+                | Q(description__icontains=token)
+                | Q(tips__icontains=token)
+            )
+        return queryset.filter(condition).order_by("name", "pk")
+    weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS)
+    matches = RawSQL(
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+    )
+    rank = RawSQL(
+        f"SELECT bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %s AND rowid = {Plant._meta.db_table}.id",
+        [match],
+    )
+    return (
+        queryset.filter(pk__in=matches)
+        .annotate(search_rank=rank)
+        .order_by("search_rank", "pk")
+    )
@@ -1,15 +1,42 @@
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
-from .models import Plant, Comment, WishList, PlantImage, Rating
+from .instrumentation import TimedSerializerMixin
+from .models import Plant, Comment, WishList, PlantImage, Rating, PlantSimilarity
+from .threads import ReplyTree, comment_preview_queryset
 
 
-class PlantImageSerializer(serializers.ModelSerializer):
+class PlantImageSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for PlantImage model to handle image data.
     """
 
+    variants = serializers.SerializerMethodField()
+
     class Meta:
         model = PlantImage
-        fields = ["id", "image", "plant", "uploaded_at"]
+        fields = ["id", "image", "plant", "uploaded_at", "width", "height", "variants"]
+
+    @extend_schema_field(
+        {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "additionalProperties": {"type": "string", "format": "uri"},
+            },
+        }
+    )
+    def get_variants(self, obj):
+        """
+        URLs of the downscaled copies, by variant and format, e.g.
+        {"thumbnail": {"webp": "https://..."}}. Empty until processed.
+        """
+        storage = obj.image.storage
+        return {
+            variant: {format: storage.url(name) for format, name in formats.items()}
+            for variant, formats in obj.variants.items()
+        }
 
     def get_image_url(self, obj):
         """
@@ -18,27 +45,67 @@ class PlantImageSerializer(serializers.ModelSerializer):
         return obj.image.url
 
 
-class PlantSummarySerializer(serializers.ModelSerializer):
+class PlantSummarySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for summarized plant information.
     """
 
     images = PlantImageSerializer(many=True, read_only=True)
-    average_rating = serializers.SerializerMethodField()
+    average_rating = serializers.FloatField(source="rating_avg", read_only=True)
 
     class Meta:
         model = Plant
-        fields = ["id", "name", "images", "description", "average_rating"]
+        fields = [
+            "id",
+            "name",
+            "images",
+            "description",
+            "average_rating",
+            "rating_count",
+        ]
 
-    def get_average_rating(self, obj):
-        return obj.average_rating()
+
+class SimilarPlantSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a plant from the similarity index, with its score.
+    """
+
+    plant = PlantSummarySerializer(source="similar", read_only=True)
+
+    class Meta:
+        model = PlantSimilarity
+        fields = ["score", "plant"]
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class RecommendationSerializer(serializers.Serializer):
+    """
+    Serializer for a recommended plant, with its score.
+    """
+
+    score = serializers.FloatField(read_only=True)
+    plant = PlantSummarySerializer(read_only=True)
+
+
+class CommentListSerializer(serializers.ListSerializer):
+    """
+    List serializer for comments that loads the replies of the whole list
+    up front, so rendering nested threads does not query per comment.
+    """
+
+    def to_representation(self, data):
+        comments = data.all() if isinstance(data, models.manager.BaseManager) else data
+        comments = list(comments)
+        self.child.reply_tree = self.context.get("reply_tree") or ReplyTree(comments)
+        return super().to_representation(comments)
+
+
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Comment model.
     """
 
+    reply_tree = None
+
     author = serializers.ReadOnlyField(source="author.username")
     plant = serializers.PrimaryKeyRelatedField(queryset=Plant.objects.all())
     parent = serializers.PrimaryKeyRelatedField(
@@ -58,18 +125,44 @@ class CommentSerializer(serializers.ModelSerializer):
             "image",
             "created_at",
         ]
+        list_serializer_class = CommentListSerializer
+
+    def validate(self, attrs):
+        parent = attrs.get("parent")
+        plant = attrs.get("plant") or getattr(self.instance, "plant", None)
+        if parent and plant and parent.plant_id != plant.pk:
+            raise serializers.ValidationError(
+                {"parent": "The parent comment belongs to another plant."}
+            )
+        return attrs
 
     def get_replies(self, obj):
         """
         Retrieve replies for the current comment.
-        Limit number of replies for performance.
+        Replies come from the ReplyTree shared by the whole thread, which
+        caps both the nesting depth and the number of replies per comment.
         """
-        return CommentSerializer(
-            obj.replies.all()[:10], many=True
-        ).data  # Ліміт на 10 відповідей
+        level = self.context.get("reply_level", 0)
+        if level >= settings.VERDESPACE_COMMENT_MAX_DEPTH:
+            return []
+        tree = self.reply_tree
+        if tree is None or obj not in tree:
+            tree = ReplyTree([obj])
+        context = {**self.context, "reply_tree": tree, "reply_level": level + 1}
+        return CommentSerializer(tree.replies(obj), many=True, context=context).data
+
+
+class CommentPreviewSerializer(CommentSerializer):
+    """
+    Compact comment representation without the nested replies.
+    """
 
+    class Meta(CommentSerializer.Meta):
+        fields = ["id", "text", "plant", "author", "parent", "image", "created_at"]
+        list_serializer_class = serializers.ListSerializer
 
-class WishListSerializer(serializers.ModelSerializer):
+
+class WishListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the WishList model.
     """
@@ -87,23 +180,27 @@ class WishListSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """
         Create a new WishList entry.
-        Ensure the plant isn't already in the wishlist.
+        The unique (user, plant) constraint rejects a plant that is already
+        in the wishlist, also when two requests add it at the same time.
         """
         plant = validated_data.pop("plant_id")
         user = self.context["request"].user
-        if WishList.objects.filter(user=user, plant=plant).exists():
+        try:
+            with transaction.atomic():
+                return WishList.objects.create(user=user, plant=plant)
+        except IntegrityError:
             raise serializers.ValidationError("This plant is already in your wishlist.")
-        return WishList.objects.create(user=user, plant=plant)
 
 
-class PlantDetailSerializer(serializers.ModelSerializer):
+class PlantDetailSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Detailed serializer for the Plant model.
     """
 
     images = PlantImageSerializer(many=True, read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
-    average_rating = serializers.SerializerMethodField()
+    comments = serializers.SerializerMethodField()
+    comment_count = serializers.SerializerMethodField()
+    average_rating = serializers.FloatField(source="rating_avg", read_only=True)
 
     class Meta:
         model = Plant
@@ -122,15 +219,98 @@ class PlantDetailSerializer(serializers.ModelSerializer):
             "category",
             "images",
             "comments",
+            "comment_count",
             "created_at",
             "average_rating",
+            "rating_count",
         ]
 
-    def get_average_rating(self, obj):
-        return obj.average_rating()
+    @extend_schema_field(CommentPreviewSerializer(many=True))
+    def get_comments(self, obj):
+        """
+        Preview of the first top-level comments; the full threads are served
+        by the paginated /plants/{id}/comments/ sub-resource.
+        """
+        preview = getattr(obj, "comment_preview", None)
+        if preview is None:
+            preview = comment_preview_queryset().filter(plant=obj)[
+                : settings.VERDESPACE_COMMENT_PREVIEW_SIZE
+            ]
+        return CommentPreviewSerializer(preview, many=True, context=self.context).data
 
+    def get_comment_count(self, obj) -> int:
+        if hasattr(obj, "comment_count"):
+            return obj.comment_count
+        return obj.comments.count()
 
-class RatingSerializer(serializers.ModelSerializer):
+
+class RatingSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Rating
         fields = ['plant', 'user', 'rating']
+
+
+class RatingBulkItemSerializer(serializers.Serializer):
+    """
+    One entry of a bulk rating request; the user is the requester.
+    """
+
+    plant = serializers.IntegerField()
+    rating = serializers.ChoiceField(choices=Rating._meta.get_field("rating").choices)
+
+
+class WishListBulkItemSerializer(serializers.Serializer):
+    """
+    One entry of a bulk wishlist request.
+    """
+
+    plant_id = serializers.IntegerField()
+
+
+class BulkItemResultSerializer(serializers.Serializer):
+    """
+    Outcome of one entry of a bulk request, in request order.
+    """
+
+    index = serializers.IntegerField()
+    plant = serializers.IntegerField(required=False)
+    id = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(
+        choices=["created", "updated", "exists", "duplicate", "invalid"]
+    )
+    errors = serializers.DictField(required=False)
+
+
+class BulkResultSerializer(serializers.Serializer):
+    results = BulkItemResultSerializer(many=True)
+
+
+class ImageUploadRequestSerializer(serializers.Serializer):
+    """
+    Content type of an image that will be uploaded straight to S3.
+    """
+
+    content_type = serializers.CharField()
+
+    def validate_content_type(self, value):
+        if value not in settings.VERDESPACE_IMAGE_UPLOAD_TYPES:
+            raise serializers.ValidationError(
+                f"Must be one of: {', '.join(settings.VERDESPACE_IMAGE_UPLOAD_TYPES)}."
+            )
+        return value
+
+
+class ImageUploadPolicySerializer(serializers.Serializer):
+    """
+    Where and how to POST the image, and the token to confirm it with.
+    """
+
+    url = serializers.URLField()
+    fields = serializers.DictField(child=serializers.CharField())
+    key = serializers.CharField()
+    upload_token = serializers.CharField()
+    expires_in = serializers.IntegerField()
+
+
+class ImageUploadConfirmSerializer(serializers.Serializer):
+    upload_token = serializers.CharField()
@@ -0,0 +1,114 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import caching, search, similarity
+from .models import Comment, Plant, PlantImage, PlantSimilarity, Rating
+
+
+@receiver(post_save, sender=Plant)
+def index_saved_plant(sender, instance, **kwargs):
+    """
+    Keep the full-text index in step with every saved plant.
+    """
+    search.index_plant(instance)
+
+
+@receiver(post_delete, sender=Plant)
+def unindex_deleted_plant(sender, instance, **kwargs):
+    """
+    Remove deleted plants from the full-text index.
+    """
+    search.remove_plant(instance.pk)
+
+
+@receiver(post_save, sender=Plant)
+def update_similarity_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Re-rank the neighbours of a plant whose features changed. Fixtures are
+    skipped; run `manage.py build_similarity` after loading them.
+    """
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & set(
+        similarity.FEATURE_FIELDS
+    ):
+        return
+    similarity.schedule_update(instance.pk)
+
+
+@receiver(pre_delete, sender=Plant)
+def collect_similarity_referrers(sender, instance, **kwargs):
+    """
+    Remember which plants list a plant about to be deleted; the cascade
+    removes their index entries for it.
+    """
+    instance._similarity_referrers = list(
+        PlantSimilarity.objects.filter(similar=instance).values_list(
+            "plant_id", flat=True
+        )
+    )
+
+
+@receiver(post_delete, sender=Plant)
+def unlist_deleted_plant(sender, instance, **kwargs):
+    similarity.schedule_update(
+        instance.pk, getattr(instance, "_similarity_referrers", ())
+    )
+
+
+@receiver(pre_save, sender=Rating)
+def remember_rated_plant(sender, instance, **kwargs):
+    """
+    Remember which plant an existing rating was for, in case it is moved to
+    another one.
+    """
+    if instance.pk is not None:
+        instance._previous_plant_id = (
+            Rating.objects.filter(pk=instance.pk)
+            .values_list("plant_id", flat=True)
+            .first()
+        )
+
+
+@receiver([post_save, post_delete], sender=Rating)
+def refresh_rating_stats(sender, instance, origin=None, **kwargs):
+    """
+    Keep the rating aggregates stored on Plant in step with every rating
+    saved or deleted, including ratings removed along with their user. The
+    ratings of a plant being deleted are left alone.
+    """
+    if isinstance(origin, Plant):
+        return
+    plant_ids = {instance.plant_id, getattr(instance, "_previous_plant_id", None)}
+    Plant.objects.filter(pk__in=plant_ids - {None}).refresh_rating_stats()
+
+
+@receiver([post_save, post_delete], sender=Plant)
+def invalidate_plant_cache(sender, instance, **kwargs):
+    caching.invalidate_plant(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=PlantImage)
+@receiver([post_save, post_delete], sender=Rating)
+def invalidate_plant_summary_cache(sender, instance, origin=None, **kwargs):
+    """
+    Images and ratings appear in both the plant list and the plant detail.
+    """
+    if isinstance(origin, Plant):
+        return
+    Plant.objects.filter(pk=instance.plant_id).touch()
+    caching.invalidate_plant(instance.plant_id)
+    previous_plant_id = getattr(instance, "_previous_plant_id", None)
+    if previous_plant_id not in (None, instance.plant_id):
+        caching.invalidate_plant(previous_plant_id)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_plant_detail_cache(sender, instance, origin=None, **kwargs):
+    """
+    Comments only appear in the plant detail.
+    """
+    if isinstance(origin, Plant):
+        return
+    Plant.objects.filter(pk=instance.plant_id).touch()
+    caching.invalidate_plant(instance.plant_id, listing=False)
@@ -0,0 +1,461 @@
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from scipy import sparse
+
+from .models import Plant, PlantFeatures, PlantSimilarity, SimilaritySpace
+
+logger = logging.getLogger(__name__)
+
+# Each attribute is one-hot encoded, booleans as two values like the rest.
+ATTRIBUTE_FIELDS = [
+    "light_needs",
+    "water_needs",
+    "care",
+    "size",
+    "category",
+    "air_purifying",
+    "allergenic",
+    "blooms",
+]
+TEXT_FIELDS = ["description", "tips"]
+FEATURE_FIELDS = ATTRIBUTE_FIELDS + TEXT_FIELDS
+
+# Words of three or more letters
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+
+# Rows of the similarity matrix computed at once
+CHUNK_SIZE = 1024
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def _attributes(record):
+    return record[1 : len(ATTRIBUTE_FIELDS) + 1]
+
+
+def _text(record):
+    return " ".join(filter(None, record[len(ATTRIBUTE_FIELDS) + 1 :]))
+
+
+class FeatureSpace:
+    """
+    Columns of the plant feature vectors: one per attribute value, then one
+    per indexed word with its IDF weight. Fitted on the whole catalog by a
+    full rebuild and stored, so a changed plant can be encoded on its own
+    until the next one.
+    """
+
+    def __init__(self, attributes, terms, idf):
+        self.attributes = [tuple(pair) for pair in attributes]
+        self.terms = list(terms)
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.attribute_columns = {
+            pair: column for column, pair in enumerate(self.attributes)
+        }
+        self.term_columns = {word: column for column, word in enumerate(self.terms)}
+
+    def __len__(self):
+        return len(self.attributes) + len(self.terms)
+
+    @classmethod
+    def fit(cls, records):
+        """
+        Every (field, value) pair found in `records`, and the
+        VERDESPACE_SIMILARITY_MAX_TERMS words found in the most of them.
+        Words found in a single record cannot make two plants similar, so
+        they are left out.
+        """
+        attributes = {}
+        for record in records:
+            for pair in enumerate(_attributes(record)):
+                attributes.setdefault(pair, len(attributes))
+        document_frequency = Counter(
+            word for record in records for word in set(tokenize(_text(record)))
+        )
+        terms = sorted(
+            (word for word, frequency in document_frequency.items() if frequency > 1),
+            key=lambda word: (-document_frequency[word], word),
+        )[: settings.VERDESPACE_SIMILARITY_MAX_TERMS]
+        idf = [
+            math.log((1 + len(records)) / (1 + document_frequency[word])) + 1
+            for word in terms
+        ]
+        return cls(list(attributes), terms, idf)
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(state.attributes, state.terms, state.idf)
+
+    def save(self, plants, state=None):
+        """
+        Store the space, fitted on `plants` plants, in the SimilaritySpace
+        row `state`, or in a new row if there is none yet.
+        """
+        if state is None:
+            state = SimilaritySpace()
+        state.attributes = [list(pair) for pair in self.attributes]
+        state.terms = self.terms
+        state.idf = self.idf.tolist()
+        state.plants = plants
+        state.changes = 0
+        state.fitted_at = timezone.now()
+        state.save()
+        return state
+
+    def encode(self, records):
+        """
+        Unit-length feature vectors of `records`, one sparse row each. The
+        dot product of two rows is their similarity:
+
+            (1 - text weight) * shared attributes / len(ATTRIBUTE_FIELDS)
+            + text weight * cosine of their TF-IDF vectors
+
+        Values and words the space does not know are left out.
+        """
+        attributes = np.zeros((len(records), len(self.attributes)), dtype=np.float32)
+        text = np.zeros((len(records), len(self.terms)), dtype=np.float32)
+        for row, record in enumerate(records):
+            for pair in enumerate(_attributes(record)):
+                column = self.attribute_columns.get(pair)
+                if column is not None:
+                    attributes[row, column] = 1
+            for word, occurrences in Counter(tokenize(_text(record))).items():
+                column = self.term_columns.get(word)
+                if column is not None:
+                    text[row, column] = 1 + math.log(occurrences)
+        attributes /= math.sqrt(len(ATTRIBUTE_FIELDS))
+        text *= self.idf
+        _normalize(text)
+        weight = settings.VERDESPACE_SIMILARITY_TEXT_WEIGHT
+        vectors = np.hstack(
+            [attributes * math.sqrt(1 - weight), text * math.sqrt(weight)]
+        )
+        # Plants without indexed words are compared on their attributes alone.
+        _normalize(vectors)
+        return sparse.csr_matrix(vectors)
+
+
+class FeatureMatrix:
+    """
+    Feature vectors of the whole catalog in a FeatureSpace, one sparse row
+    per plant in primary key order.
+    """
+
+    def __init__(self, plant_ids, vectors, space):
+        self.plant_ids = plant_ids
+        self.vectors = vectors
+        self.space = space
+        self.rows = {plant_id: row for row, plant_id in enumerate(plant_ids.tolist())}
+
+    def __len__(self):
+        return len(self.plant_ids)
+
+    @classmethod
+    def build(cls, space=None):
+        """
+        Encode every plant in `space`, fitted on the catalog if not given.
+        """
+        records = list(Plant.objects.order_by("pk").values_list("pk", *FEATURE_FIELDS))
+        plant_ids = np.array([record[0] for record in records], dtype=np.int64)
+        if space is None:
+            space = FeatureSpace.fit(records)
+        return cls(plant_ids, space.encode(records), space)
+
+    @classmethod
+    def load(cls, space):
+        """
+        The vectors stored for every plant by the last rebuild and the
+        updates since.
+        """
+        plant_ids, columns, values, indptr = [], [], [], [0]
+        stored = (
+            PlantFeatures.objects.order_by("plant_id")
+            .values_list("plant_id", "columns", "values")
+            .iterator(chunk_size=2000)
+        )
+        for plant_id, plant_columns, plant_values in stored:
+            plant_ids.append(plant_id)
+            columns.append(np.frombuffer(plant_columns, dtype=np.int32))
+            values.append(np.frombuffer(plant_values, dtype=np.float32))
+            indptr.append(indptr[-1] + len(columns[-1]))
+        vectors = sparse.csr_matrix(
+            (
+                np.concatenate(values) if values else np.zeros(0, dtype=np.float32),
+                np.concatenate(columns) if columns else np.zeros(0, dtype=np.int32),
+                np.array(indptr, dtype=np.int64),
+            ),
+            shape=(len(plant_ids), len(space)),
+        )
+        return cls(np.array(plant_ids, dtype=np.int64), vectors, space)
+
+    def entries(self, rows=None):
+        """
+        PlantFeatures rows for the plants at `rows`, all plants by default.
+        """
+        if rows is None:
+            rows = range(len(self))
+        indptr, indices, data = (
+            self.vectors.indptr,
+            self.vectors.indices,
+            self.vectors.data,
+        )
+        return [
+            PlantFeatures(
+                plant_id=int(self.plant_ids[row]),
+                columns=indices[indptr[row] : indptr[row + 1]]
+                .astype(np.int32)
+                .tobytes(),
+                values=data[indptr[row] : indptr[row + 1]].astype(np.float32).tobytes(),
+            )
+            for row in rows
+        ]
+
+    def scores(self, row):
+        """
+        Similarity of every plant to the plant at `row`, which scores -inf
+        against itself.
+        """
+        scores = (self.vectors @ self.vectors[row].T).toarray().ravel()
+        scores[row] = -np.inf
+        return scores
+
+    def neighbours(self, rows, k):
+        """
+        The `k` most similar plants of each of `rows`, as lists of
+        (plant id, score) pairs, most similar first. Plants sharing
+        nothing (score 0) are left out.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        # Most pairs of plants share some attribute, so the scores are dense;
+        # only the vectors of `rows` are densified to compute them.
+        scores = np.ascontiguousarray((self.vectors @ self.vectors[rows].T.toarray()).T)
+        scores[np.arange(len(rows)), rows] = -np.inf
+        k = min(k, len(self) - 1)
+        if k <= 0:
+            return [[] for _ in rows]
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        # Highest score first, ties broken by the lower primary key
+        order = np.lexsort((top, -top_scores), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        return [
+            [
+                (int(self.plant_ids[column]), float(score))
+                for column, score in zip(columns, row_scores)
+                if score > 0
+            ]
+            for columns, row_scores in zip(top, top_scores)
+        ]
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+
+def _entries(neighbours):
+    """
+    Index entries for a mapping of plant id to (similar plant id, score)
+    pairs, most similar first.
+    """
+    return [
+        PlantSimilarity(
+            plant_id=plant_id, similar_id=similar_id, rank=rank, score=score
+        )
+        for plant_id, similar in neighbours.items()
+        for rank, (similar_id, score) in enumerate(similar)
+    ]
+
+
+def _compute(features, rows):
+    """
+    Neighbours of the plants at `rows` of the feature matrix, keyed by
+    plant id, computed CHUNK_SIZE rows at a time.
+    """
+    k = settings.VERDESPACE_SIMILAR_PLANTS
+    for start in range(0, len(rows), CHUNK_SIZE):
+        chunk = rows[start : start + CHUNK_SIZE]
+        yield {
+            int(features.plant_ids[row]): similar
+            for row, similar in zip(chunk, features.neighbours(chunk, k))
+        }
+
+
+def _locked_state():
+    """
+    The SimilaritySpace row, locked until the current transaction ends.
+    Every index write takes this lock first, so writes from other threads
+    and processes wait their turn instead of rewriting the same plants'
+    neighbours at once.
+    """
+    return SimilaritySpace.objects.select_for_update().order_by("pk").first()
+
+
+def rebuild_index(refit=True):
+    """
+    Recompute the neighbours of every plant. Returns the number of plants.
+
+    The feature space is fitted on the catalog again and every plant
+    re-encoded and stored; with `refit` off, every plant is encoded in the
+    stored space instead.
+    """
+    with transaction.atomic():
+        state = _locked_state()
+        space = None
+        if not refit and state is not None:
+            space = FeatureSpace.from_state(state)
+        features = FeatureMatrix.build(space)
+        if space is None:
+            features.space.save(len(features), state)
+        PlantFeatures.objects.all().delete()
+        PlantFeatures.objects.bulk_create(features.entries(), batch_size=2000)
+        PlantSimilarity.objects.all().delete()
+        for neighbours in _compute(features, range(len(features))):
+            PlantSimilarity.objects.bulk_create(_entries(neighbours), batch_size=2000)
+    return len(features)
+
+
+def update_plant(plant_id, referrers=()):
+    """
+    Bring the index up to date after a plant was saved or deleted.
+
+    Only the changed plant is encoded, in the stored feature space, and
+    only the plants whose neighbours can change are re-ranked: the plant
+    itself, the plants that listed it (`referrers` for a deleted plant),
+    and the plants it now scores higher for than their last neighbour.
+
+    Word weights drift from the catalog as plants change, so once the
+    updates since the space was fitted exceed
+    VERDESPACE_SIMILARITY_REFIT_RATIO of the catalog the whole index is
+    rebuilt instead. Returns the number of plants re-ranked.
+
+    The stored vectors stay sparse and only the changed plant is scored
+    against them. The whole update holds the SimilaritySpace lock.
+    """
+    with transaction.atomic():
+        state = _locked_state()
+        if (
+            state is None
+            or state.changes + 1
+            > settings.VERDESPACE_SIMILARITY_REFIT_RATIO * state.plants
+        ):
+            return rebuild_index()
+        space = FeatureSpace.from_state(state)
+
+        record = (
+            Plant.objects.filter(pk=plant_id).values_list("pk", *FEATURE_FIELDS).first()
+        )
+        if record is not None:
+            [entry] = FeatureMatrix(
+                np.array([plant_id], dtype=np.int64), space.encode([record]), space
+            ).entries()
+            PlantFeatures.objects.update_or_create(
+                plant_id=plant_id,
+                defaults={"columns": entry.columns, "values": entry.values},
+            )
+        SimilaritySpace.objects.filter(pk=state.pk).update(changes=F("changes") + 1)
+
+        features = FeatureMatrix.load(space)
+        k = settings.VERDESPACE_SIMILAR_PLANTS
+        affected = set(referrers)
+        row = features.rows.get(plant_id)
+        if row is not None:
+            affected.add(plant_id)
+            affected.update(
+                PlantSimilarity.objects.filter(similar_id=plant_id).values_list(
+                    "plant_id", flat=True
+                )
+            )
+            # Score of the last neighbour of every plant with a full list;
+            # plants with a shorter list take any plant they share something
+            # with.
+            floors = np.zeros(len(features), dtype=np.float32)
+            last_neighbours = PlantSimilarity.objects.filter(rank=k - 1).values_list(
+                "plant_id", "score"
+            )
+            for listed_id, floor in last_neighbours.iterator(chunk_size=2000):
+                listed_row = features.rows.get(listed_id)
+                if listed_row is not None:
+                    floors[listed_row] = floor
+            affected.update(features.plant_ids[features.scores(row) > floors].tolist())
+
+        rows = sorted(features.rows[pk] for pk in affected if pk in features.rows)
+        for neighbours in _compute(features, rows):
+            PlantSimilarity.objects.filter(plant_id__in=list(neighbours)).delete()
+            PlantSimilarity.objects.bulk_create(_entries(neighbours), batch_size=2000)
+    return len(rows)
+
+
+def _update(plant_id, referrers):
+    try:
+        update_plant(plant_id, referrers)
+    except Exception:
+        logger.exception("Failed to update the similarity index for plant %s", plant_id)
+
+
+def _update_in_worker(plant_id, referrers):
+    # The worker thread holds its own database connection.
+    close_old_connections()
+    try:
+        _update(plant_id, referrers)
+    finally:
+        close_old_connections()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Return the process-wide worker that updates the index, created on
+    first use. A single thread applies the updates one at a time.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="similarity-index"
+                )
+    return _executor
+
+
+def shutdown_executor():
+    """
+    Stop the worker once the updates already queued are applied. The next
+    update starts a new one.
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def schedule_update(plant_id, referrers=()):
+    """
+    Update the index for a changed plant in the background once the current
+    transaction commits. With VERDESPACE_SIMILARITY_BACKGROUND off the index
+    is updated right away, in the calling thread.
+    """
+    referrers = list(referrers)
+    if not settings.VERDESPACE_SIMILARITY_BACKGROUND:
+        _update(plant_id, referrers)
+        return
+    transaction.on_commit(
+        lambda: get_executor().submit(_update_in_worker, plant_id, referrers)
+    )
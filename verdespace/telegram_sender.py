@@ -1,10 +1,7 @@
-from dotenv import load_dotenv
 import os
+import requests
 import telebot
-from pathlib import Path
-
-env_path = Path(".") / ".env"
-load_dotenv(dotenv_path=env_path)
+from telebot import apihelper
 
 
 class TelegramSender:
@@ -21,13 +18,24 @@ class TelegramSender:
         self.bot = telebot.TeleBot(token)
         self.chat_id = chat_id
 
-    def send_message(self, text):
-        try:
-            self.bot.send_message(
-                chat_id=self.chat_id, text=text, parse_mode="markdown"
-            )
-        except telebot.apihelper.ApiException as e:
-            print(f"Error sending message to Telegram: {e}")
-
+    def deliver(self, text):
+        """
+        Send a message and let API and network errors propagate to the caller.
+        """
+        self.bot.send_message(chat_id=self.chat_id, text=text, parse_mode="markdown")
+
+    @staticmethod
+    def is_retryable(error):
+        """
+        Network failures, rate limiting (429) and Telegram server errors (5xx)
+        are worth retrying; anything else, such as a bad token or an unknown
+        chat, fails the same way every time.
+        """
+        if isinstance(error, apihelper.ApiTelegramException):
+            status = error.error_code
+        elif isinstance(error, apihelper.ApiHTTPException):
+            status = error.result.status_code
+        else:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return status == 429 or status >= 500
 
-telegram_sender = TelegramSender()
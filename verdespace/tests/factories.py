@@ -0,0 +1,18 @@
+from verdespace.models import Plant
+
+
+def create_plant(name, description="A test description", tips="Water weekly", **fields):
+    """
+    A plant with valid choices for every required field; any field can be
+    overridden by keyword.
+    """
+    defaults = {
+        "light_needs": "Bright",
+        "water_needs": "Moderately",
+        "care": "Easy",
+        "size": "Medium",
+        "category": "Decorative",
+    }
+    return Plant.objects.create(
+        name=name, description=description, tips=tips, **{**defaults, **fields}
+    )
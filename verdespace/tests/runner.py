@@ -0,0 +1,22 @@
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+from verdespace import similarity
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Test runner that updates the similarity index in the calling thread.
+    A worker thread would write to the test database from its own
+    connection, outside the transaction of the test that scheduled it.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.foreground = override_settings(VERDESPACE_SIMILARITY_BACKGROUND=False)
+        self.foreground.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.foreground.disable()
+        similarity.shutdown_executor()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace.models import Plant, Rating, WishList
+
+User = get_user_model()
+
+
+class BulkTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.plants = [
+            Plant.objects.create(
+                name=f"Plant {index}",
+                description="Green",
+                tips="Water it",
+                light_needs="Bright",
+                water_needs="Often",
+                care="Easy",
+                size="Small",
+                category="Decorative",
+            )
+            for index in range(3)
+        ]
+
+    def statuses(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [result["status"] for result in response.data["results"]]
+
+
+class RatingBulkTest(BulkTestCase):
+    url = "/api/verdespace/ratings/bulk/"
+
+    def test_creates_updates_and_reports_per_item(self):
+        first, second, third = self.plants
+        Rating.objects.create(plant=first, user=self.user, rating=1)
+        response = self.client.post(
+            self.url,
+            [
+                {"plant": first.id, "rating": 5},
+                {"plant": second.id, "rating": 2},
+                {"plant": second.id, "rating": 4},
+                {"plant": third.id, "rating": 9},
+                {"plant": 999999, "rating": 3},
+                {"rating": 3},
+            ],
+            format="json",
+        )
+        self.assertEqual(
+            self.statuses(response),
+            ["updated", "duplicate", "created", "invalid", "invalid", "invalid"],
+        )
+        self.assertIn("rating", response.data["results"][3]["errors"])
+        self.assertIn("plant", response.data["results"][4]["errors"])
+        self.assertEqual(Rating.objects.get(plant=first).rating, 5)
+        self.assertEqual(Rating.objects.get(plant=second).rating, 4)
+        first.refresh_from_db()
+        self.assertEqual((first.rating_count, first.rating_avg), (1, 5.0))
+
+    def test_query_count_does_not_grow_with_items(self):
+        items = [{"plant": plant.id, "rating": 4} for plant in self.plants]
+        # in_bulk, existing ratings, upsert, stats, touch + savepoint
+        with self.assertNumQueries(7):
+            self.client.post(self.url, items, format="json")
+
+    def test_rejects_non_lists_and_oversized_requests(self):
+        response = self.client.post(self.url, {"plant": 1}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(VERDESPACE_BULK_MAX_ITEMS=2):
+            items = [{"plant": plant.id, "rating": 4} for plant in self.plants]
+            response = self.client.post(self.url, items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.url, [], format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class WishListBulkTest(BulkTestCase):
+    url = "/api/verdespace/wishlists/bulk/"
+
+    def test_adds_new_plants_and_reports_existing(self):
+        first, second, third = self.plants
+        existing = WishList.objects.create(user=self.user, plant=first)
+        response = self.client.post(
+            self.url,
+            [{"plant_id": first.id}, {"plant_id": second.id}, {"plant_id": "x"}],
+            format="json",
+        )
+        self.assertEqual(self.statuses(response), ["exists", "created", "invalid"])
+        self.assertEqual(response.data["results"][0]["id"], existing.id)
+        self.assertEqual(
+            response.data["results"][1]["id"],
+            WishList.objects.get(user=self.user, plant=second).id,
+        )
+        self.assertEqual(WishList.objects.filter(user=self.user).count(), 2)
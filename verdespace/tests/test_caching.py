@@ -0,0 +1,117 @@
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace import caching
+from verdespace.models import Comment, Plant, PlantImage, Rating
+
+User = get_user_model()
+
+
+class PlantResponseCacheTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.plant = Plant.objects.create(
+            name="Rubber Plant",
+            description="Glossy leaves",
+            tips="Dust the leaves",
+            light_needs="Bright",
+            water_needs="Moderately",
+            care="Easy",
+            size="Large",
+            category="Decorative",
+        )
+        self.list_url = "/api/verdespace/plants/"
+        self.detail_url = f"/api/verdespace/plants/{self.plant.id}/"
+
+    def assertCache(self, url, expected):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], expected)
+        return response
+
+    def test_repeat_requests_are_served_from_cache(self):
+        self.assertCache(self.list_url, "MISS")
+        # served from the cache without a query
+        with self.assertNumQueries(0):
+            self.assertCache(self.list_url, "HIT")
+        self.assertCache(self.detail_url, "MISS")
+        self.assertCache(self.detail_url, "HIT")
+
+    def test_query_string_is_part_of_the_key(self):
+        self.assertCache(self.list_url, "MISS")
+        self.assertCache(f"{self.list_url}?size=Small", "MISS")
+        response = self.assertCache(f"{self.list_url}?size=Small", "HIT")
+        self.assertEqual(response.data["results"], [])
+
+    def test_plant_save_invalidates_list_and_detail(self):
+        self.assertCache(self.list_url, "MISS")
+        self.assertCache(self.detail_url, "MISS")
+        self.plant.name = "Ficus"
+        self.plant.save()
+        response = self.assertCache(self.list_url, "MISS")
+        self.assertEqual(response.data["results"][0]["name"], "Ficus")
+        self.assertCache(self.detail_url, "MISS")
+
+    def test_invalidate_catalog_drops_every_response(self):
+        self.assertCache(self.list_url, "MISS")
+        self.assertCache(self.detail_url, "MISS")
+        caching.invalidate_catalog()
+        self.assertCache(self.list_url, "MISS")
+        self.assertCache(self.detail_url, "MISS")
+
+    def test_comment_invalidates_only_detail(self):
+        self.assertCache(self.list_url, "MISS")
+        self.assertCache(self.detail_url, "MISS")
+        Comment.objects.create(text="Lovely", author=self.user, plant=self.plant)
+        self.assertCache(self.list_url, "HIT")
+        response = self.assertCache(self.detail_url, "MISS")
+        self.assertEqual(response.data["comment_count"], 1)
+
+    def test_image_and_rating_invalidate_list_and_detail(self):
+        for change in (
+            lambda: PlantImage.objects.create(plant=self.plant, image="plants/a.jpg"),
+            lambda: Rating.objects.create(plant=self.plant, user=self.user, rating=5),
+        ):
+            self.client.get(self.list_url)
+            self.assertCache(self.list_url, "HIT")
+            self.client.get(self.detail_url)
+            self.assertCache(self.detail_url, "HIT")
+            change()
+            self.assertCache(self.list_url, "MISS")
+            self.assertCache(self.detail_url, "MISS")
+
+    def test_other_plant_keeps_its_detail_cache(self):
+        self.assertCache(self.detail_url, "MISS")
+        other = Plant.objects.create(
+            name="Pilea",
+            description="Coin-shaped leaves",
+            tips="Rotate weekly",
+            light_needs="Scattered",
+            water_needs="Moderately",
+            care="Easy",
+            size="Small",
+            category="Decorative",
+        )
+        other.delete()
+        self.assertCache(self.detail_url, "HIT")
+
+    def test_cache_stats(self):
+        before = caching.cache_stats()
+        self.assertCache(self.list_url, "MISS")
+        self.assertCache(self.list_url, "HIT")
+        staff = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=staff)
+        response = self.client.get(f"{self.list_url}cache-stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["hits"], before["hits"] + 1)
+        self.assertEqual(response.data["misses"], before["misses"] + 1)
+
+    def test_cache_stats_is_staff_only(self):
+        response = self.client.get(f"{self.list_url}cache-stats/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
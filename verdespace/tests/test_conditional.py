@@ -0,0 +1,132 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace.models import Comment, Plant, PlantImage
+from verdespace.tests.test_utils import S3_SETTINGS
+
+User = get_user_model()
+
+
+class ConditionalGetTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.plant = Plant.objects.create(
+            name="Bird of Paradise",
+            description="Large paddle leaves",
+            tips="Lots of light",
+            light_needs="Bright",
+            water_needs="Moderately",
+            care="Medium",
+            size="Large",
+            category="Flowering",
+        )
+        self.detail_url = f"/api/verdespace/plants/{self.plant.id}/"
+
+    def test_detail_etag_and_not_modified(self):
+        response = self.client.get(self.detail_url)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("Last-Modified", response)
+        # one primary key lookup, no serialization
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_if_modified_since(self):
+        response = self.client.get(self.detail_url)
+        response = self.client.get(
+            self.detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_child_changes_update_the_etag(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        for change in (
+            lambda: Comment.objects.create(
+                text="Beautiful", author=self.user, plant=self.plant
+            ),
+            lambda: PlantImage.objects.create(plant=self.plant, image="plants/b.jpg"),
+        ):
+            change()
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response["ETag"], etag)
+            etag = response["ETag"]
+
+    def test_plant_save_updates_version(self):
+        self.plant.save()
+        self.plant.refresh_from_db()
+        self.assertEqual(self.plant.version, 2)
+
+    def test_list_etag(self):
+        url = "/api/verdespace/plants/"
+        etag = self.client.get(url)["ETag"]
+        # answered from the list version counter, without a query
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        filtered = self.client.get(url, {"size": "Small", "category": "Flowering"})
+        self.assertNotEqual(filtered["ETag"], etag)
+        reordered = self.client.get(url, {"category": "Flowering", "size": "Small"})
+        self.assertEqual(reordered["ETag"], filtered["ETag"])
+        self.plant.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_has_no_last_modified(self):
+        # Deleting an older plant leaves the newest updated_at unchanged, so
+        # a list Last-Modified would answer If-Modified-Since with a 304.
+        newer = Plant.objects.create(
+            name="Calathea",
+            description="Patterned leaves",
+            tips="Keep humid",
+            light_needs="Shadow",
+            water_needs="Often",
+            care="Medium",
+            size="Small",
+            category="Decorative",
+        )
+        url = "/api/verdespace/plants/"
+        last_modified = self.client.get(f"/api/verdespace/plants/{newer.id}/")[
+            "Last-Modified"
+        ]
+        self.assertNotIn("Last-Modified", self.client.get(url))
+        self.plant.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    @override_settings(**S3_SETTINGS)
+    def test_images_etag(self):
+        caches["presigned-urls"].clear()
+        PlantImage.objects.create(plant=self.plant, image="plants/c.jpg")
+        url = f"{self.detail_url}images/"
+        etag = self.client.get(url)["ETag"]
+        with mock.patch("verdespace.views.generate_presigned_urls") as sign:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        sign.assert_not_called()
+
+    @override_settings(**S3_SETTINGS)
+    def test_images_etag_follows_the_urls(self):
+        caches["presigned-urls"].clear()
+        PlantImage.objects.create(plant=self.plant, image="plants/c.jpg")
+        url = f"{self.detail_url}images/"
+        etag = self.client.get(url)["ETag"]
+        with mock.patch("verdespace.views.get_cached_presigned_urls", return_value={}):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        # URLs that are no longer cached are re-signed and served in full
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_plant_is_404(self):
+        response = self.client.get("/api/verdespace/plants/999999/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,98 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+
+from verdespace import caching, db
+from verdespace.models import Plant
+
+REPLICA = {"default": {}, "replica": {}}
+
+
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = db.PrimaryReplicaRouter()
+
+    def test_reads_use_replica_only_inside_replica_reads(self):
+        with mock.patch.dict(db.connections.databases, REPLICA, clear=True):
+            self.assertIsNone(self.router.db_for_read(Plant))
+            with db.replica_reads():
+                self.assertEqual(self.router.db_for_read(Plant), "replica")
+                self.assertEqual(self.router.db_for_write(Plant), "default")
+            self.assertIsNone(self.router.db_for_read(Plant))
+
+    def test_without_replica_reads_stay_on_primary(self):
+        with db.replica_reads():
+            self.assertIsNone(self.router.db_for_read(Plant))
+
+    def test_reads_stay_on_primary_right_after_a_write(self):
+        caches["plants"].clear()
+        self.addCleanup(caches["plants"].clear)
+        with mock.patch.dict(db.connections.databases, REPLICA, clear=True):
+            caching.bump_version(caching.LIST_VERSION_KEY)
+            with db.replica_reads():
+                self.assertIsNone(self.router.db_for_read(Plant))
+            caches["plants"].delete(db.RECENT_WRITE_KEY)
+            with db.replica_reads():
+                self.assertEqual(self.router.db_for_read(Plant), "replica")
+
+    def test_replica_reads_overtaken_by_a_write_are_not_cached(self):
+        caches["plants"].clear()
+        self.addCleanup(caches["plants"].clear)
+
+        def build():
+            caching.bump_version(caching.LIST_VERSION_KEY)
+            return Response({"stale": True})
+
+        with mock.patch.dict(db.connections.databases, REPLICA, clear=True):
+            with db.replica_reads():
+                caching.cached_response("plants:test", build)
+        self.assertIsNone(caches["plants"].get("plants:test"))
+
+    def test_replica_is_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica", "verdespace"))
+        self.assertIsNone(self.router.allow_migrate("default", "verdespace"))
+
+
+class ReplicaReadMixinTest(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def observe(self, method, url, data=None):
+        seen = []
+
+        def db_for_read(router, model, **hints):
+            seen.append(db._replica_reads.get())
+
+        with mock.patch.object(db.PrimaryReplicaRouter, "db_for_read", db_for_read):
+            with mock.patch.object(db, "has_replica", return_value=True):
+                getattr(self.client, method)(url, data)
+        return seen
+
+    def test_safe_requests_read_from_replica(self):
+        seen = self.observe("get", "/api/verdespace/plants/")
+        self.assertTrue(seen)
+        self.assertTrue(all(seen))
+
+    def test_unsafe_requests_read_from_primary(self):
+        seen = self.observe(
+            "post", "/api/verdespace/comments/", {"text": "Hi", "plant": 0}
+        )
+        self.assertTrue(seen)
+        self.assertFalse(any(seen))
+
+
+class SQLitePragmaTest(TestCase):
+    def test_pragmas_are_applied(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 5000)
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace import export
+from verdespace.models import Plant
+
+User = get_user_model()
+
+
+class PlantExportTest(APITestCase):
+    url = "/api/verdespace/plants/export/"
+
+    def setUp(self):
+        self.staff = User.objects.create_user(
+            username="staff",
+            email="staff@example.com",
+            password="password123",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.staff)
+        for index, size in enumerate(["Small", "Large", "Small"]):
+            Plant.objects.create(
+                name=f"Plant {index}",
+                description="Leaves, lots of them",
+                tips='Say "hi" daily',
+                light_needs="Bright",
+                water_needs="Often",
+                care="Easy",
+                size=size,
+                category="Decorative",
+            )
+
+    def body(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in self.body(response).splitlines()]
+        self.assertEqual(
+            [row["name"] for row in rows], ["Plant 0", "Plant 1", "Plant 2"]
+        )
+        self.assertEqual(list(rows[0]), export.EXPORT_FIELDS)
+
+    def test_csv_with_filters(self):
+        response = self.client.get(self.url, {"output": "csv", "size": "Small"})
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="plants.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(self.body(response))))
+        self.assertEqual([row["name"] for row in rows], ["Plant 0", "Plant 2"])
+        self.assertEqual(rows[0]["tips"], 'Say "hi" daily')
+
+    def test_rows_are_read_in_chunks(self):
+        with self.settings(VERDESPACE_EXPORT_CHUNK_SIZE=2):
+            response = self.client.get(self.url)
+            with CaptureQueriesContext(connection) as queries:
+                self.body(response)
+        # one SELECT, nothing per row
+        self.assertEqual(len(queries), 1)
+
+    def test_unknown_output(self):
+        response = self.client.get(self.url, {"output": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_staff_only(self):
+        user = User.objects.create_user(
+            username="user", email="user@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
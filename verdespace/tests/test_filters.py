@@ -1,3 +1,6 @@
+from unittest import skipUnless
+
+from django.db import connection
 from django.test import TestCase
 from django_filters import FilterSet
 from verdespace.models import Plant
@@ -42,3 +45,17 @@ class PlantFilterTest(TestCase):
         filterset = PlantFilter({"air_purifying": "true"}, queryset=Plant.objects.all())
         self.assertEqual(filterset.qs.count(), 1)
         self.assertTrue(filterset.qs.first().air_purifying)
+
+    def test_filter_by_name_is_case_insensitive_substring(self):
+        filterset = PlantFilter({"name": "cAc"}, queryset=Plant.objects.all())
+        self.assertEqual(list(filterset.qs), [self.plant2])
+        filterset = PlantFilter({"name": "plANT"}, queryset=Plant.objects.all())
+        self.assertEqual(list(filterset.qs), [self.plant1])
+
+    @skipUnless(connection.vendor == "postgresql", "pg_trgm index")
+    def test_name_has_a_trigram_index(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Plant._meta.db_table
+            )
+        self.assertIn("verdespace_plant_name_trgm", constraints)
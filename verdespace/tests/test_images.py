@@ -0,0 +1,128 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from PIL import ExifTags, Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace import images
+from verdespace.models import Plant, PlantImage
+
+User = get_user_model()
+
+
+def make_jpeg(size=(2000, 1000), orientation=1):
+    exif = Image.Exif()
+    exif[ExifTags.Base.Make] = "Camera"
+    exif[ExifTags.Base.Orientation] = orientation
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "green").save(buffer, "JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+@override_settings(
+    VERDESPACE_IMAGE_WORKERS=0,
+    VERDESPACE_IMAGE_FORMATS=["webp"],
+    VERDESPACE_IMAGE_VARIANTS={"thumbnail": (100, 100), "medium": (400, 400)},
+)
+class ImagePipelineTest(APITestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.storage = FileSystemStorage(location=location, base_url="/media/")
+        field = PlantImage._meta.get_field("image")
+        patcher = mock.patch.object(field, "storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(
+            username="staff",
+            email="staff@example.com",
+            password="password123",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.plant = Plant.objects.create(
+            name="Calathea",
+            description="Patterned leaves",
+            tips="Keep humid",
+            light_needs="Scattered",
+            water_needs="Often",
+            care="Difficult",
+            size="Medium",
+            category="Decorative",
+        )
+
+    def upload(self, data, name="leaf.jpg"):
+        return self.client.post(
+            f"/api/verdespace/plants/{self.plant.id}/images/",
+            {"image": SimpleUploadedFile(name, data, content_type="image/jpeg")},
+            format="multipart",
+        )
+
+    def open(self, name):
+        with self.storage.open(name) as file:
+            image = Image.open(file)
+            image.load()
+        return image
+
+    def test_upload_records_dimensions_and_variants(self):
+        response = self.upload(make_jpeg())
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        plant_image = PlantImage.objects.get(pk=response.data["id"])
+        self.assertEqual((plant_image.width, plant_image.height), (2000, 1000))
+        self.assertIsNotNone(plant_image.processed_at)
+
+        thumbnail = self.open(plant_image.variants["thumbnail"]["webp"])
+        self.assertEqual(thumbnail.format, "WEBP")
+        self.assertEqual(thumbnail.size, (100, 50))
+        self.assertEqual(
+            self.open(plant_image.variants["medium"]["webp"]).size, (400, 200)
+        )
+
+    def test_metadata_is_stripped_and_orientation_applied(self):
+        response = self.upload(make_jpeg(size=(300, 200), orientation=6))
+        plant_image = PlantImage.objects.get(pk=response.data["id"])
+        original = self.open(plant_image.image.name)
+        self.assertEqual(dict(original.getexif()), {})
+        self.assertEqual(original.size, (200, 300))
+        self.assertEqual((plant_image.width, plant_image.height), (200, 300))
+        # smaller than the medium box: kept at full size
+        self.assertEqual(
+            self.open(plant_image.variants["medium"]["webp"]).size, (200, 300)
+        )
+
+    def test_serializers_expose_variant_urls(self):
+        self.upload(make_jpeg())
+        response = self.client.get(f"/api/verdespace/plants/{self.plant.id}/")
+        image = response.data["images"][0]
+        self.assertTrue(image["variants"]["thumbnail"]["webp"].startswith("/media/"))
+        self.assertEqual(image["width"], 2000)
+
+    def test_broken_upload_is_logged_not_raised(self):
+        with self.assertLogs("verdespace.images", "ERROR"):
+            response = self.upload(b"not an image")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsNone(PlantImage.objects.get().processed_at)
+
+    def test_unsupported_formats_are_skipped(self):
+        with self.settings(VERDESPACE_IMAGE_FORMATS=["avif", "webp", "gif"]):
+            formats = images.available_formats()
+        self.assertIn("WEBP", formats)
+        self.assertNotIn("GIF", formats)
+
+    @override_settings(VERDESPACE_IMAGE_WORKERS=2)
+    def test_processing_waits_for_commit(self):
+        with mock.patch.object(images, "get_executor") as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.upload(make_jpeg())
+                get_executor.assert_not_called()
+        get_executor.return_value.submit.assert_called_once_with(
+            images._process_in_worker, response.data["id"]
+        )
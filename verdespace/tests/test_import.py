@@ -0,0 +1,115 @@
+import io
+import json
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from verdespace import search
+from verdespace.management.commands.import_plants import iter_json_array
+from verdespace.models import Plant, PlantSimilarity
+
+VALID = {
+    "name": "Snake Plant",
+    "description": "Upright sword-like leaves",
+    "tips": "Let the soil dry out",
+    "light_needs": "Shadow",
+    "water_needs": "Rarely",
+    "care": "Easy",
+    "air_purifying": True,
+    "allergenic": False,
+    "size": "Medium",
+    "blooms": False,
+    "category": "Air-Purifying",
+}
+
+
+class IterJsonArrayTest(TestCase):
+    def test_items_are_read_across_chunk_boundaries(self):
+        items = [{"n": index, "text": "x" * index} for index in range(50)]
+        stream = io.StringIO(json.dumps(items, indent=2))
+        self.assertEqual(list(iter_json_array(stream, chunk_size=7)), items)
+
+    def test_scalars_split_across_chunks(self):
+        stream = io.StringIO('[12345, 6.25e2, true, "ab\\u00e9", null]')
+        self.assertEqual(
+            list(iter_json_array(stream, chunk_size=3)),
+            [12345, 625.0, True, "abé", None],
+        )
+
+    def test_invalid_item_fails_without_reading_ahead(self):
+        document = '[{"a": 1}, {"b": tru}, ' + ", ".join(['{"c": 1}'] * 10000) + "]"
+        stream = io.StringIO(document)
+        items = iter_json_array(stream, chunk_size=16)
+        self.assertEqual(next(items), {"a": 1})
+        with self.assertRaises(ValueError):
+            next(items)
+        self.assertLess(stream.tell(), 100)
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ ] "))), [])
+
+    def test_invalid_documents(self):
+        for document in ('{"a": 1}', "[{}, {", '[{"a": 1}', "[1 2]", "[1,]"):
+            with self.assertRaises(ValueError):
+                list(iter_json_array(io.StringIO(document), chunk_size=4))
+
+
+class ImportPlantsTest(TestCase):
+    def run_import(self, records, *args):
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as file:
+            json.dump(records, file)
+            file.flush()
+            out, err = io.StringIO(), io.StringIO()
+            call_command("import_plants", file.name, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_imports_fixture_and_skips_invalid_choices(self):
+        out, err = io.StringIO(), io.StringIO()
+        call_command(
+            "import_plants",
+            "plantsdata_cleaned_updated.json",
+            "--batch-size",
+            "7",
+            stdout=out,
+            stderr=err,
+        )
+        # 12 records use light_needs values outside Plant.SUNLIGHT_REQUIREMENT_CHOICES
+        self.assertEqual(Plant.objects.count(), 88)
+        self.assertIn("88 created, 0 updated, 12 skipped", out.getvalue())
+        self.assertIn("light_needs", err.getvalue())
+        self.assertIn("plants/s", out.getvalue())
+        # rebuilt after the import committed, and timed on its own
+        self.assertIn("Rebuilt the similarity index of 88 plant(s)", out.getvalue())
+        self.assertTrue(PlantSimilarity.objects.exists())
+
+    def test_upserts_by_primary_key(self):
+        plant = Plant.objects.create(**VALID)
+        self.run_import(
+            [
+                {"pk": plant.pk, **VALID, "name": "Sansevieria"},
+                {**VALID, "name": "Zebra Cactus"},
+            ]
+        )
+        plant.refresh_from_db()
+        self.assertEqual(plant.name, "Sansevieria")
+        self.assertEqual(Plant.objects.count(), 2)
+        found = search.search_queryset(Plant.objects.all(), "sansevieria")
+        self.assertEqual(list(found.values_list("pk", flat=True)), [plant.pk])
+        self.assertEqual(
+            search.search_queryset(Plant.objects.all(), "zebra").count(), 1
+        )
+
+    def test_strict_mode_aborts_the_whole_import(self):
+        with self.assertRaisesMessage(CommandError, "Record 2: size"):
+            self.run_import([VALID, {**VALID, "size": "Huge"}], "--strict")
+        self.assertFalse(Plant.objects.exists())
+
+    def test_unknown_fields_and_models_are_rejected(self):
+        out, err = self.run_import(
+            [{**VALID, "colour": "green"}, {"model": "users.user", "fields": {}}]
+        )
+        self.assertIn("unknown fields colour", err)
+        self.assertIn("unexpected model", err)
+        self.assertFalse(Plant.objects.exists())
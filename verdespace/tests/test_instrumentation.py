@@ -0,0 +1,141 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace import instrumentation
+from verdespace.models import Plant, PlantImage
+from verdespace.serializers import PlantSummarySerializer
+from verdespace.tests.test_utils import S3_SETTINGS
+
+User = get_user_model()
+
+METRICS_URL = "/api/verdespace/metrics/"
+
+
+def timing_entries(response):
+    return {
+        entry.split(";")[0]: entry for entry in response["Server-Timing"].split(", ")
+    }
+
+
+class HistogramTest(SimpleTestCase):
+    def test_render_is_cumulative(self):
+        histogram = instrumentation.Histogram(
+            "test_seconds", "Test histogram.", ("view",), (0.1, 1.0)
+        )
+        for value in (0.05, 0.5, 0.5, 3):
+            histogram.observe(value, "plants-list")
+
+        lines = histogram.render().splitlines()
+        self.assertIn('test_seconds_bucket{view="plants-list",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{view="plants-list",le="1.0"} 3', lines)
+        self.assertIn('test_seconds_bucket{view="plants-list",le="+Inf"} 4', lines)
+        self.assertIn('test_seconds_count{view="plants-list"} 4', lines)
+        self.assertIn('test_seconds_sum{view="plants-list"} 4.05', lines)
+
+
+class InstrumentationMiddlewareTest(APITestCase):
+    def setUp(self):
+        instrumentation.reset_metrics()
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.admin = User.objects.create_user(
+            username="admin",
+            email="admin@example.com",
+            password="password123",
+            is_staff=True,
+        )
+        self.plant = Plant.objects.create(
+            name="Calathea",
+            description="Patterned leaves",
+            tips="Keep humid",
+            light_needs="Medium",
+            water_needs="Often",
+            care="Hard",
+            size="Medium",
+            category="Foliage",
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_server_timing_header(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(f"/api/verdespace/plants/{self.plant.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entries = timing_entries(response)
+        self.assertIn("app", entries)
+        self.assertRegex(entries["db"], r'desc="[1-9]\d* queries"')
+        self.assertIn("serializer", entries)
+
+    def test_server_timing_is_not_public(self):
+        url = f"/api/verdespace/plants/{self.plant.id}/"
+        self.assertNotIn("Server-Timing", self.client.get(url))
+        with self.settings(VERDESPACE_SERVER_TIMING_ALLOWED_IPS=["127.0.0.1"]):
+            self.assertIn("Server-Timing", self.client.get(url))
+        with self.settings(DEBUG=True):
+            self.assertIn("Server-Timing", self.client.get(url))
+
+    def test_serializer_time_covers_lists(self):
+        with instrumentation.collect() as stats:
+            PlantSummarySerializer([self.plant] * 3, many=True).data
+        self.assertGreater(stats.serializer_time, 0)
+        self.assertEqual(stats.serializer_depth, 0)
+
+    def test_requests_are_recorded_in_histograms(self):
+        self.client.get("/api/verdespace/plants/")
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        text = response.content.decode()
+        self.assertIn("# TYPE verdespace_request_duration_seconds histogram", text)
+        self.assertIn(
+            'verdespace_request_duration_seconds_count{view="verdespace:plants-list",'
+            'method="GET",status="2xx"} 1',
+            text,
+        )
+        self.assertIn(
+            'verdespace_request_queries_count{view="verdespace:plants-list"}', text
+        )
+
+    @override_settings(VERDESPACE_METRICS_TOKEN="scrape-me")
+    def test_metrics_access(self):
+        self.assertEqual(
+            self.client.get(METRICS_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
+        response = self.client.get(METRICS_URL, HTTP_X_METRICS_TOKEN="wrong")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=None)
+        response = self.client.get(METRICS_URL, HTTP_X_METRICS_TOKEN="scrape-me")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(VERDESPACE_SLOW_REQUEST_MS=0.001)
+    def test_slow_requests_are_logged_with_their_queries(self):
+        with self.assertLogs("verdespace.middleware", level="WARNING") as logs:
+            self.client.get(f"/api/verdespace/plants/{self.plant.id}/")
+        self.assertIn("Slow request: GET /api/verdespace/plants/", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+    @override_settings(VERDESPACE_SLOW_REQUEST_MS=0)
+    def test_slow_request_log_can_be_disabled(self):
+        with self.assertNoLogs("verdespace.middleware", level="WARNING"):
+            self.client.get(f"/api/verdespace/plants/{self.plant.id}/")
+
+    @override_settings(**S3_SETTINGS)
+    def test_s3_calls_are_timed(self):
+        caches["presigned-urls"].clear()
+        self.client.force_authenticate(user=self.admin)
+        PlantImage.objects.create(plant=self.plant, image="plants/a.jpg")
+        PlantImage.objects.create(plant=self.plant, image="plants/b.jpg")
+
+        response = self.client.get(f"/api/verdespace/plants/{self.plant.id}/images/")
+        self.assertIn("s3;dur=", response["Server-Timing"])
+        self.assertIn('desc="2 calls"', timing_entries(response)["s3"])
+
+        # Cached signatures make no further calls.
+        response = self.client.get(f"/api/verdespace/plants/{self.plant.id}/images/")
+        self.assertNotIn("s3", timing_entries(response))
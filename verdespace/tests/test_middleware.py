@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from verdespace.middleware import RemoveAuthorizationHeaderMiddleware
+
+
+def echo_authorization(request):
+    return HttpResponse(request.META.get("HTTP_AUTHORIZATION", ""))
+
+
+class RemoveAuthorizationHeaderMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = RemoveAuthorizationHeaderMiddleware(echo_authorization)
+
+    def request(self, host):
+        return self.factory.get(
+            "/media/plant.jpg", HTTP_HOST=host, HTTP_AUTHORIZATION="Bearer token"
+        )
+
+    def test_removes_authorization_for_s3_hosts(self):
+        for host in (
+            "s3.amazonaws.com",
+            "verdespace.s3.amazonaws.com",
+            "Verdespace.S3.Amazonaws.com:443",
+        ):
+            with self.subTest(host=host):
+                response = self.middleware(self.request(host))
+                self.assertEqual(response.content, b"")
+
+    def test_keeps_authorization_for_other_hosts(self):
+        for host in ("testserver", "evils3.amazonaws.com", "s3.amazonaws.com.evil"):
+            with self.subTest(host=host):
+                response = self.middleware(self.request(host))
+                self.assertEqual(response.content, b"Bearer token")
+
+    def test_api_requests_skip_uri_building(self):
+        with mock.patch.object(
+            HttpRequest, "build_absolute_uri", side_effect=AssertionError
+        ), mock.patch.object(HttpRequest, "get_host", side_effect=AssertionError):
+            response = self.middleware(self.request("testserver"))
+        self.assertEqual(response.content, b"Bearer token")
+
+    def test_host_lookups_are_cached(self):
+        self.middleware(self.request("testserver"))
+        with mock.patch.object(
+            self.middleware, "resolve_host", side_effect=AssertionError
+        ):
+            self.middleware(self.request("testserver"))
+
+    def test_cache_size_is_bounded(self):
+        self.middleware.max_cached_hosts = 2
+        for index in range(5):
+            self.middleware(self.request(f"host{index}.example.com"))
+        self.assertEqual(len(self.middleware.routes), 2)
+
+    @override_settings(USE_X_FORWARDED_HOST=True)
+    def test_forwarded_host(self):
+        middleware = RemoveAuthorizationHeaderMiddleware(echo_authorization)
+        request = self.request("testserver")
+        request.META["HTTP_X_FORWARDED_HOST"] = "verdespace.s3.amazonaws.com"
+        self.assertEqual(middleware(request).content, b"")
+
+    @override_settings(VERDESPACE_STRIP_AUTHORIZATION_HOSTS=[])
+    def test_unused_without_rules(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            RemoveAuthorizationHeaderMiddleware(echo_authorization)
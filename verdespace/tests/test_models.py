@@ -1,6 +1,10 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from django.contrib.auth import get_user_model
-from verdespace.models import Plant, Comment, WishList
+from verdespace.models import Plant, Comment, WishList, Rating
 
 User = get_user_model()
 
@@ -83,3 +87,86 @@ class WishListModelTest(TestCase):
     def test_wishlist_creation(self):
         self.assertEqual(self.wishlist.user.username, "testuser")
         self.assertEqual(self.wishlist.plant.name, "Cactus")
+
+    def test_plant_is_unique_per_user(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            WishList.objects.create(user=self.user, plant=self.plant)
+
+
+class PlantRatingStatsTest(TestCase):
+    def setUp(self):
+        self.plant = Plant.objects.create(
+            name="Monstera",
+            description="A test description",
+            tips="Wipe the leaves",
+            light_needs="Scattered",
+            water_needs="Moderately",
+            care="Easy",
+            size="Large",
+            category="Decorative",
+        )
+        for index, value in enumerate([5, 4, 4]):
+            user = User.objects.create_user(
+                username=f"rater{index}",
+                email=f"rater{index}@example.com",
+                password="password",
+            )
+            Rating.objects.create(plant=self.plant, user=user, rating=value)
+
+    def test_refresh_rating_stats(self):
+        Plant.objects.filter(pk=self.plant.pk).refresh_rating_stats()
+        self.plant.refresh_from_db()
+        self.assertEqual(self.plant.rating_count, 3)
+        self.assertEqual(self.plant.rating_sum, 13)
+        self.assertEqual(self.plant.average_rating(), 4.33)
+
+    def test_rebuild_rating_stats_command(self):
+        Plant.objects.update(rating_count=99, rating_sum=0, rating_avg=None)
+        call_command("rebuild_rating_stats", stdout=StringIO())
+        self.plant.refresh_from_db()
+        self.assertEqual(self.plant.rating_count, 3)
+        self.assertEqual(self.plant.rating_avg, 4.33)
+
+    def test_ratings_keep_stats_in_sync(self):
+        self.plant.refresh_from_db()
+        self.assertEqual(self.plant.rating_count, 3)
+        self.assertEqual(self.plant.rating_avg, 4.33)
+
+        rating = Rating.objects.get(rating=5)
+        rating.rating = 1
+        rating.save()
+        self.plant.refresh_from_db()
+        self.assertEqual(self.plant.rating_sum, 9)
+
+        # Deleting a user removes their ratings through the cascade.
+        User.objects.get(username="rater1").delete()
+        self.plant.refresh_from_db()
+        self.assertEqual(self.plant.rating_count, 2)
+        self.assertEqual(self.plant.rating_avg, 2.5)
+
+    def test_moved_rating_updates_both_plants(self):
+        other = Plant.objects.create(
+            name="Pothos",
+            description="A test description",
+            tips="Water weekly",
+            light_needs="Scattered",
+            water_needs="Moderately",
+            care="Easy",
+            size="Small",
+            category="Decorative",
+        )
+        rating = Rating.objects.get(rating=5)
+        rating.plant = other
+        rating.save()
+        self.plant.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.plant.rating_count, self.plant.rating_avg), (2, 4.0))
+        self.assertEqual((other.rating_count, other.rating_avg), (1, 5.0))
+
+    def test_refresh_without_ratings_resets_stats(self):
+        Rating.objects.all().delete()
+        Plant.objects.refresh_rating_stats()
+        self.plant.refresh_from_db()
+        self.assertEqual(self.plant.rating_count, 0)
+        self.assertEqual(self.plant.rating_sum, 0)
+        self.assertIsNone(self.plant.rating_avg)
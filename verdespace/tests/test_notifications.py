@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, override_settings
+from telebot import apihelper
+
+from verdespace import notifications
+from verdespace.notifications import NotificationDispatcher
+from verdespace.telegram_sender import TelegramSender
+
+
+class RecordingSender:
+    def __init__(self, failures=0, error=ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.messages = []
+        self.times = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, text):
+        self.release.wait()
+        self.times.append(time.monotonic())
+        if self.failures:
+            self.failures -= 1
+            raise self.error("Telegram is unreachable")
+        self.messages.append(text)
+
+
+class NotificationDispatcherTest(SimpleTestCase):
+    def dispatcher(self, sender, **options):
+        defaults = {"batch_window": 0.05, "min_interval": 0, "backoff": 0.01}
+        defaults.update(options)
+        return NotificationDispatcher(sender, **defaults)
+
+    def test_burst_is_coalesced_into_one_digest(self):
+        sender = RecordingSender()
+        dispatcher = self.dispatcher(sender, batch_window=0.2)
+        for index in range(5):
+            self.assertTrue(dispatcher.submit(f"Plant {index}"))
+        self.assertTrue(dispatcher.flush(timeout=5))
+        self.assertEqual(len(sender.messages), 1)
+        self.assertTrue(sender.messages[0].startswith("5 updates"))
+        self.assertIn("Plant 4", sender.messages[0])
+
+    def test_failed_send_is_retried_with_backoff(self):
+        sender = RecordingSender(failures=2)
+        dispatcher = self.dispatcher(sender)
+        with self.assertLogs("verdespace.notifications", "WARNING"):
+            dispatcher.submit("New plant")
+            self.assertTrue(dispatcher.flush(timeout=5))
+        self.assertEqual(sender.messages, ["New plant"])
+        self.assertEqual(len(sender.times), 3)
+
+    def test_permanent_failure_is_not_retried(self):
+        sender = RecordingSender(failures=1, error=ValueError)
+        dispatcher = self.dispatcher(sender)
+        with self.assertLogs("verdespace.notifications", "ERROR"):
+            dispatcher.submit("New plant")
+            self.assertTrue(dispatcher.flush(timeout=5))
+        self.assertEqual(len(sender.times), 1)
+
+    def test_exit_hook_is_registered_once(self):
+        sender = RecordingSender()
+        dispatcher = self.dispatcher(sender)
+        with mock.patch("atexit.register") as register:
+            dispatcher.start()
+            dispatcher._worker = None
+            dispatcher.start()
+        register.assert_called_once_with(dispatcher.flush, timeout=5)
+
+    def test_message_is_dropped_after_max_retries(self):
+        sender = RecordingSender(failures=10)
+        dispatcher = self.dispatcher(sender, max_retries=1)
+        with self.assertLogs("verdespace.notifications", "WARNING"):
+            dispatcher.submit("New plant")
+            self.assertTrue(dispatcher.flush(timeout=5))
+        self.assertEqual(sender.messages, [])
+
+    def test_queue_is_bounded(self):
+        sender = RecordingSender()
+        sender.release.clear()
+        dispatcher = self.dispatcher(sender, max_queue_size=2, max_batch_size=1)
+        dispatcher.submit("first")
+        time.sleep(0.1)  # the worker is now blocked sending "first"
+        self.assertTrue(dispatcher.submit("second"))
+        self.assertTrue(dispatcher.submit("third"))
+        with self.assertLogs("verdespace.notifications", "WARNING"):
+            self.assertFalse(dispatcher.submit("fourth"))
+        sender.release.set()
+        self.assertTrue(dispatcher.flush(timeout=5))
+        self.assertEqual(sender.messages, ["first", "second", "third"])
+
+    def test_sends_are_rate_limited(self):
+        sender = RecordingSender()
+        dispatcher = self.dispatcher(sender, max_batch_size=1, min_interval=0.1)
+        for index in range(3):
+            dispatcher.submit(f"Plant {index}")
+        self.assertTrue(dispatcher.flush(timeout=5))
+        gaps = [
+            later - earlier for earlier, later in zip(sender.times, sender.times[1:])
+        ]
+        self.assertTrue(all(gap >= 0.09 for gap in gaps))
+
+    def test_long_digest_is_split(self):
+        dispatcher = self.dispatcher(RecordingSender(), max_message_length=40)
+        texts = dispatcher.compose(["a" * 20, "b" * 20])
+        self.assertEqual(texts, ["2 updates\n\n" + "a" * 20, "b" * 20])
+
+
+class TelegramRetryTest(SimpleTestCase):
+    def api_error(self, code):
+        return apihelper.ApiTelegramException(
+            "sendMessage", None, {"error_code": code, "description": "Error"}
+        )
+
+    def test_transient_errors_are_retried(self):
+        for error in (
+            requests.ConnectionError(),
+            requests.Timeout(),
+            self.api_error(429),
+            self.api_error(502),
+        ):
+            self.assertTrue(TelegramSender.is_retryable(error), error)
+
+    def test_client_errors_are_not_retried(self):
+        for error in (self.api_error(400), self.api_error(401), ValueError()):
+            self.assertFalse(TelegramSender.is_retryable(error), error)
+
+
+class NotifierRegistryTest(SimpleTestCase):
+    def setUp(self):
+        notifications.outbox.clear()
+
+    @override_settings(
+        VERDESPACE_NOTIFICATION_BACKEND="verdespace.notifications.LocMemBackend"
+    )
+    def test_notifier_is_built_once_on_first_use(self):
+        notifier = notifications.get_notifier()
+        self.assertIs(notifications.get_notifier(), notifier)
+        notifications.notify("Hello")
+        self.assertEqual(notifications.outbox, ["Hello"])
+
+    def test_backend_follows_settings(self):
+        with self.settings(
+            VERDESPACE_NOTIFICATION_BACKEND="verdespace.notifications.LoggingBackend"
+        ):
+            with self.assertLogs("verdespace.notifications", "INFO"):
+                notifications.notify("Hello")
+        self.assertEqual(notifications.outbox, [])
+
+    @override_settings(
+        VERDESPACE_NOTIFICATION_BACKEND="verdespace.notifications.TelegramBackend"
+    )
+    def test_unconfigured_telegram_falls_back_to_logging(self):
+        environ = {
+            key: value
+            for key, value in os.environ.items()
+            if not key.startswith("TELEGRAM_")
+        }
+        with mock.patch.dict(os.environ, environ, clear=True):
+            with self.assertLogs("verdespace.notifications") as logs:
+                notifications.notify("Hello")
+        self.assertIn("Could not configure", logs.output[0])
+        self.assertIn("Notification: Hello", logs.output[-1])
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace.models import Plant
+
+User = get_user_model()
+
+
+@override_settings(VERDESPACE_PAGE_SIZE=2, VERDESPACE_MAX_PAGE_SIZE=3)
+class KeysetPaginationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+        created_at = timezone.now() - timedelta(hours=1)
+        self.plants = []
+        for index in range(5):
+            plant = Plant.objects.create(
+                name=f"Plant {index}",
+                description="A test description",
+                tips="Water weekly",
+                light_needs="Bright",
+                water_needs="Often",
+                care="Easy",
+                size="Small",
+                category="Decorative",
+            )
+            # Plants 1 and 2 share a timestamp to exercise the id tie-breaker.
+            offset = min(index, 1) if index < 3 else index
+            Plant.objects.filter(pk=plant.pk).update(
+                created_at=created_at + timedelta(seconds=offset)
+            )
+            self.plants.append(plant)
+
+    def collect_names(self, url):
+        names = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            names.extend(plant["name"] for plant in response.data["results"])
+            url = response.data["next"]
+        return names
+
+    def test_pages_follow_created_at_then_id(self):
+        names = self.collect_names("/api/verdespace/plants/")
+        self.assertEqual(names, [f"Plant {index}" for index in range(5)])
+
+    def test_page_size_is_capped(self):
+        response = self.client.get("/api/verdespace/plants/?page_size=50")
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_previous_link_returns_preceding_page(self):
+        first = self.client.get("/api/verdespace/plants/")
+        second = self.client.get(first.data["next"])
+        previous = self.client.get(second.data["previous"])
+        self.assertEqual(previous.data["results"], first.data["results"])
+        self.assertIsNone(first.data["previous"])
+
+    def test_insert_between_pages_is_not_duplicated(self):
+        first = self.client.get("/api/verdespace/plants/")
+        Plant.objects.filter(pk=self.plants[0].pk).update(
+            created_at=timezone.now() - timedelta(days=1)
+        )
+        Plant.objects.create(
+            name="Late Plant",
+            description="Added while paging",
+            tips="None",
+            light_needs="Shadow",
+            water_needs="Rarely",
+            care="Easy",
+            size="Large",
+            category="Rare",
+        )
+        names = [plant["name"] for plant in first.data["results"]]
+        names += self.collect_names(first.data["next"])
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(names[-1], "Late Plant")
+        self.assertNotIn("Plant 0", names[2:])
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/verdespace/plants/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
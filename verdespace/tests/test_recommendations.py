@@ -0,0 +1,185 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace import recommendations
+from verdespace.models import Rating, Recommendation, WishList
+from verdespace.tests.factories import create_plant
+
+User = get_user_model()
+
+URL = "/api/verdespace/recommendations/"
+
+
+class RecommendationDataMixin:
+    def setUp(self):
+        caches["recommendations"].clear()
+        self.plants = {
+            name: create_plant(name, f"{name} description")
+            for name in ("Aloe", "Basil", "Cactus", "Dracaena", "Echeveria")
+        }
+        self.users = {
+            name: User.objects.create_user(username=name, email=f"{name}@example.com")
+            for name in ("ann", "bob", "cat", "dan", "new")
+        }
+        self.rate("ann", Aloe=5, Basil=5)
+        self.rate("bob", Aloe=5, Basil=4, Cactus=5)
+        self.rate("cat", Aloe=4, Dracaena=1)
+        self.rate("dan", Echeveria=2)
+        WishList.objects.create(user=self.users["dan"], plant=self.plants["Cactus"])
+
+    def rate(self, user, **ratings):
+        for name, rating in ratings.items():
+            Rating.objects.create(
+                user=self.users[user], plant=self.plants[name], rating=rating
+            )
+
+    def recommended(self, user):
+        return list(
+            Recommendation.objects.filter(user=self.users[user])
+            .order_by("rank")
+            .values_list("plant__name", flat=True)
+        )
+
+
+class TrainingTest(RecommendationDataMixin, TestCase):
+    def test_rating_weight(self):
+        self.assertEqual(recommendations.rating_weight(5), 1.0)
+        self.assertEqual(recommendations.rating_weight(2), 0.0)
+        self.assertEqual(recommendations.rating_weight(1), 0.0)
+
+    def test_co_occurring_plants_are_recommended(self):
+        stats = recommendations.train()
+        self.assertEqual(stats["users"], 4)
+        self.assertEqual(stats["interactions"], 9)
+
+        # Basil and Cactus were liked together with Aloe.
+        self.assertEqual(self.recommended("cat"), ["Basil", "Cactus"])
+        self.assertEqual(self.recommended("ann"), ["Cactus"])
+        # Aloe and Basil were liked by the users who liked Cactus.
+        self.assertEqual(self.recommended("dan"), ["Aloe", "Basil"])
+        # Nothing co-occurs with what bob has not rated yet.
+        self.assertEqual(self.recommended("bob"), [])
+
+    def test_popular_plants_for_everyone(self):
+        recommendations.train()
+        popular = Recommendation.objects.filter(user=None).order_by("rank")
+        self.assertEqual(
+            list(popular.values_list("plant__name", flat=True)),
+            ["Aloe", "Cactus", "Basil"],
+        )
+
+    def test_popular_ranks_are_unique(self):
+        recommendations.train()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Recommendation.objects.create(
+                user=None, plant=self.plants["Basil"], rank=0, score=1.0
+            )
+
+    def test_for_user_is_cached_until_retrained(self):
+        recommendations.train()
+        cat = self.users["cat"].pk
+        first = recommendations.for_user(cat)
+        with self.assertNumQueries(0):
+            self.assertEqual(recommendations.for_user(cat), first)
+
+        self.rate("cat", Basil=5)
+        recommendations.train()
+        self.assertEqual(
+            [plant_id for plant_id, _ in recommendations.for_user(cat)],
+            [self.plants[name].pk for name in ("Cactus", "Aloe", "Basil")],
+        )
+
+    def test_new_users_get_popular_plants(self):
+        recommendations.train()
+        recommended = recommendations.for_user(self.users["new"].pk)
+        self.assertEqual(recommended[0][0], self.plants["Aloe"].pk)
+
+    def test_train_recommendations_command(self):
+        out = StringIO()
+        call_command("train_recommendations", stdout=out)
+        self.assertIn("Trained on 9 interaction(s) of 4 user(s)", out.getvalue())
+
+
+class RecommendationEndpointTest(RecommendationDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        recommendations.train()
+        self.client.force_authenticate(user=self.users["cat"])
+
+    def test_recommendations(self):
+        response = self.client.get(URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(
+            [result["plant"]["name"] for result in results], ["Basil", "Cactus"]
+        )
+        self.assertGreater(results[0]["score"], 0)
+        self.assertIn("images", results[0]["plant"])
+
+        # cached: plants and their images only
+        with self.assertNumQueries(2):
+            self.client.get(URL)
+
+    def test_limit(self):
+        response = self.client.get(URL, {"limit": 1})
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_plants_rated_since_training_are_left_out(self):
+        self.client.get(URL)
+        WishList.objects.create(user=self.users["cat"], plant=self.plants["Basil"])
+        response = self.client.get(URL)
+        self.assertEqual(
+            [result["plant"]["name"] for result in response.data["results"]],
+            ["Cactus"],
+        )
+
+    def test_new_user(self):
+        self.client.force_authenticate(user=self.users["new"])
+        response = self.client.get(URL)
+        self.assertEqual(
+            [result["plant"]["name"] for result in response.data["results"]],
+            ["Aloe", "Cactus", "Basil"],
+        )
+
+    def test_short_lists_are_filled_with_popular_plants(self):
+        self.rate("new", Echeveria=4)
+        recommendations.train()
+        WishList.objects.create(user=self.users["cat"], plant=self.plants["Basil"])
+        response = self.client.get(URL, {"limit": 2})
+        self.assertEqual(
+            [result["plant"]["name"] for result in response.data["results"]],
+            ["Cactus", "Echeveria"],
+        )
+
+    def test_popular_plants_when_everything_is_left_out(self):
+        self.rate("new", Echeveria=4)
+        recommendations.train()
+        WishList.objects.create(user=self.users["cat"], plant=self.plants["Basil"])
+        WishList.objects.create(user=self.users["cat"], plant=self.plants["Cactus"])
+        response = self.client.get(URL)
+        self.assertEqual(
+            [result["plant"]["name"] for result in response.data["results"]],
+            ["Echeveria"],
+        )
+
+    def test_poorly_rated_plants_are_not_recommended(self):
+        self.rate("new", Aloe=1, Cactus=2)
+        recommendations.train()
+        self.client.force_authenticate(user=self.users["new"])
+        response = self.client.get(URL)
+        self.assertEqual(
+            [result["plant"]["name"] for result in response.data["results"]],
+            ["Basil"],
+        )
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
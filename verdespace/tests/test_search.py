@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace import search
+from verdespace.models import Plant
+from verdespace.tests.factories import create_plant
+
+User = get_user_model()
+
+
+def search_ids(query):
+    return list(
+        search.search_queryset(Plant.objects.all(), query).values_list("pk", flat=True)
+    )
+
+
+class SearchIndexTest(TestCase):
+    def setUp(self):
+        self.monstera = create_plant(
+            "Monstera", "Large split leaves", tips="Wipe leaves monthly"
+        )
+        self.fern = create_plant("Boston Fern", "Feathery fronds like monstera")
+        self.cactus = create_plant("Cactus", "Thorny desert plant", tips="Rarely water")
+
+    def test_match_expression_quotes_words(self):
+        self.assertEqual(
+            search.build_match_expression('mon "OR* le-af'),
+            '"mon"* "or"* "le"* "af"*',
+        )
+
+    def test_tsquery_quotes_words(self):
+        self.assertEqual(
+            search.build_tsquery("mon 'OR le-af"), "'mon':* & 'or':* & 'le':* & 'af':*"
+        )
+
+    def test_prefix_match_ranks_name_first(self):
+        self.assertEqual(search_ids("monst"), [self.monstera.pk, self.fern.pk])
+
+    def test_all_words_must_match(self):
+        self.assertEqual(search_ids("desert rare"), [self.cactus.pk])
+        self.assertEqual(search_ids("desert fronds"), [])
+
+    def test_index_follows_save_and_delete(self):
+        self.cactus.description = "Spiny succulent"
+        self.cactus.save()
+        self.assertEqual(search_ids("desert"), [])
+        self.assertEqual(search_ids("spiny"), [self.cactus.pk])
+        self.fern.delete()
+        self.assertEqual(search_ids("fronds"), [])
+
+    def test_rebuild_index(self):
+        Plant.objects.filter(pk=self.cactus.pk).update(name="Echinopsis")
+        search.rebuild_index([self.cactus.pk])
+        self.assertEqual(search_ids("echin"), [self.cactus.pk])
+        search.rebuild_index()
+        self.assertEqual(search_ids("leav"), [self.monstera.pk])
+
+
+class PlantSearchViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+        create_plant("Aloe Vera", "Medicinal succulent", category="Medicinal")
+        create_plant("Jade", "Succulent with thick leaves", category="Succulent")
+
+    def test_search(self):
+        response = self.client.get("/api/verdespace/plants/search/", {"q": "succ"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_search_applies_filters(self):
+        response = self.client.get(
+            "/api/verdespace/plants/search/", {"q": "succ", "category": "Succulent"}
+        )
+        self.assertEqual(
+            [plant["name"] for plant in response.data["results"]], ["Jade"]
+        )
+
+    def test_filters_apply_before_the_limit(self):
+        # The best matches all fail the filter; the weaker one still shows up.
+        for index in range(3):
+            create_plant(f"Leaf {index}", "Leaf leaf leaf", size="Large")
+        create_plant("Calathea", "Patterned foliage", tips="Dust each leaf")
+        response = self.client.get(
+            "/api/verdespace/plants/search/",
+            {"q": "leaf", "size": "Medium", "limit": 2},
+        )
+        self.assertEqual(
+            [plant["name"] for plant in response.data["results"]], ["Calathea"]
+        )
+
+    def test_search_requires_query(self):
+        response = self.client.get("/api/verdespace/plants/search/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
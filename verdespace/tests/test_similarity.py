@@ -0,0 +1,189 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace import similarity
+from verdespace.models import PlantFeatures, PlantSimilarity, SimilaritySpace
+from verdespace.tests.factories import create_plant
+
+User = get_user_model()
+
+
+LEAVES = "Glossy green leaves on upright stems"
+WATERING = "Water when the topsoil is dry"
+
+
+def index_of(plant):
+    return list(
+        PlantSimilarity.objects.filter(plant=plant)
+        .order_by("rank")
+        .values_list("similar__name", flat=True)
+    )
+
+
+@override_settings(VERDESPACE_SIMILARITY_BACKGROUND=False, VERDESPACE_SIMILAR_PLANTS=2)
+class SimilarityIndexTest(TestCase):
+    def setUp(self):
+        self.pothos = create_plant("Pothos", LEAVES, WATERING)
+        self.philodendron = create_plant(
+            "Philodendron", "Glossy green heart leaves on trailing stems", WATERING
+        )
+        self.cactus = create_plant(
+            "Cactus",
+            "Spiny desert succulent",
+            "Let the soil dry out completely",
+            light_needs="Shadow",
+            water_needs="Rarely",
+            care="Difficult",
+            size="Small",
+            category="Succulent",
+            blooms=True,
+        )
+
+    def test_identical_features_score_one(self):
+        twin = create_plant("Pothos twin", LEAVES, WATERING)
+        features = similarity.FeatureMatrix.build()
+        row = features.rows[self.pothos.pk]
+        [neighbours] = features.neighbours([row], 3)
+        self.assertEqual(neighbours[0][0], twin.pk)
+        self.assertAlmostEqual(neighbours[0][1], 1.0, places=5)
+
+    def test_saved_plants_are_ranked(self):
+        self.assertEqual(index_of(self.pothos), ["Philodendron", "Cactus"])
+        self.assertCountEqual(index_of(self.cactus), ["Pothos", "Philodendron"])
+
+    def test_changed_plant_moves_up_in_other_lists(self):
+        create_plant("Monstera", "Spiny leaves", WATERING, light_needs="Shadow")
+        self.assertEqual(index_of(self.pothos), ["Philodendron", "Monstera"])
+
+        self.cactus.description = LEAVES
+        self.cactus.tips = WATERING
+        self.cactus.light_needs = "Bright"
+        self.cactus.water_needs = "Moderately"
+        self.cactus.care = "Easy"
+        self.cactus.size = "Medium"
+        self.cactus.category = "Decorative"
+        self.cactus.blooms = False
+        self.cactus.save()
+        self.assertEqual(index_of(self.pothos), ["Cactus", "Philodendron"])
+        self.assertEqual(index_of(self.cactus)[0], "Pothos")
+
+    def test_deleted_plant_is_replaced(self):
+        create_plant("Snake plant", "Stiff upright leaves", WATERING, size="Large")
+        self.philodendron.delete()
+        self.assertEqual(index_of(self.pothos), ["Snake plant", "Cactus"])
+
+    @override_settings(VERDESPACE_SIMILARITY_REFIT_RATIO=100)
+    def test_incremental_updates_match_a_full_rebuild(self):
+        for index in range(4):
+            create_plant(f"Fern {index}", LEAVES, f"Mist it {index}", size="Small")
+        self.philodendron.category = "Succulent"
+        self.philodendron.save()
+        self.cactus.delete()
+        incremental = sorted(
+            PlantSimilarity.objects.values_list("plant", "rank", "similar")
+        )
+
+        similarity.rebuild_index(refit=False)
+        rebuilt = sorted(
+            PlantSimilarity.objects.values_list("plant", "rank", "similar")
+        )
+        self.assertEqual(incremental, rebuilt)
+
+    @override_settings(VERDESPACE_SIMILARITY_REFIT_RATIO=100)
+    def test_updates_encode_the_changed_plant_only(self):
+        with mock.patch.object(similarity.FeatureMatrix, "build") as build:
+            monstera = create_plant("Monstera", LEAVES, WATERING)
+        build.assert_not_called()
+        self.assertEqual(index_of(monstera), ["Pothos", "Philodendron"])
+        self.assertEqual(PlantFeatures.objects.count(), 4)
+        self.assertEqual(SimilaritySpace.objects.get().changes, 1)
+
+    def test_word_weights_are_refitted_after_enough_changes(self):
+        with override_settings(VERDESPACE_SIMILARITY_REFIT_RATIO=100):
+            create_plant("Variegated pothos", "Variegated leaves", WATERING)
+            create_plant("Variegated monstera", "Variegated leaves", WATERING)
+        space = SimilaritySpace.objects.get()
+        self.assertNotIn("variegated", space.terms)
+        self.assertEqual(space.changes, 2)
+
+        with override_settings(VERDESPACE_SIMILARITY_REFIT_RATIO=0.5):
+            self.cactus.tips = "Mist it"
+            self.cactus.save()
+        refitted = SimilaritySpace.objects.get()
+        self.assertIn("variegated", refitted.terms)
+        self.assertEqual((refitted.plants, refitted.changes), (5, 0))
+        # refitted in place, so there is always a row to lock
+        self.assertEqual(refitted.pk, space.pk)
+
+    @override_settings(VERDESPACE_SIMILARITY_REFIT_RATIO=100)
+    def test_index_writes_take_the_space_lock(self):
+        with mock.patch.object(
+            similarity, "_locked_state", wraps=similarity._locked_state
+        ) as locked:
+            self.cactus.save()
+            similarity.rebuild_index()
+        self.assertEqual(locked.call_count, 2)
+
+    def test_unrelated_updates_skip_the_index(self):
+        with mock.patch.object(similarity, "schedule_update") as schedule_update:
+            self.pothos.save(update_fields=["rating_avg", "rating_count"])
+            self.pothos.save(update_fields=["description"])
+        schedule_update.assert_called_once_with(self.pothos.pk)
+
+    @override_settings(VERDESPACE_SIMILARITY_BACKGROUND=True)
+    def test_background_updates_wait_for_commit(self):
+        with mock.patch.object(similarity, "get_executor") as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                monstera = create_plant("Monstera", LEAVES, WATERING)
+                get_executor.assert_not_called()
+        get_executor.return_value.submit.assert_called_once_with(
+            similarity._update_in_worker, monstera.pk, []
+        )
+
+    def test_build_similarity_command(self):
+        PlantSimilarity.objects.all().delete()
+        out = StringIO()
+        call_command("build_similarity", stdout=out)
+        self.assertIn("Indexed 3 plant(s)", out.getvalue())
+        self.assertEqual(PlantSimilarity.objects.count(), 6)
+
+
+@override_settings(VERDESPACE_SIMILARITY_BACKGROUND=False, VERDESPACE_SIMILAR_PLANTS=3)
+class SimilarPlantsEndpointTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.pothos = create_plant("Pothos", LEAVES, WATERING)
+        for index in range(4):
+            create_plant(f"Fern {index}", LEAVES, WATERING, size="Small")
+        self.url = f"/api/verdespace/plants/{self.pothos.id}/similar/"
+
+    def test_similar_plants(self):
+        # plant id, similarity entries, images of the similar plants
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]["plant"]["name"], "Fern 0")
+        self.assertIn("images", results[0]["plant"])
+        scores = [result["score"] for result in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_limit(self):
+        response = self.client.get(self.url, {"limit": 1})
+        self.assertEqual(len(response.data["results"]), 1)
+        response = self.client.get(self.url, {"limit": 50})
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_unknown_plant(self):
+        response = self.client.get("/api/verdespace/plants/999/similar/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,114 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace.models import Comment, Plant
+from verdespace.serializers import CommentSerializer
+from verdespace.threads import ReplyTree
+
+User = get_user_model()
+
+
+class CommentThreadTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.plant = Plant.objects.create(
+            name="Fiddle Leaf Fig",
+            description="A test description",
+            tips="Do not move it",
+            light_needs="Bright",
+            water_needs="Moderately",
+            care="Difficult",
+            size="Large",
+            category="Decorative",
+        )
+        self.root = self.comment("Root")
+        self.reply = self.comment("Reply", parent=self.root)
+        self.nested = self.comment("Nested", parent=self.reply)
+        self.deepest = self.comment("Deepest", parent=self.nested)
+
+    def comment(self, text, parent=None):
+        return Comment.objects.create(
+            text=text, author=self.user, plant=self.plant, parent=parent
+        )
+
+    def test_reparented_replies_follow_their_new_parent(self):
+        self.nested.parent = self.root
+        self.nested.save()
+        tree = ReplyTree([self.root], max_depth=2)
+        self.assertEqual(
+            [comment.text for comment in tree.replies(self.root)], ["Reply", "Nested"]
+        )
+        self.assertEqual(
+            [comment.text for comment in tree.replies(self.nested)], ["Deepest"]
+        )
+
+    def test_only_replies_below_the_given_comments_are_loaded(self):
+        other = self.comment("Other thread")
+        other_reply = self.comment("Other reply", parent=other)
+        other_nested = self.comment("Other nested", parent=other_reply)
+        tree = ReplyTree([self.reply])
+        self.assertEqual(
+            [comment.text for comment in tree.replies(self.reply)], ["Nested"]
+        )
+        self.assertNotIn(self.root, tree)
+        self.assertNotIn(other_nested, tree)
+
+    def test_whole_thread_renders_in_two_queries(self):
+        for index in range(5):
+            self.comment(f"Extra reply {index}", parent=self.root)
+        # comment + replies of the whole thread
+        with self.assertNumQueries(2):
+            data = CommentSerializer(
+                Comment.objects.select_related("author").get(pk=self.root.pk)
+            ).data
+        self.assertEqual(len(data["replies"]), 6)
+        self.assertEqual(
+            data["replies"][0]["replies"][0]["replies"][0]["text"], "Deepest"
+        )
+
+    @override_settings(VERDESPACE_COMMENT_MAX_DEPTH=2)
+    def test_max_depth(self):
+        data = CommentSerializer(self.root).data
+        nested = data["replies"][0]["replies"][0]
+        self.assertEqual(nested["text"], "Nested")
+        self.assertEqual(nested["replies"], [])
+
+    @override_settings(VERDESPACE_COMMENT_REPLY_LIMIT=2)
+    def test_reply_limit_per_level(self):
+        for index in range(3):
+            self.comment(f"Extra reply {index}", parent=self.root)
+        data = CommentSerializer(self.root).data
+        self.assertEqual(
+            [reply["text"] for reply in data["replies"]], ["Reply", "Extra reply 0"]
+        )
+        self.assertEqual(len(data["replies"][0]["replies"]), 1)
+
+    def test_comment_list_query_count_is_flat(self):
+        for index in range(5):
+            self.comment(f"Extra reply {index}", parent=self.nested)
+        # page of comments + replies for the page
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/verdespace/comments/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_reply_must_belong_to_same_plant(self):
+        other_plant = Plant.objects.create(
+            name="Pothos",
+            description="Trailing vine",
+            tips="Trim often",
+            light_needs="Shadow",
+            water_needs="Moderately",
+            care="Easy",
+            size="Small",
+            category="Climbing",
+        )
+        response = self.client.post(
+            "/api/verdespace/comments/",
+            {"text": "Wrong thread", "plant": other_plant.id, "parent": self.root.id},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
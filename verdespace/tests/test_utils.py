@@ -0,0 +1,249 @@
+import base64
+import json
+from unittest import mock
+
+from botocore.stub import Stubber
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from verdespace.models import Plant, PlantImage
+from verdespace.utils import (
+    generate_presigned_url,
+    generate_presigned_urls,
+    get_s3_client,
+)
+
+User = get_user_model()
+
+S3_SETTINGS = {
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_S3_REGION_NAME": "eu-central-1",
+    "AWS_STORAGE_BUCKET_NAME": "verdespace-test",
+}
+
+
+@override_settings(**S3_SETTINGS)
+class PresignedUrlTest(SimpleTestCase):
+    def setUp(self):
+        caches["presigned-urls"].clear()
+
+    def test_client_is_reused(self):
+        self.assertIs(get_s3_client(), get_s3_client())
+
+    def test_client_follows_credentials(self):
+        client = get_s3_client()
+        with self.settings(AWS_ACCESS_KEY_ID="other"):
+            self.assertIsNot(get_s3_client(), client)
+
+    def test_generate_presigned_urls(self):
+        urls = generate_presigned_urls(["plants/a.jpg", "plants/b.jpg", "plants/a.jpg"])
+        self.assertEqual(list(urls), ["plants/a.jpg", "plants/b.jpg"])
+        for key, url in urls.items():
+            self.assertIn(key, url)
+            self.assertIn("X-Amz-Signature=", url)
+        self.assertIn("verdespace-test", generate_presigned_url("plants/a.jpg"))
+
+    def test_urls_are_cached_until_safety_margin(self):
+        first = generate_presigned_url("plants/a.jpg")
+        client = get_s3_client()
+        with mock.patch.object(
+            client, "generate_presigned_url", return_value="https://signed"
+        ) as sign:
+            self.assertEqual(generate_presigned_url("plants/a.jpg"), first)
+            urls = generate_presigned_urls(["plants/a.jpg", "plants/b.jpg"])
+        self.assertEqual(urls["plants/a.jpg"], first)
+        sign.assert_called_once()
+
+    @override_settings(VERDESPACE_PRESIGNED_URL_SAFETY_MARGIN=3600)
+    def test_no_caching_when_margin_covers_lifetime(self):
+        generate_presigned_url("plants/a.jpg")
+        client = get_s3_client()
+        with mock.patch.object(
+            client, "generate_presigned_url", return_value="https://signed"
+        ) as sign:
+            generate_presigned_url("plants/a.jpg")
+        sign.assert_called_once()
+
+    def test_cache_is_bounded(self):
+        cache_settings = {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "presigned-urls-bounded",
+            "OPTIONS": {"MAX_ENTRIES": 2, "CULL_FREQUENCY": 2},
+        }
+        with self.settings(CACHES={"presigned-urls": cache_settings}):
+            generate_presigned_urls([f"plants/{index}.jpg" for index in range(5)])
+            self.assertLessEqual(len(caches["presigned-urls"]._cache), 2)
+
+
+@override_settings(**S3_SETTINGS)
+class RetrieveImagesTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.plant = Plant.objects.create(
+            name="Calathea",
+            description="Patterned leaves",
+            tips="Use filtered water",
+            light_needs="Scattered",
+            water_needs="Often",
+            care="Difficult",
+            size="Medium",
+            category="Decorative",
+        )
+        for name in ("plants/one.jpg", "plants/two.jpg"):
+            PlantImage.objects.create(plant=self.plant, image=name)
+
+    def test_retrieve_images_signs_object_keys(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(f"/api/verdespace/plants/{self.plant.id}/images/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        for image, name in zip(response.data, ("one.jpg", "two.jpg")):
+            self.assertIn(f"/plants/{name}?", image["pre_signed_url"])
+
+
+@override_settings(**S3_SETTINGS, VERDESPACE_IMAGE_WORKERS=0)
+class DirectUploadTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="staff",
+            email="staff@example.com",
+            password="password123",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.plant = Plant.objects.create(
+            name="Pilea",
+            description="Round leaves",
+            tips="Turn it weekly",
+            light_needs="Scattered",
+            water_needs="Moderately",
+            care="Easy",
+            size="Small",
+            category="Decorative",
+        )
+        self.url = f"/api/verdespace/plants/{self.plant.id}/images/"
+        # The pipeline reads the object through the storage backend, which
+        # is not part of these tests.
+        patcher = mock.patch("verdespace.views.schedule_processing")
+        self.schedule_processing = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def request_upload(self, content_type="image/jpeg"):
+        return self.client.post(
+            f"{self.url}upload-url/", {"content_type": content_type}, format="json"
+        )
+
+    def confirm(self, token, head_response=None, error_code=None):
+        """
+        Confirm an upload against a stubbed S3 head_object call.
+        """
+        client = get_s3_client()
+        with Stubber(client) as stubber:
+            if error_code:
+                stubber.add_client_error(
+                    "head_object",
+                    service_error_code=error_code,
+                    http_status_code=int(error_code),
+                )
+            elif head_response is not None:
+                stubber.add_response("head_object", head_response)
+            response = self.client.post(
+                f"{self.url}confirm/", {"upload_token": token}, format="json"
+            )
+            stubber.assert_no_pending_responses()
+        return response
+
+    def test_upload_policy_is_constrained(self):
+        response = self.request_upload()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response.data["key"], r"^plants/[0-9a-f]{32}\.jpg$")
+        self.assertIn("verdespace-test", response.data["url"])
+        fields = response.data["fields"]
+        self.assertEqual(fields["key"], response.data["key"])
+        self.assertEqual(fields["Content-Type"], "image/jpeg")
+        policy = json.loads(base64.b64decode(fields["policy"]))
+        self.assertIn(
+            ["content-length-range", 1, 5 * 1024 * 1024], policy["conditions"]
+        )
+
+    def test_rejects_other_content_types(self):
+        response = self.request_upload("application/pdf")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_confirm_registers_the_uploaded_object(self):
+        upload = self.request_upload().data
+        response = self.confirm(
+            upload["upload_token"],
+            {"ContentLength": 1024, "ContentType": "image/jpeg"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        plant_image = PlantImage.objects.get(pk=response.data["id"])
+        self.assertEqual(plant_image.image.name, upload["key"])
+        self.assertEqual(plant_image.plant, self.plant)
+        self.schedule_processing.assert_called_once_with(plant_image.id)
+
+        # confirming again is a no-op that returns the same image
+        response = self.confirm(upload["upload_token"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], plant_image.id)
+        self.assertEqual(PlantImage.objects.count(), 1)
+
+    def test_concurrent_confirmations_share_one_image(self):
+        upload = self.request_upload().data
+
+        def confirmed_elsewhere(key):
+            # Another request registers the same upload after this one
+            # checked for an existing image.
+            PlantImage.objects.create(plant=self.plant, image=key)
+            return {"ContentLength": 1024, "ContentType": "image/jpeg"}
+
+        with mock.patch(
+            "verdespace.views.get_object_metadata", side_effect=confirmed_elsewhere
+        ):
+            response = self.client.post(
+                f"{self.url}confirm/",
+                {"upload_token": upload["upload_token"]},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(PlantImage.objects.filter(image=upload["key"]).count(), 1)
+        self.schedule_processing.assert_not_called()
+
+    def test_confirm_requires_the_object(self):
+        # Without s3:ListBucket, S3 reports a missing key as 403.
+        for error_code in ("404", "403"):
+            token = self.request_upload().data["upload_token"]
+            response = self.confirm(token, error_code=error_code)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data["error"], "Upload not found")
+        self.assertFalse(PlantImage.objects.exists())
+
+    def test_confirm_rejects_oversized_objects(self):
+        token = self.request_upload().data["upload_token"]
+        response = self.confirm(
+            token, {"ContentLength": 6 * 1024 * 1024, "ContentType": "image/jpeg"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_token_is_bound_to_the_plant(self):
+        token = self.request_upload().data["upload_token"]
+        other = Plant.objects.create(
+            name="Fern",
+            description="Fronds",
+            tips="Mist",
+            light_needs="Shadow",
+            water_needs="Often",
+            care="Medium",
+            size="Medium",
+            category="Decorative",
+        )
+        self.url = f"/api/verdespace/plants/{other.id}/images/"
+        for forged in (token, "not-a-token"):
+            response = self.confirm(forged)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
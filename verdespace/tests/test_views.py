@@ -1,7 +1,14 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
-from verdespace.models import Plant, Comment, WishList
+from verdespace import notifications
+from verdespace.models import Plant, Comment, WishList, Rating
+from verdespace.threads import ReplyTree
 
 User = get_user_model()
 
@@ -32,12 +39,36 @@ class PlantViewSetTest(APITestCase):
         self.client.force_authenticate(user=self.user)
         response = self.client.get("/api/verdespace/plants/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_list_plants_with_filters(self):
+        Plant.objects.create(
+            name="Cactus",
+            description="Thorny plant",
+            tips="Low maintenance",
+            light_needs="Bright",
+            water_needs="Rarely",
+            care="Easy",
+            size="Small",
+            blooms=True,
+            category="Cactus",
+        )
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(
+            "/api/verdespace/plants/", {"category": "Cactus", "size": "Small"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [plant["name"] for plant in response.data["results"]], ["Cactus"]
+        )
 
     def test_list_plants_as_unauthenticated_user(self):
         response = self.client.get("/api/verdespace/plants/")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    @override_settings(
+        VERDESPACE_NOTIFICATION_BACKEND="verdespace.notifications.LocMemBackend"
+    )
     def test_create_plant_as_superuser(self):
         self.client.force_authenticate(user=self.superuser)
         data = {
@@ -53,9 +84,13 @@ class PlantViewSetTest(APITestCase):
             "blooms": True,
             "category": "Flowering",
         }
-        response = self.client.post("/api/verdespace/plants/", data)
+        notifications.outbox.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/verdespace/plants/", data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Plant.objects.count(), 2)
+        self.assertEqual(len(notifications.outbox), 1)
+        self.assertIn("Plant Name: New Plant", notifications.outbox[0])
 
     def test_create_plant_as_non_superuser(self):
         self.client.force_authenticate(user=self.user)
@@ -104,7 +139,7 @@ class CommentViewSetTest(APITestCase):
         self.client.force_authenticate(user=self.user)
         response = self.client.get("/api/verdespace/comments/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_create_comment_as_authenticated_user(self):
         self.client.force_authenticate(user=self.user)
@@ -173,3 +208,172 @@ class WishListViewSetTest(APITestCase):
         data = {"plant_id": self.plant.id}
         response = self.client.post("/api/verdespace/wishlists/", data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_add_to_wishlist_is_a_single_insert(self):
+        self.client.force_authenticate(user=self.user)
+        WishList.objects.all().delete()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/verdespace/wishlists/", {"plant_id": self.plant.id}
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        wishlist_queries = [
+            query["sql"] for query in queries if "verdespace_wishlist" in query["sql"]
+        ]
+        self.assertEqual(len(wishlist_queries), 1)
+        self.assertTrue(wishlist_queries[0].startswith("INSERT"))
+
+
+class RatingViewSetTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.other_user = User.objects.create_user(
+            username="otheruser", email="otheruser@example.com", password="password123"
+        )
+        self.plant = Plant.objects.create(
+            name="Snake Plant",
+            description="A test snake plant",
+            tips="Water rarely",
+            light_needs="Shadow",
+            water_needs="Rarely",
+            care="Easy",
+            size="Medium",
+            category="Air-Purifying",
+        )
+        Rating.objects.create(plant=self.plant, user=self.other_user, rating=2)
+        Plant.objects.refresh_rating_stats()
+
+    def test_create_rating_updates_plant_stats(self):
+        self.client.force_authenticate(user=self.user)
+        data = {"plant": self.plant.id, "user": self.user.id, "rating": 5}
+        response = self.client.post("/api/verdespace/ratings/", data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.plant.refresh_from_db()
+        self.assertEqual(self.plant.rating_count, 2)
+        self.assertEqual(self.plant.rating_sum, 7)
+        self.assertEqual(self.plant.rating_avg, 3.5)
+
+    def test_update_and_delete_rating_update_plant_stats(self):
+        rating = Rating.objects.get(user=self.other_user)
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.patch(
+            f"/api/verdespace/ratings/{rating.id}/", {"rating": 4}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.plant.refresh_from_db()
+        self.assertEqual(self.plant.rating_avg, 4.0)
+
+        response = self.client.delete(f"/api/verdespace/ratings/{rating.id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.plant.refresh_from_db()
+        self.assertEqual(self.plant.rating_count, 0)
+        self.assertIsNone(self.plant.rating_avg)
+
+    def test_plant_list_serves_stored_average(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get("/api/verdespace/plants/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["average_rating"], 2.0)
+        self.assertEqual(response.data["results"][0]["rating_count"], 1)
+
+
+class PlantQueryCountTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="testuser@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+        for index in range(3):
+            plant = Plant.objects.create(
+                name=f"Plant {index}",
+                description="A test description",
+                tips="Water weekly",
+                light_needs="Bright",
+                water_needs="Often",
+                care="Easy",
+                size="Small",
+                category="Decorative",
+            )
+            Comment.objects.create(text="Nice plant", author=self.user, plant=plant)
+            Rating.objects.create(plant=plant, user=self.user, rating=4)
+        Plant.objects.refresh_rating_stats()
+        self.plant = plant
+
+    def test_list_query_count(self):
+        # plants page + images prefetch
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/verdespace/plants/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_list_does_not_load_comments(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/verdespace/plants/")
+        self.assertFalse(
+            any("verdespace_comment" in query["sql"] for query in queries)
+        )
+
+    def test_retrieve_query_count(self):
+        for index in range(5):
+            Comment.objects.create(
+                text=f"Comment {index}", author=self.user, plant=self.plant
+            )
+        # validators + plant with comment count + images + comment preview
+        with self.assertNumQueries(4):
+            response = self.client.get(f"/api/verdespace/plants/{self.plant.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["comment_count"], 6)
+        self.assertEqual(len(response.data["comments"]), 3)
+        self.assertNotIn("replies", response.data["comments"][0])
+
+    def test_plant_comments_sub_resource(self):
+        root = Comment.objects.get(plant=self.plant)
+        Comment.objects.create(
+            text="Reply", author=self.user, plant=self.plant, parent=root
+        )
+        for index in range(25):
+            Comment.objects.create(
+                text=f"Comment {index}", author=self.user, plant=self.plant
+            )
+        url = f"/api/verdespace/plants/{self.plant.id}/comments/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = response.data["results"]
+        self.assertEqual(len(first_page), 20)
+        self.assertEqual(first_page[0]["text"], "Nice plant")
+        self.assertEqual(first_page[0]["replies"][0]["text"], "Reply")
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertIsNone(response.data["next"])
+
+    def test_plant_comments_load_replies_of_the_page_only(self):
+        for index in range(40):
+            root = Comment.objects.create(
+                text=f"Thread {index}", author=self.user, plant=self.plant
+            )
+            for reply in range(3):
+                Comment.objects.create(
+                    text=f"Reply {reply}",
+                    author=self.user,
+                    plant=self.plant,
+                    parent=root,
+                )
+        trees = []
+
+        def record(*args, **kwargs):
+            tree = ReplyTree(*args, **kwargs)
+            trees.append(tree)
+            return tree
+
+        url = f"/api/verdespace/plants/{self.plant.id}/comments/"
+        # plant + page of threads + their replies
+        with mock.patch("verdespace.serializers.ReplyTree", side_effect=record):
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 20)
+        # "Nice plant" has no replies; the 19 threads after it have 3 each.
+        [tree] = trees
+        self.assertEqual(len(tree.loaded), 20 + 19 * 3)
@@ -0,0 +1,89 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import RowNumber
+
+from .models import Comment
+
+
+class ReplyTree:
+    """
+    Replies below a set of comments, loaded with a single query and grouped
+    by parent in memory.
+
+    A recursive query walks down from the given comments only, at most
+    `max_depth` levels below each of them, so the cost follows the threads
+    on the page rather than every thread of their plants. A window
+    function keeps at most `reply_limit` replies per parent.
+    """
+
+    def __init__(self, comments, max_depth=None, reply_limit=None):
+        if max_depth is None:
+            max_depth = settings.VERDESPACE_COMMENT_MAX_DEPTH
+        if reply_limit is None:
+            reply_limit = settings.VERDESPACE_COMMENT_REPLY_LIMIT
+        self.max_depth = max_depth
+        self.reply_limit = reply_limit
+        self.children = defaultdict(list)
+        self.loaded = set()
+
+        comments = list(comments)
+        if not comments or max_depth <= 0 or reply_limit <= 0:
+            return
+        self.loaded.update(comment.pk for comment in comments)
+
+        replies = (
+            Comment.objects.filter(pk__in=descendants(self.loaded, max_depth))
+            .select_related("author")
+            .annotate(
+                position=Window(
+                    RowNumber(),
+                    partition_by=[F("parent_id")],
+                    order_by=[F("created_at").asc(), F("id").asc()],
+                )
+            )
+            .filter(position__lte=reply_limit)
+            .order_by("created_at", "id")
+        )
+        for reply in replies:
+            self.children[reply.parent_id].append(reply)
+            self.loaded.add(reply.pk)
+
+    def __contains__(self, comment):
+        return comment.pk in self.loaded
+
+    def replies(self, comment):
+        return self.children.get(comment.pk, [])
+
+
+def descendants(comment_ids, max_depth):
+    """
+    Subquery of the ids of the replies up to `max_depth` levels below the
+    given comments.
+    """
+    comment_ids = list(comment_ids)
+    table = connection.ops.quote_name(Comment._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(comment_ids))
+    return RawSQL(
+        f"WITH RECURSIVE tree (id, level) AS ("
+        f"SELECT id, 1 FROM {table} WHERE parent_id IN ({placeholders}) "
+        f"UNION ALL "
+        f"SELECT reply.id, tree.level + 1 FROM {table} reply "
+        f"JOIN tree ON reply.parent_id = tree.id WHERE tree.level < %s"
+        f") SELECT id FROM tree",
+        [*comment_ids, max_depth],
+    )
+
+
+def comment_preview_queryset():
+    """
+    The first top-level comments of a plant, as shown on the plant detail.
+    """
+    return (
+        Comment.objects.filter(parent__isnull=True)
+        .select_related("author")
+        .order_by("created_at", "id")
+    )
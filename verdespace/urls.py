@@ -1,14 +1,24 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PlantViewSet, CommentViewSet, WishListViewSet, PlantImageViewSet, RatingViewSet
+from .views import (
+    PlantViewSet,
+    CommentViewSet,
+    WishListViewSet,
+    PlantImageViewSet,
+    RatingViewSet,
+    RecommendationViewSet,
+    MetricsView,
+)
 
 router = DefaultRouter()
 router.register(r"plants", PlantViewSet, basename="plants")
 router.register(r"comments", CommentViewSet, basename="comments")
 router.register(r"wishlists", WishListViewSet, basename="wishlists")
 router.register(r"plant-images", PlantImageViewSet, basename="plant-images")
-router.register(r'ratings', RatingViewSet)
+router.register(r"ratings", RatingViewSet)
+router.register(r"recommendations", RecommendationViewSet, basename="recommendations")
 urlpatterns = [
+    path("metrics/", MetricsView.as_view(), name="metrics"),
     path("", include(router.urls)),
 ]
 app_name = "verdespace"
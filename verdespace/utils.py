@@ -1,23 +1,161 @@
+import hashlib
+import threading
+
 import boto3
+from botocore.exceptions import ClientError
 from django.conf import settings
+from django.core.cache import caches
+
+from .instrumentation import outbound
+
+PRESIGNED_URL_EXPIRES_IN = 3600
+PRESIGNED_POST_EXPIRES_IN = 600
+
+# Коди помилок head_object, що означають відсутній об'єкт
+OBJECT_NOT_FOUND_CODES = (
+    "403",
+    "404",
+    "AccessDenied",
+    "Forbidden",
+    "NoSuchKey",
+    "NotFound",
+)
+
+_s3_clients = {}
+_s3_clients_lock = threading.Lock()
+
+
+def get_s3_client():
+    """
+    Повертає спільний для процесу S3-клієнт.
+    Клієнт створюється один раз для кожного набору облікових даних;
+    клієнти boto3 потокобезпечні, тож його можна використовувати з усіх потоків.
+    """
+    config = (
+        settings.AWS_ACCESS_KEY_ID,
+        settings.AWS_SECRET_ACCESS_KEY,
+        settings.AWS_S3_REGION_NAME,
+    )
+    client = _s3_clients.get(config)
+    if client is None:
+        with _s3_clients_lock:
+            client = _s3_clients.get(config)
+            if client is None:
+                client = boto3.session.Session().client(
+                    "s3",
+                    aws_access_key_id=config[0],
+                    aws_secret_access_key=config[1],
+                    region_name=config[2],
+                )
+                _s3_clients[config] = client
+    return client
 
 
 def generate_presigned_url(file_key):
     """
     Генерує Pre-signed URL для доступу до файлу в S3.
     """
-    s3_client = boto3.client(
-        "s3",
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_S3_REGION_NAME,
+    return generate_presigned_urls([file_key]).get(file_key)
+
+
+def generate_presigned_urls(file_keys):
+    """
+    Генерує Pre-signed URL для кількох файлів за один прохід.
+    Підпис обчислюється локально одним клієнтом, без запитів до S3.
+    Готові URL кешуються і повторно віддаються, доки до завершення їхньої
+    дії не лишиться VERDESPACE_PRESIGNED_URL_SAFETY_MARGIN секунд,
+    тож браузери та CDN бачать стабільні адреси.
+    Повертає словник {ключ: URL}; для ключів з помилкою значення None.
+    """
+    bucket = settings.AWS_STORAGE_BUCKET_NAME
+    cache = caches[settings.VERDESPACE_PRESIGNED_URL_CACHE]
+    urls = get_cached_presigned_urls(file_keys)
+
+    signed = {}
+    s3_client = None
+    for file_key in file_keys:
+        if file_key in urls:
+            continue
+        if s3_client is None:
+            s3_client = get_s3_client()
+        url = None
+        try:
+            with outbound("s3"):
+                url = s3_client.generate_presigned_url(
+                    "get_object",
+                    Params={"Bucket": bucket, "Key": file_key},
+                    ExpiresIn=PRESIGNED_URL_EXPIRES_IN,
+                )
+        except Exception as e:
+            print(f"Error generating pre-signed URL: {e}")
+        else:
+            signed[_presigned_url_cache_key(bucket, file_key)] = url
+        urls[file_key] = url
+
+    timeout = PRESIGNED_URL_EXPIRES_IN - settings.VERDESPACE_PRESIGNED_URL_SAFETY_MARGIN
+    if signed and timeout > 0:
+        cache.set_many(signed, timeout=timeout)
+    return urls
+
+
+def get_cached_presigned_urls(file_keys):
+    """
+    Повертає вже закешовані Pre-signed URL, нічого не підписуючи.
+    Ключі, яких немає в кеші, у словник не потрапляють.
+    """
+    bucket = settings.AWS_STORAGE_BUCKET_NAME
+    cache_keys = {
+        file_key: _presigned_url_cache_key(bucket, file_key) for file_key in file_keys
+    }
+    cached = caches[settings.VERDESPACE_PRESIGNED_URL_CACHE].get_many(
+        list(cache_keys.values())
     )
-    try:
-        return s3_client.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": file_key},
-            ExpiresIn=3600,
+    return {
+        file_key: cached[cache_key]
+        for file_key, cache_key in cache_keys.items()
+        if cache_key in cached
+    }
+
+
+def _presigned_url_cache_key(bucket, file_key):
+    digest = hashlib.sha256(f"{bucket}/{file_key}".encode()).hexdigest()
+    return f"presigned-url:{digest}"
+
+
+def generate_presigned_post(file_key, content_type, max_size):
+    """
+    Генерує політику Pre-signed POST для завантаження файлу напряму в S3.
+    S3 приймає лише файл з цим ключем і Content-Type, розміром до max_size байт.
+    Повертає словник {"url": ..., "fields": {...}}.
+    """
+    s3_client = get_s3_client()
+    with outbound("s3"):
+        return s3_client.generate_presigned_post(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=file_key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_size],
+            ],
+            ExpiresIn=PRESIGNED_POST_EXPIRES_IN,
         )
-    except Exception as e:
-        print(f"Error generating pre-signed URL: {e}")
-        return None
+
+
+def get_object_metadata(file_key):
+    """
+    Повертає метадані об'єкта в S3 (ContentLength, ContentType, ...)
+    або None, якщо такого об'єкта немає.
+    Без права s3:ListBucket S3 відповідає на запит відсутнього ключа
+    кодом 403, тож 403 теж вважається відсутнім об'єктом.
+    """
+    s3_client = get_s3_client()
+    try:
+        with outbound("s3"):
+            return s3_client.head_object(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=file_key
+            )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in OBJECT_NOT_FOUND_CODES:
+            return None
+        raise
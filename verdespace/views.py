@@ -1,17 +1,60 @@
-from drf_spectacular.utils import extend_schema_view, extend_schema
-from rest_framework import viewsets, permissions, status, serializers
+import json
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Prefetch
+from django.http import StreamingHttpResponse
+from django.utils.crypto import constant_time_compare
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema_view, extend_schema
+from rest_framework import viewsets, permissions, status, serializers, renderers
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Plant, Comment, WishList, PlantImage, Rating
+from rest_framework.views import APIView
+
+from . import caching, conditional, export, instrumentation, recommendations, search
+from .db import replica_reads
+from .filters import PlantFilter
+from .images import make_upload_token, read_upload_token, schedule_processing
+from .models import (
+    Plant,
+    Comment,
+    WishList,
+    PlantImage,
+    PlantSimilarity,
+    Rating,
+    unique_image_name,
+)
+from .pagination import KeysetPagination, PlantImagePagination
+from .threads import comment_preview_queryset
 from .serializers import (
     PlantSummarySerializer,
     PlantDetailSerializer,
     CommentSerializer,
     WishListSerializer,
     PlantImageSerializer, RatingSerializer,
+    RatingBulkItemSerializer,
+    WishListBulkItemSerializer,
+    BulkResultSerializer,
+    ImageUploadRequestSerializer,
+    ImageUploadPolicySerializer,
+    ImageUploadConfirmSerializer,
+    SimilarPlantSerializer,
+    RecommendationSerializer,
+)
+from .notifications import notify
+from .utils import (
+    PRESIGNED_POST_EXPIRES_IN,
+    generate_presigned_post,
+    generate_presigned_url,
+    generate_presigned_urls,
+    get_cached_presigned_urls,
+    get_object_metadata,
 )
-from .telegram_sender import telegram_sender
-from .utils import generate_presigned_url
+
+logger = logging.getLogger(__name__)
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -37,36 +80,243 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
         return obj.author == request.user
 
 
+class HasMetricsToken(permissions.BasePermission):
+    """
+    Permission class to let a metrics scraper in with the token
+    from VERDESPACE_METRICS_TOKEN in the X-Metrics-Token header.
+    """
+
+    def has_permission(self, request, view):
+        token = settings.VERDESPACE_METRICS_TOKEN
+        return bool(token) and constant_time_compare(
+            request.headers.get("X-Metrics-Token", ""), token
+        )
+
+
+class PrometheusRenderer(renderers.BaseRenderer):
+    """
+    Renders metrics in the Prometheus text exposition format.
+    """
+
+    media_type = "text/plain"
+    format = "txt"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode(self.charset)
+        # Error responses (e.g. permission denied) carry a detail dict.
+        return json.dumps(data).encode(self.charset)
+
+
+class ReplicaReadMixin:
+    """
+    Mixin to serve safe requests from the read replica, if one is configured.
+    Unsafe requests keep reading from the primary they write to.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in permissions.SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+
+def validate_bulk_items(request, item_serializer_class, plant_field):
+    """
+    Validate the items of a bulk request in one pass.
+    Each item is validated on its own, then every referenced plant is looked
+    up with a single in_bulk query. Returns one result dict per item, in
+    request order, and the valid items as (result, validated_data) pairs.
+    """
+    items = request.data
+    if not isinstance(items, list) or not items:
+        raise serializers.ValidationError({"error": "Expected a non-empty list."})
+    limit = settings.VERDESPACE_BULK_MAX_ITEMS
+    if len(items) > limit:
+        raise serializers.ValidationError(
+            {"error": f"At most {limit} items can be sent at once."}
+        )
+
+    results = []
+    valid = []
+    for index, item in enumerate(items):
+        result = {"index": index}
+        results.append(result)
+        serializer = item_serializer_class(data=item)
+        if not serializer.is_valid():
+            result.update(status="invalid", errors=serializer.errors)
+            continue
+        result["plant"] = serializer.validated_data[plant_field]
+        valid.append((result, serializer.validated_data))
+
+    plants = Plant.objects.only("id").in_bulk({result["plant"] for result, _ in valid})
+    found = []
+    for result, data in valid:
+        if result["plant"] in plants:
+            found.append((result, data))
+        else:
+            message = f'Invalid pk "{result["plant"]}" - object does not exist.'
+            result.update(status="invalid", errors={plant_field: [message]})
+    return results, found
+
+
+def keep_last_per_plant(items):
+    """
+    Drop all but the last item for each plant, marking the others as
+    duplicates, so every plant is written once.
+    """
+    last = {}
+    for result, data in items:
+        if result["plant"] in last:
+            last[result["plant"]][0]["status"] = "duplicate"
+        last[result["plant"]] = (result, data)
+    return list(last.values())
+
+
 @extend_schema_view(
     list=extend_schema(
-        description="Retrieve a summary of all plants with their images"
+        description="Retrieve a summary of all plants with their images, "
+        "optionally filtered by plant attributes"
     ),
     retrieve=extend_schema(
-        description="Retrieve detailed information about a specific plant, including images"
+        description="Retrieve detailed information about a specific plant, including "
+        "images, the comment count and a preview of the first comments"
+    ),
+    comments=extend_schema(
+        description="Page through the comment threads of a plant",
+        responses=CommentSerializer(many=True),
     ),
     create=extend_schema(description="Create a new plant (only for staff users)"),
+    similar=extend_schema(
+        description="Plants most similar to this one by attributes, description "
+        "and tips, from the precomputed similarity index",
+        parameters=[
+            OpenApiParameter("limit", int, description="Maximum number of results"),
+        ],
+        responses=SimilarPlantSerializer(many=True),
+    ),
+    search=extend_schema(
+        description="Full-text search over plant names, descriptions and tips. "
+        "Every word must match, as a prefix; results are ranked by relevance.",
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Words to search for"),
+            OpenApiParameter("limit", int, description="Maximum number of results"),
+        ],
+    ),
+    export_catalog=extend_schema(
+        description="Stream the (filtered) catalog as NDJSON or CSV (only for "
+        "staff users)",
+        parameters=[
+            OpenApiParameter(
+                "output",
+                str,
+                enum=list(export.FORMATS),
+                description="Export format (default: ndjson)",
+            ),
+        ],
+        responses={
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+            (200, "text/csv"): OpenApiTypes.STR,
+        },
+    ),
 )
-class PlantViewSet(viewsets.ModelViewSet):
+class PlantViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet to handle CRUD operations for Plant model.
     Includes custom actions for uploading and retrieving images.
     """
 
-    queryset = Plant.objects.prefetch_related("images", "comments")
+    queryset = Plant.objects.all()
     permission_classes = [permissions.IsAuthenticated, IsAdminOrReadOnly]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = PlantFilter
+
+    def get_queryset(self):
+        """
+        Return a queryset shaped for the current action.
+        - list/search: only the columns PlantSummarySerializer renders, plus
+          images. Ratings come from the aggregate columns stored on Plant.
+        - comments and image actions: just the plant id, the related rows
+          are queried separately.
+        - everything else: the full plant with images, the comment count and
+          a preview of the first top-level comments.
+        """
+        queryset = super().get_queryset()
+        if self.action in ("list", "search"):
+            return queryset.only(
+                "id",
+                "name",
+                "description",
+                "created_at",
+                "rating_avg",
+                "rating_count",
+            ).prefetch_related("images")
+        if self.action in (
+            "comments",
+            "similar",
+            "retrieve_images",
+            "upload_image",
+            "image_upload_url",
+            "confirm_image_upload",
+            "generate_image_url",
+        ):
+            return queryset.only("id")
+        preview_size = settings.VERDESPACE_COMMENT_PREVIEW_SIZE
+        return queryset.annotate(comment_count=Count("comments")).prefetch_related(
+            "images",
+            Prefetch(
+                "comments",
+                queryset=comment_preview_queryset()[:preview_size],
+                to_attr="comment_preview",
+            ),
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        Answer conditional requests with 304 before doing any work, then
+        serve the plant list from the response cache when possible.
+        """
+        etag = conditional.plant_list_validator(request)
+        response = conditional.not_modified(request, etag) or caching.cached_response(
+            caching.list_cache_key(request),
+            lambda: super(PlantViewSet, self).list(request, *args, **kwargs),
+        )
+        return conditional.add_validators(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Answer conditional requests with 304 after a single primary key
+        lookup, then serve the plant detail from the response cache when
+        possible.
+        """
+        plant_id = kwargs[self.lookup_field]
+        etag, last_modified = conditional.plant_validators(plant_id)
+        if etag is None:
+            return super().retrieve(request, *args, **kwargs)
+        response = conditional.not_modified(
+            request, etag, last_modified
+        ) or caching.cached_response(
+            caching.detail_cache_key(request, plant_id),
+            lambda: super(PlantViewSet, self).retrieve(request, *args, **kwargs),
+        )
+        return conditional.add_validators(response, etag, last_modified)
 
     def get_serializer_class(self):
         """
         Return the appropriate serializer based on the action.
         """
-        if self.action == "list":
+        if self.action in ("list", "search"):
             return PlantSummarySerializer
         return PlantDetailSerializer
 
     @staticmethod
     def notify_b(plant):
         """
-        Send a Telegram notification about the creation of a new plant.
+        Send a notification about the creation of a new plant once the
+        transaction commits. The Telegram backend delivers it in the
+        background, batched with other notifications.
         """
         message = (
             f"New Plant Added\n"
@@ -74,10 +324,7 @@ class PlantViewSet(viewsets.ModelViewSet):
             f"Plant Name: {plant.name}\n"
             f"Plant Size: {plant.size}\n"
         )
-        try:
-            telegram_sender.send_message(message)
-        except Exception as e:
-            print(f"Error sending notification: {e}")
+        transaction.on_commit(lambda: notify(message))
 
     def perform_create(self, serializer):
         """
@@ -86,7 +333,148 @@ class PlantViewSet(viewsets.ModelViewSet):
         plant = serializer.save()
         self.notify_b(plant)
 
-    @action(detail=True, methods=["post"], url_path="images")
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """
+        Custom action to search plants by words in their name, description
+        and tips, using the prebuilt full-text index.
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"error": "Query parameter 'q' is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params["limit"])
+        except (KeyError, ValueError):
+            limit = settings.VERDESPACE_PAGE_SIZE
+        limit = max(1, min(limit, settings.VERDESPACE_MAX_PAGE_SIZE))
+
+        plants = search.search_queryset(
+            self.filter_queryset(self.get_queryset()), query
+        )[:limit]
+        serializer = self.get_serializer(plants, many=True)
+        return Response({"results": serializer.data}, status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="cache-stats",
+        permission_classes=[permissions.IsAdminUser],
+    )
+    def cache_stats(self, request):
+        """
+        Hit and miss counters of the plant response cache in this process.
+        """
+        return Response(caching.cache_stats())
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        permission_classes=[permissions.IsAdminUser],
+    )
+    def export_catalog(self, request):
+        """
+        Custom action to export the catalog for partners.
+        - GET: Every plant matching the list filters, streamed as NDJSON or CSV.
+        """
+        output = request.query_params.get("output", "ndjson")
+        if output not in export.FORMATS:
+            return Response(
+                {"error": f"output must be one of: {', '.join(export.FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        content_type, extension, render = export.FORMATS[output]
+        queryset = (
+            self.filter_queryset(Plant.objects.all())
+            .order_by("id")
+            .values(*export.EXPORT_FIELDS)
+        )
+        # The body is produced after this method returns, so pin the
+        # database chosen for this request before streaming starts.
+        rows = queryset.using(queryset.db).iterator(
+            chunk_size=settings.VERDESPACE_EXPORT_CHUNK_SIZE
+        )
+        response = StreamingHttpResponse(render(rows), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="plants.{extension}"'
+        return response
+
+    @action(detail=True, methods=["get"], url_path="comments")
+    def comments(self, request, pk=None):
+        """
+        Custom action to page through the comment threads of a plant.
+        - GET: Top-level comments with their replies, keyset-paginated.
+        """
+        plant = self.get_object()
+        queryset = Comment.objects.filter(
+            plant=plant, parent__isnull=True
+        ).select_related("author")
+        page = self.paginate_queryset(queryset)
+        serializer = CommentSerializer(
+            page, many=True, context=self.get_serializer_context()
+        )
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["get"], url_path="similar")
+    def similar(self, request, pk=None):
+        """
+        Custom action to list the plants most similar to this one.
+        - GET: Up to `limit` neighbours from the similarity index, most similar
+          first, read with a single index range scan.
+        """
+        plant = self.get_object()
+        try:
+            limit = int(request.query_params["limit"])
+        except (KeyError, ValueError):
+            limit = settings.VERDESPACE_SIMILAR_PLANTS
+        limit = max(1, min(limit, settings.VERDESPACE_SIMILAR_PLANTS))
+
+        similarities = (
+            PlantSimilarity.objects.filter(plant=plant, rank__lt=limit)
+            .select_related("similar")
+            .prefetch_related("similar__images")
+            .order_by("rank")
+        )
+        serializer = SimilarPlantSerializer(
+            similarities, many=True, context=self.get_serializer_context()
+        )
+        return Response({"results": serializer.data}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"], url_path="images")
+    def retrieve_images(self, request, pk=None):
+        """
+        Custom action to retrieve all images for a plant.
+        - GET: Retrieve all images associated with the plant.
+        """
+        plant = self.get_object()
+        images = list(plant.images.all())
+        file_keys = [image.image.name for image in images]
+
+        # While every URL is still cached, a matching request is answered
+        # before anything is signed or serialized.
+        urls = get_cached_presigned_urls(file_keys)
+        if len(urls) == len(set(file_keys)):
+            response = conditional.not_modified(
+                request, conditional.images_validator(images, urls)
+            )
+            if response is not None:
+                return response
+
+        urls = generate_presigned_urls(file_keys)
+        serializer = PlantImageSerializer(images, many=True)
+        data = serializer.data
+        for image, item in zip(images, data):
+            item["pre_signed_url"] = urls[image.image.name]
+
+        return conditional.add_validators(
+            Response(data, status=status.HTTP_200_OK),
+            conditional.images_validator(images, urls),
+        )
+
+    # Shares the images/ route with retrieve_images.
+    @retrieve_images.mapping.post
     def upload_image(self, request, pk=None):
         """
         Custom action to handle uploading images for a plant.
@@ -100,7 +488,7 @@ class PlantViewSet(viewsets.ModelViewSet):
                 {"error": "No image file provided"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        if image.size > 5 * 1024 * 1024:  # Limit: 5MB
+        if image.size > settings.VERDESPACE_IMAGE_UPLOAD_MAX_SIZE:
             return Response(
                 {"error": "Image too large"}, status=status.HTTP_400_BAD_REQUEST
             )
@@ -109,26 +497,100 @@ class PlantViewSet(viewsets.ModelViewSet):
                 {"error": "Invalid file type"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        PlantImage.objects.create(plant=plant, image=image)
+        plant_image = PlantImage.objects.create(plant=plant, image=image)
+        schedule_processing(plant_image.id)
         return Response(
-            {"status": "Image uploaded successfully"}, status=status.HTTP_201_CREATED
+            {"status": "Image uploaded successfully", "id": plant_image.id},
+            status=status.HTTP_201_CREATED,
         )
 
-    @action(detail=True, methods=["get"], url_path="images")
-    def retrieve_images(self, request, pk=None):
+    @extend_schema(
+        request=ImageUploadRequestSerializer,
+        responses=ImageUploadPolicySerializer,
+    )
+    @action(detail=True, methods=["post"], url_path="images/upload-url")
+    def image_upload_url(self, request, pk=None):
         """
-        Custom action to retrieve all images for a plant.
-        - GET: Retrieve all images associated with the plant.
+        Custom action to start uploading an image straight to S3.
+        - POST: A presigned POST policy for one image of the given content
+          type, and the token to confirm the upload with afterwards.
         """
         plant = self.get_object()
-        images = plant.images.all()
-        serializer = PlantImageSerializer(images, many=True)
+        serializer = ImageUploadRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        content_type = serializer.validated_data["content_type"]
+        extension = settings.VERDESPACE_IMAGE_UPLOAD_TYPES[content_type]
+        key = unique_image_name(None, f"upload.{extension}")
+        try:
+            policy = generate_presigned_post(
+                key, content_type, settings.VERDESPACE_IMAGE_UPLOAD_MAX_SIZE
+            )
+        except Exception:
+            logger.exception("Failed to generate a pre-signed POST for %s", key)
+            return Response(
+                {"error": "Failed to generate upload URL"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        return Response(
+            {
+                "url": policy["url"],
+                "fields": policy["fields"],
+                "key": key,
+                "upload_token": make_upload_token(plant.id, key),
+                "expires_in": PRESIGNED_POST_EXPIRES_IN,
+            },
+            status=status.HTTP_200_OK,
+        )
 
-        for image in serializer.data:
-            image_key = image.get("image")
-            image["pre_signed_url"] = generate_presigned_url(image_key)
+    @extend_schema(
+        request=ImageUploadConfirmSerializer,
+        responses={201: PlantImageSerializer},
+    )
+    @action(detail=True, methods=["post"], url_path="images/confirm")
+    def confirm_image_upload(self, request, pk=None):
+        """
+        Custom action to register an image uploaded straight to S3.
+        - POST: Checks that the object exists in the bucket, then creates the
+          PlantImage and queues it for processing. Confirming twice returns
+          the existing image.
+        """
+        plant = self.get_object()
+        serializer = ImageUploadConfirmSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        key = read_upload_token(serializer.validated_data["upload_token"], plant.id)
+        if key is None:
+            return Response(
+                {"error": "Invalid or expired upload token"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        existing = PlantImage.objects.filter(plant=plant, image=key).first()
+        if existing is not None:
+            return Response(
+                PlantImageSerializer(existing).data, status=status.HTTP_200_OK
+            )
+
+        metadata = get_object_metadata(key)
+        if metadata is None:
+            return Response(
+                {"error": "Upload not found"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if metadata["ContentLength"] > settings.VERDESPACE_IMAGE_UPLOAD_MAX_SIZE:
+            return Response(
+                {"error": "Image too large"}, status=status.HTTP_400_BAD_REQUEST
+            )
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # The unique image constraint makes concurrent confirmations of the
+        # same upload share one PlantImage.
+        plant_image, created = PlantImage.objects.get_or_create(plant=plant, image=key)
+        if not created:
+            return Response(
+                PlantImageSerializer(plant_image).data, status=status.HTTP_200_OK
+            )
+        schedule_processing(plant_image.id)
+        return Response(
+            PlantImageSerializer(plant_image).data, status=status.HTTP_201_CREATED
+        )
 
     @action(detail=True, methods=["get"], url_path="generate-image-url")
     def generate_image_url(self, request, pk=None):
@@ -151,12 +613,13 @@ class PlantViewSet(viewsets.ModelViewSet):
         )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet to handle CRUD operations for Comment model.
     """
 
     queryset = Comment.objects.select_related("author", "plant", "parent")
+    pagination_class = KeysetPagination
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated, IsAuthorOrReadOnly]
 
@@ -195,17 +658,43 @@ class WishListViewSet(viewsets.ModelViewSet):
         """
         return WishList.objects.filter(user=self.request.user)
 
-    def perform_create(self, serializer):
+    @extend_schema(
+        description="Add several plants to the wishlist at once",
+        request=WishListBulkItemSerializer(many=True),
+        responses=BulkResultSerializer,
+    )
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
         """
-        Ensure that a plant is only added to the wishlist once.
+        Custom action to add many plants to the wishlist in one request.
+        - POST: A list of {"plant_id": ...}; reports per item whether it was
+          created, already in the wishlist or invalid.
         """
-        plant = serializer.validated_data.get("plant_id")
-        wishlist, created = WishList.objects.get_or_create(
-            user=self.request.user, plant=plant
+        results, items = validate_bulk_items(
+            request, WishListBulkItemSerializer, "plant_id"
         )
-        if not created:
-            raise serializers.ValidationError("This plant is already in your wishlist.")
-        return wishlist
+        items = keep_last_per_plant(items)
+        plant_ids = [result["plant"] for result, _ in items]
+        wishlists = WishList.objects.filter(user=request.user, plant_id__in=plant_ids)
+        with transaction.atomic():
+            existing = set(wishlists.values_list("plant_id", flat=True))
+            # Rows added concurrently since the check are skipped by the
+            # unique constraint instead of failing the request.
+            WishList.objects.bulk_create(
+                [
+                    WishList(user=request.user, plant_id=plant_id)
+                    for plant_id in plant_ids
+                    if plant_id not in existing
+                ],
+                ignore_conflicts=True,
+            )
+            ids = dict(wishlists.values_list("plant_id", "id"))
+        for result, _ in items:
+            result.update(
+                status="exists" if result["plant"] in existing else "created",
+                id=ids.get(result["plant"]),
+            )
+        return Response({"results": results}, status=status.HTTP_200_OK)
 
 
 class PlantImageViewSet(viewsets.ModelViewSet):
@@ -216,14 +705,129 @@ class PlantImageViewSet(viewsets.ModelViewSet):
     queryset = PlantImage.objects.select_related("plant")
     serializer_class = PlantImageSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PlantImagePagination
 
     def perform_create(self, serializer):
         """
-        Save a new image for a plant.
+        Save a new image for a plant and queue it for processing.
         """
-        serializer.save()
+        plant_image = serializer.save()
+        schedule_processing(plant_image.id)
 
 
 class RatingViewSet(viewsets.ModelViewSet):
     queryset = Rating.objects.all()
     serializer_class = RatingSerializer
+    pagination_class = KeysetPagination
+
+    @extend_schema(
+        description="Rate several plants at once, replacing earlier ratings",
+        request=RatingBulkItemSerializer(many=True),
+        responses=BulkResultSerializer,
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def bulk(self, request):
+        """
+        Custom action to rate many plants in one request.
+        - POST: A list of {"plant": ..., "rating": ...} by the current user;
+          reports per item whether the rating was created, updated or invalid.
+        """
+        results, items = validate_bulk_items(request, RatingBulkItemSerializer, "plant")
+        items = keep_last_per_plant(items)
+        plant_ids = [result["plant"] for result, _ in items]
+        with transaction.atomic():
+            existing = set(
+                Rating.objects.filter(
+                    user=request.user, plant_id__in=plant_ids
+                ).values_list("plant_id", flat=True)
+            )
+            Rating.objects.bulk_create(
+                [
+                    Rating(
+                        user=request.user,
+                        plant_id=result["plant"],
+                        rating=data["rating"],
+                    )
+                    for result, data in items
+                ],
+                update_conflicts=True,
+                unique_fields=["plant", "user"],
+                update_fields=["rating"],
+            )
+            # bulk_create skips the signals that keep plants and caches in sync
+            plants = Plant.objects.filter(pk__in=plant_ids)
+            plants.refresh_rating_stats()
+            plants.touch()
+            for plant_id in plant_ids:
+                caching.invalidate_plant(plant_id)
+        for result, _ in items:
+            result["status"] = "updated" if result["plant"] in existing else "created"
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+@extend_schema(exclude=True)
+class MetricsView(APIView):
+    """
+    Request and outbound call histograms for Prometheus.
+    - GET: Returns the metrics in the Prometheus text format.
+    """
+
+    permission_classes = [permissions.IsAdminUser | HasMetricsToken]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        response = Response(instrumentation.render_metrics())
+        response["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+        return response
+
+
+@extend_schema_view(
+    list=extend_schema(
+        description="Personal plant recommendations from ratings and wishlists, "
+        "best first; popular plants for users without any",
+        parameters=[
+            OpenApiParameter("limit", int, description="Maximum number of results"),
+        ],
+    )
+)
+class RecommendationViewSet(ReplicaReadMixin, viewsets.GenericViewSet):
+    """
+    ViewSet to serve the precomputed plant recommendations of the current user.
+    """
+
+    serializer_class = RecommendationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def list(self, request):
+        """
+        Serve the cached recommendations of the user, leaving out plants they
+        rated or wishlisted, topped up with popular plants.
+        """
+        try:
+            limit = int(request.query_params["limit"])
+        except (KeyError, ValueError):
+            limit = settings.VERDESPACE_RECOMMENDATIONS
+        limit = max(1, min(limit, settings.VERDESPACE_RECOMMENDATIONS))
+
+        recommended = recommendations.for_user(request.user.pk)
+        plants = (
+            Plant.objects.filter(pk__in=[plant_id for plant_id, _ in recommended])
+            .exclude(ratings__user=request.user)
+            .exclude(wishlists__user=request.user)
+            .only("id", "name", "description", "rating_avg", "rating_count")
+            .prefetch_related("images")
+            .in_bulk()
+        )
+        results = [
+            {"score": score, "plant": plants[plant_id]}
+            for plant_id, score in recommended
+            if plant_id in plants
+        ][:limit]
+        serializer = self.get_serializer(results, many=True)
+        return Response({"results": serializer.data}, status=status.HTTP_200_OK)